@@ -1,7 +1,35 @@
 """ A client library for accessing Airthings for Consumer API """
-from .client import AuthenticatedClient, Client
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .client import AuthenticatedClient, Client
+    from .decoders import JSONDecoder
+
+# Imported on first access (PEP 562), so that importing a model does not
+# pull in httpx.
+_MODULES = {
+    "AuthenticatedClient": ".client",
+    "Client": ".client",
+    "JSONDecoder": ".decoders",
+}
 
 __all__ = (
     "AuthenticatedClient",
     "Client",
+    "JSONDecoder",
 )
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
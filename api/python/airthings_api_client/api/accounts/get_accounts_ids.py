@@ -6,7 +6,7 @@ import httpx
 from ... import errors
 from ...client import AuthenticatedClient, Client
 from ...models.accounts_response import AccountsResponse
-from ...types import Response
+from ...types import RateLimit, Response
 
 
 def _get_kwargs() -> Dict[str, Any]:
@@ -22,7 +22,7 @@ def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Optional[AccountsResponse]:
     if response.status_code == HTTPStatus.OK:
-        response_200 = AccountsResponse.from_dict(response.json())
+        response_200 = AccountsResponse.from_dict(client.json_decoder(response.content))
 
         return response_200
     if client.raise_on_unexpected_status:
@@ -34,11 +34,23 @@ def _parse_response(
 def _build_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Response[AccountsResponse]:
+    parsed = _parse_response(client=client, response=response)
+    rate_limit = RateLimit.from_headers(response.headers)
+    if client.release_content and parsed is not None:
+        return Response(
+            status_code=HTTPStatus(response.status_code),
+            content=b"",
+            headers={},
+            parsed=parsed,
+            rate_limit=rate_limit,
+        )
+
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=parsed,
+        rate_limit=rate_limit,
     )
 
 
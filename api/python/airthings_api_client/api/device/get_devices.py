@@ -6,7 +6,7 @@ import httpx
 from ... import errors
 from ...client import AuthenticatedClient, Client
 from ...models.devices_response import DevicesResponse
-from ...types import Response
+from ...types import RateLimit, Response
 
 
 def _get_kwargs(
@@ -14,7 +14,9 @@ def _get_kwargs(
 ) -> Dict[str, Any]:
     _kwargs: Dict[str, Any] = {
         "method": "get",
-        "url": f"/v1/accounts/{account_id}/devices",
+        "url": "/v1/accounts/{accountId}/devices".format(
+            accountId=account_id,
+        ),
     }
 
     return _kwargs
@@ -24,7 +26,7 @@ def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Optional[DevicesResponse]:
     if response.status_code == HTTPStatus.OK:
-        response_200 = DevicesResponse.from_dict(response.json())
+        response_200 = DevicesResponse.from_dict(client.json_decoder(response.content))
 
         return response_200
     if client.raise_on_unexpected_status:
@@ -36,11 +38,23 @@ def _parse_response(
 def _build_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Response[DevicesResponse]:
+    parsed = _parse_response(client=client, response=response)
+    rate_limit = RateLimit.from_headers(response.headers)
+    if client.release_content and parsed is not None:
+        return Response(
+            status_code=HTTPStatus(response.status_code),
+            content=b"",
+            headers={},
+            parsed=parsed,
+            rate_limit=rate_limit,
+        )
+
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=parsed,
+        rate_limit=rate_limit,
     )
 
 
@@ -5,7 +5,7 @@ import httpx
 
 from ... import errors
 from ...client import AuthenticatedClient, Client
-from ...types import Response
+from ...types import RateLimit, Response
 
 
 def _get_kwargs() -> Dict[str, Any]:
@@ -27,11 +27,23 @@ def _parse_response(*, client: Union[AuthenticatedClient, Client], response: htt
 
 
 def _build_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Response[Any]:
+    parsed = _parse_response(client=client, response=response)
+    rate_limit = RateLimit.from_headers(response.headers)
+    if client.release_content and parsed is not None:
+        return Response(
+            status_code=HTTPStatus(response.status_code),
+            content=b"",
+            headers={},
+            parsed=parsed,
+            rate_limit=rate_limit,
+        )
+
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=parsed,
+        rate_limit=rate_limit,
     )
 
 
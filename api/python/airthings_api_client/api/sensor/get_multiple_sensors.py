@@ -8,7 +8,7 @@ from ...client import AuthenticatedClient, Client
 from ...models.error import Error
 from ...models.get_multiple_sensors_response_200 import GetMultipleSensorsResponse200
 from ...models.get_multiple_sensors_unit import GetMultipleSensorsUnit
-from ...types import UNSET, Response, Unset
+from ...types import UNSET, RateLimit, Response, Unset
 
 
 def _get_kwargs(
@@ -38,7 +38,9 @@ def _get_kwargs(
 
     _kwargs: Dict[str, Any] = {
         "method": "get",
-        "url": f"/v1/accounts/{account_id}/sensors",
+        "url": "/v1/accounts/{accountId}/sensors".format(
+            accountId=account_id,
+        ),
         "params": params,
     }
 
@@ -49,11 +51,11 @@ def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Optional[Union[Error, GetMultipleSensorsResponse200]]:
     if response.status_code == HTTPStatus.OK:
-        response_200 = GetMultipleSensorsResponse200.from_dict(response.json())
+        response_200 = GetMultipleSensorsResponse200.from_dict(client.json_decoder(response.content))
 
         return response_200
     if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
-        response_429 = Error.from_dict(response.json())
+        response_429 = Error.from_dict(client.json_decoder(response.content))
 
         return response_429
     if client.raise_on_unexpected_status:
@@ -65,11 +67,23 @@ def _parse_response(
 def _build_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Response[Union[Error, GetMultipleSensorsResponse200]]:
+    parsed = _parse_response(client=client, response=response)
+    rate_limit = RateLimit.from_headers(response.headers)
+    if client.release_content and parsed is not None:
+        return Response(
+            status_code=HTTPStatus(response.status_code),
+            content=b"",
+            headers={},
+            parsed=parsed,
+            rate_limit=rate_limit,
+        )
+
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=parsed,
+        rate_limit=rate_limit,
     )
 
 
@@ -4,6 +4,8 @@ from typing import Any, Dict, Optional, Union
 import httpx
 from attrs import define, evolve, field
 
+from .decoders import JSONDecoder, default_decoder
+
 
 @define
 class Client:
@@ -32,9 +34,17 @@ class Client:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        json_decoder: The function used to decode JSON response bodies from bytes. Defaults to orjson or msgspec
+            when installed, and to the standard library otherwise. Can also be provided as a keyword argument to the
+            constructor.
+        release_content: Whether or not to drop the content and headers of a response once it is parsed, keeping
+            only its rate limit headers. Responses that could not be parsed keep them. Can also be provided as a
+            keyword argument to the constructor.
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    json_decoder: JSONDecoder = field(factory=default_decoder, kw_only=True)
+    release_content: bool = field(default=False, kw_only=True)
     _base_url: str
     _cookies: Dict[str, str] = field(factory=dict, kw_only=True)
     _headers: Dict[str, str] = field(factory=dict, kw_only=True)
@@ -159,12 +169,20 @@ class AuthenticatedClient:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        json_decoder: The function used to decode JSON response bodies from bytes. Defaults to orjson or msgspec
+            when installed, and to the standard library otherwise. Can also be provided as a keyword argument to the
+            constructor.
+        release_content: Whether or not to drop the content and headers of a response once it is parsed, keeping
+            only its rate limit headers. Responses that could not be parsed keep them. Can also be provided as a
+            keyword argument to the constructor.
         token: The token to use for authentication
         prefix: The prefix to use for the Authorization header
         auth_header_name: The name of the Authorization header
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    json_decoder: JSONDecoder = field(factory=default_decoder, kw_only=True)
+    release_content: bool = field(default=False, kw_only=True)
     _base_url: str
     _cookies: Dict[str, str] = field(factory=dict, kw_only=True)
     _headers: Dict[str, str] = field(factory=dict, kw_only=True)
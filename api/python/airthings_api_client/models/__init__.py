@@ -1,14 +1,38 @@
 """ Contains all the data models used in inputs/outputs """
 
-from .account_response import AccountResponse
-from .accounts_response import AccountsResponse
-from .device_response import DeviceResponse
-from .devices_response import DevicesResponse
-from .error import Error
-from .get_multiple_sensors_response_200 import GetMultipleSensorsResponse200
-from .get_multiple_sensors_unit import GetMultipleSensorsUnit
-from .sensor_response_type_0 import SensorResponseType0
-from .sensors_response import SensorsResponse
+import warnings
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .account_response import AccountResponse
+    from .accounts_response import AccountsResponse
+    from .device_response import DeviceResponse
+    from .devices_response import DevicesResponse
+    from .error import Error
+    from .get_multiple_sensors_response_200 import GetMultipleSensorsResponse200
+    from .get_multiple_sensors_unit import GetMultipleSensorsUnit
+    from .sensor_response import SensorResponse
+    from .sensors_response import SensorsResponse
+
+# Models are imported on first access (PEP 562).
+_MODULES = {
+    "AccountResponse": ".account_response",
+    "AccountsResponse": ".accounts_response",
+    "DeviceResponse": ".device_response",
+    "DevicesResponse": ".devices_response",
+    "Error": ".error",
+    "GetMultipleSensorsResponse200": ".get_multiple_sensors_response_200",
+    "GetMultipleSensorsUnit": ".get_multiple_sensors_unit",
+    "SensorResponse": ".sensor_response",
+    "SensorsResponse": ".sensors_response",
+}
+
+# Names of models renamed by class_overrides in config.yaml, kept as
+# deprecated aliases so that code importing the old names keeps working.
+_DEPRECATED = {
+    "SensorResponseType0": "SensorResponse",
+}
 
 __all__ = (
     "AccountResponse",
@@ -18,6 +42,28 @@ __all__ = (
     "Error",
     "GetMultipleSensorsResponse200",
     "GetMultipleSensorsUnit",
-    "SensorResponseType0",
+    "SensorResponse",
     "SensorsResponse",
 )
+
+
+def __getattr__(name: str) -> Any:
+    if name in _DEPRECATED:
+        warnings.warn(
+            f"{name} is deprecated, use {_DEPRECATED[name]} instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return __getattr__(_DEPRECATED[name])
+
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -7,6 +7,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="AccountResponse")
 
+_FIELD_NAMES = frozenset({"id"})
+
 
 @_attrs_define
 class AccountResponse:
@@ -23,7 +25,6 @@ class AccountResponse:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if id is not UNSET:
             field_dict["id"] = id
 
@@ -31,14 +32,16 @@ class AccountResponse:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        d = src_dict.copy()
-        id = d.pop("id", UNSET)
+        id = src_dict.get("id", UNSET)
 
         account_response = cls(
             id=id,
         )
 
-        account_response.additional_properties = d
+        if not src_dict.keys() <= _FIELD_NAMES:
+            account_response.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
         return account_response
 
     @property
@@ -1,16 +1,14 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar, Union
+from typing import Any, Dict, List, Type, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
 from ..types import UNSET, Unset
 
-if TYPE_CHECKING:
-    from ..models.account_response import AccountResponse
-
-
 T = TypeVar("T", bound="AccountsResponse")
 
+_FIELD_NAMES = frozenset({"accounts"})
+
 
 @_attrs_define
 class AccountsResponse:
@@ -32,7 +30,6 @@ class AccountsResponse:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if accounts is not UNSET:
             field_dict["accounts"] = accounts
 
@@ -40,11 +37,8 @@ class AccountsResponse:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        from ..models.account_response import AccountResponse
-
-        d = src_dict.copy()
         accounts = []
-        _accounts = d.pop("accounts", UNSET)
+        _accounts = src_dict.get("accounts", UNSET)
         for accounts_item_data in _accounts or []:
             accounts_item = AccountResponse.from_dict(accounts_item_data)
 
@@ -54,7 +48,10 @@ class AccountsResponse:
             accounts=accounts,
         )
 
-        accounts_response.additional_properties = d
+        if not src_dict.keys() <= _FIELD_NAMES:
+            accounts_response.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
         return accounts_response
 
     @property
@@ -72,3 +69,6 @@ class AccountsResponse:
 
     def __contains__(self, key: str) -> bool:
         return key in self.additional_properties
+
+
+from ..models.account_response import AccountResponse  # noqa: E402
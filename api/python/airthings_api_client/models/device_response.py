@@ -7,6 +7,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="DeviceResponse")
 
+_FIELD_NAMES = frozenset({"serialNumber", "home", "name", "type", "sensors"})
+
 
 @_attrs_define
 class DeviceResponse:
@@ -29,11 +31,7 @@ class DeviceResponse:
     def to_dict(self) -> Dict[str, Any]:
         serial_number = self.serial_number
 
-        home: Union[None, Unset, str]
-        if isinstance(self.home, Unset):
-            home = UNSET
-        else:
-            home = self.home
+        home: Union[None, Unset, str] = self.home
 
         name = self.name
 
@@ -45,7 +43,6 @@ class DeviceResponse:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if serial_number is not UNSET:
             field_dict["serialNumber"] = serial_number
         if home is not UNSET:
@@ -61,23 +58,15 @@ class DeviceResponse:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        d = src_dict.copy()
-        serial_number = d.pop("serialNumber", UNSET)
-
-        def _parse_home(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
+        serial_number = src_dict.get("serialNumber", UNSET)
 
-        home = _parse_home(d.pop("home", UNSET))
+        home = cast(Union[None, Unset, str], src_dict.get("home", UNSET))
 
-        name = d.pop("name", UNSET)
+        name = src_dict.get("name", UNSET)
 
-        type = d.pop("type", UNSET)
+        type = src_dict.get("type", UNSET)
 
-        sensors = cast(List[str], d.pop("sensors", UNSET))
+        sensors = cast(List[str], src_dict.get("sensors", UNSET))
 
         device_response = cls(
             serial_number=serial_number,
@@ -87,7 +76,10 @@ class DeviceResponse:
             sensors=sensors,
         )
 
-        device_response.additional_properties = d
+        if not src_dict.keys() <= _FIELD_NAMES:
+            device_response.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
         return device_response
 
     @property
@@ -1,16 +1,14 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar, Union
+from typing import Any, Dict, List, Type, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
 from ..types import UNSET, Unset
 
-if TYPE_CHECKING:
-    from ..models.device_response import DeviceResponse
-
-
 T = TypeVar("T", bound="DevicesResponse")
 
+_FIELD_NAMES = frozenset({"devices"})
+
 
 @_attrs_define
 class DevicesResponse:
@@ -32,7 +30,6 @@ class DevicesResponse:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if devices is not UNSET:
             field_dict["devices"] = devices
 
@@ -40,11 +37,8 @@ class DevicesResponse:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        from ..models.device_response import DeviceResponse
-
-        d = src_dict.copy()
         devices = []
-        _devices = d.pop("devices", UNSET)
+        _devices = src_dict.get("devices", UNSET)
         for devices_item_data in _devices or []:
             devices_item = DeviceResponse.from_dict(devices_item_data)
 
@@ -54,7 +48,10 @@ class DevicesResponse:
             devices=devices,
         )
 
-        devices_response.additional_properties = d
+        if not src_dict.keys() <= _FIELD_NAMES:
+            devices_response.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
         return devices_response
 
     @property
@@ -72,3 +69,6 @@ class DevicesResponse:
 
     def __contains__(self, key: str) -> bool:
         return key in self.additional_properties
+
+
+from ..models.device_response import DeviceResponse  # noqa: E402
@@ -7,6 +7,8 @@ from ..types import UNSET, Unset
 
 T = TypeVar("T", bound="Error")
 
+_FIELD_NAMES = frozenset({"message"})
+
 
 @_attrs_define
 class Error:
@@ -23,7 +25,6 @@ class Error:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if message is not UNSET:
             field_dict["message"] = message
 
@@ -31,14 +32,16 @@ class Error:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        d = src_dict.copy()
-        message = d.pop("message", UNSET)
+        message = src_dict.get("message", UNSET)
 
         error = cls(
             message=message,
         )
 
-        error.additional_properties = d
+        if not src_dict.keys() <= _FIELD_NAMES:
+            error.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
         return error
 
     @property
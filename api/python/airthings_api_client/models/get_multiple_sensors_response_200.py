@@ -1,16 +1,14 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar, Union
+from typing import Any, Dict, List, Type, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
 from ..types import UNSET, Unset
 
-if TYPE_CHECKING:
-    from ..models.sensors_response import SensorsResponse
-
-
 T = TypeVar("T", bound="GetMultipleSensorsResponse200")
 
+_FIELD_NAMES = frozenset({"results", "hasNext", "totalPages"})
+
 
 @_attrs_define
 class GetMultipleSensorsResponse200:
@@ -40,7 +38,6 @@ class GetMultipleSensorsResponse200:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if results is not UNSET:
             field_dict["results"] = results
         if has_next is not UNSET:
@@ -52,19 +49,16 @@ class GetMultipleSensorsResponse200:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        from ..models.sensors_response import SensorsResponse
-
-        d = src_dict.copy()
         results = []
-        _results = d.pop("results", UNSET)
+        _results = src_dict.get("results", UNSET)
         for results_item_data in _results or []:
             results_item = SensorsResponse.from_dict(results_item_data)
 
             results.append(results_item)
 
-        has_next = d.pop("hasNext", UNSET)
+        has_next = src_dict.get("hasNext", UNSET)
 
-        total_pages = d.pop("totalPages", UNSET)
+        total_pages = src_dict.get("totalPages", UNSET)
 
         get_multiple_sensors_response_200 = cls(
             results=results,
@@ -72,7 +66,10 @@ class GetMultipleSensorsResponse200:
             total_pages=total_pages,
         )
 
-        get_multiple_sensors_response_200.additional_properties = d
+        if not src_dict.keys() <= _FIELD_NAMES:
+            get_multiple_sensors_response_200.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
         return get_multiple_sensors_response_200
 
     @property
@@ -90,3 +87,6 @@ class GetMultipleSensorsResponse200:
 
     def __contains__(self, key: str) -> bool:
         return key in self.additional_properties
+
+
+from ..models.sensors_response import SensorsResponse  # noqa: E402
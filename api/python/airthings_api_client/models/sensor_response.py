@@ -5,11 +5,13 @@ from attrs import field as _attrs_field
 
 from ..types import UNSET, Unset
 
-T = TypeVar("T", bound="SensorResponseType0")
+T = TypeVar("T", bound="SensorResponse")
+
+_FIELD_NAMES = frozenset({"sensorType", "value", "unit"})
 
 
 @_attrs_define
-class SensorResponseType0:
+class SensorResponse:
     """
     Attributes:
         sensor_type (Union[Unset, str]):
@@ -31,7 +33,6 @@ class SensorResponseType0:
 
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
-        field_dict.update({})
         if sensor_type is not UNSET:
             field_dict["sensorType"] = sensor_type
         if value is not UNSET:
@@ -43,21 +44,23 @@ class SensorResponseType0:
 
     @classmethod
     def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
-        d = src_dict.copy()
-        sensor_type = d.pop("sensorType", UNSET)
+        sensor_type = src_dict.get("sensorType", UNSET)
 
-        value = d.pop("value", UNSET)
+        value = src_dict.get("value", UNSET)
 
-        unit = d.pop("unit", UNSET)
+        unit = src_dict.get("unit", UNSET)
 
-        sensor_response_type_0 = cls(
+        sensor_response = cls(
             sensor_type=sensor_type,
             value=value,
             unit=unit,
         )
 
-        sensor_response_type_0.additional_properties = d
-        return sensor_response_type_0
+        if not src_dict.keys() <= _FIELD_NAMES:
+            sensor_response.additional_properties = {
+                prop_name: prop for prop_name, prop in src_dict.items() if prop_name not in _FIELD_NAMES
+            }
+        return sensor_response
 
     @property
     def additional_keys(self) -> List[str]:
@@ -1,6 +1,6 @@
 """ Contains some shared types for properties """
 from http import HTTPStatus
-from typing import BinaryIO, Generic, Literal, MutableMapping, Optional, Tuple, TypeVar
+from typing import BinaryIO, Generic, Literal, Mapping, MutableMapping, Optional, Tuple, TypeVar
 
 from attrs import define
 
@@ -31,14 +31,51 @@ class File:
 T = TypeVar("T")
 
 
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@define
+class RateLimit:
+    """The rate limit headers of a response
+
+    reset and retry_after are kept as sent, since they can be seconds, epoch seconds or dates.
+    """
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: Optional[str] = None
+    retry_after: Optional[str] = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "RateLimit":
+        return cls(
+            limit=_header_int(headers, "X-RateLimit-Limit"),
+            remaining=_header_int(headers, "X-RateLimit-Remaining"),
+            reset=headers.get("X-RateLimit-Reset"),
+            retry_after=headers.get("Retry-After", headers.get("X-RateLimit-Retry-After")),
+        )
+
+
 @define
 class Response(Generic[T]):
-    """A response from an endpoint"""
+    """A response from an endpoint
+
+    rate_limit holds the rate limit headers of every response. With release_content set on the client, content and
+    headers are emptied once the response is parsed, and only rate_limit is kept of the headers.
+    """
 
     status_code: HTTPStatus
     content: bytes
     headers: MutableMapping[str, str]
     parsed: Optional[T]
+    rate_limit: Optional[RateLimit] = None
 
 
-__all__ = ["File", "Response", "FileJsonType", "Unset", "UNSET"]
+__all__ = ["File", "RateLimit", "Response", "FileJsonType", "Unset", "UNSET"]
@@ -1,14 +1,75 @@
 """A client library for accessing Airthings for Consumer API"""
 
-from .mapper import Airthings
-from .types import AirthingsDevice, AirthingsSensor
-from .errors import UnexpectedStatusError, ApiError, UnexpectedPayloadError
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .mapper import Airthings
+    from .manager import AirthingsManager
+    from .history import SensorHistory
+    from .retry import RetryPolicy
+    from .hooks import AirthingsHooks, MappingEvent, RequestEvent, UpdateEvent
+    from .scheduler import PollScheduler
+    from .types import AirthingsChanges, AirthingsDevice, AirthingsSensor
+    from .errors import (
+        UnexpectedStatusError,
+        ApiError,
+        UnexpectedPayloadError,
+        CircuitOpenError,
+    )
+
+# Modules are imported on first access of their attributes (PEP 562), so
+# importing the package does not pull in httpx and the generated client.
+_EXPORTS = {
+    "Airthings": ".mapper",
+    "AirthingsChanges": ".types",
+    "AirthingsManager": ".manager",
+    "AirthingsDevice": ".types",
+    "AirthingsSensor": ".types",
+    "AirthingsHooks": ".hooks",
+    "MappingEvent": ".hooks",
+    "RequestEvent": ".hooks",
+    "UpdateEvent": ".hooks",
+    "PollScheduler": ".scheduler",
+    "RetryPolicy": ".retry",
+    "SensorHistory": ".history",
+    "UnexpectedStatusError": ".errors",
+    "ApiError": ".errors",
+    "UnexpectedPayloadError": ".errors",
+    "CircuitOpenError": ".errors",
+}
 
 __all__ = (
     "Airthings",
+    "AirthingsChanges",
+    "AirthingsManager",
     "AirthingsDevice",
     "AirthingsSensor",
+    "AirthingsHooks",
+    "MappingEvent",
+    "RequestEvent",
+    "UpdateEvent",
+    "PollScheduler",
+    "RetryPolicy",
+    "SensorHistory",
     "UnexpectedStatusError",
     "ApiError",
     "UnexpectedPayloadError",
+    "CircuitOpenError",
 )
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported attribute on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the attributes of the package, including lazy ones."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,274 @@
+"""Module providing access token management for the Airthings API SDK."""
+
+import asyncio
+import logging
+import threading
+import time
+from http import HTTPStatus
+from typing import Callable, Optional, Tuple
+
+import httpx
+
+from airthings_api_client import Client
+from airthings_sdk.const import AUTH_URL
+from airthings_sdk.errors import UnexpectedStatusError, UnexpectedPayloadError
+from airthings_sdk.hooks import AirthingsHooks, emit, request_event
+from airthings_sdk.types import AirthingsToken
+
+logger = logging.getLogger(__name__)
+
+# Seconds before expiry at which a background refresh fetches a new token.
+DEFAULT_REFRESH_MARGIN = 120
+# Seconds to wait before retrying a failed background refresh, and the
+# shortest wait between two background refreshes.
+RETRY_INTERVAL = 30
+# Longest wait before retrying a background refresh that keeps failing.
+MAX_RETRY_INTERVAL = 600
+
+
+class TokenManager:  # pylint: disable=too-many-instance-attributes
+    """Keep an Airthings API access token valid for one set of credentials.
+
+    Concurrent callers that need a new token share a single token request.
+    Optionally, a background thread or task refreshes the token shortly
+    before it expires, so requests never wait on the token endpoint. With
+    background_refresh, it starts with the first check of the token.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client_id: str,
+        client_secret: str,
+        auth_client: Client,
+        token: AirthingsToken,
+        on_refresh: Callable[[str], None],
+        *,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        background_refresh: bool = False,
+        hooks: Optional[AirthingsHooks] = None,
+    ):
+        """Init token manager.
+
+        on_refresh is called with every new access token. hooks receive an
+        event for every token request.
+        """
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._auth_client = auth_client
+        self._on_refresh = on_refresh
+        self._refresh_margin = refresh_margin
+        self._background_refresh_enabled = background_refresh
+        self._hooks = hooks
+
+        self.token = token
+
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_thread: Optional[threading.Thread] = None
+        self._background_task: Optional[asyncio.Task] = None
+        self._stop_event = threading.Event()
+
+    def ensure_valid(self):
+        """Make sure the access token is valid. If not, fetch a new one."""
+        if self._background_refresh_enabled:
+            self.start_background_refresh()
+
+        if self.token.is_valid():
+            return
+
+        with self._lock:
+            # Another thread may have refreshed it while we waited.
+            if not self.token.is_valid():
+                self._refresh()
+
+    async def async_ensure_valid(self):
+        """Make sure the access token is valid. If not, fetch a new one."""
+        if self._background_refresh_enabled:
+            self.async_start_background_refresh()
+
+        if self.token.is_valid():
+            return
+
+        await self._async_refresh_once()
+
+    def refresh(self):
+        """Fetch a new access token, even if the current one is still valid."""
+        with self._lock:
+            self._refresh()
+
+    async def async_refresh(self):
+        """Fetch a new access token, even if the current one is still valid."""
+        await self._async_refresh_once()
+
+    def start_background_refresh(self):
+        """Refresh the token before it expires from a daemon thread."""
+        if self._background_thread is not None and self._background_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._background_thread = threading.Thread(
+            target=self._background_refresh,
+            name="airthings-token-refresh",
+            daemon=True,
+        )
+        self._background_thread.start()
+
+    def async_start_background_refresh(self):
+        """Refresh the token before it expires from a task on the running loop."""
+        if self._background_task is not None and not self._background_task.done():
+            return
+
+        self._background_task = asyncio.get_running_loop().create_task(
+            self._async_background_refresh()
+        )
+
+    def stop_background_refresh(self):
+        """Stop any background refresh."""
+        self._stop_event.set()
+        if self._background_thread is not None:
+            self._background_thread.join()
+            self._background_thread = None
+        if self._background_task is not None:
+            self._background_task.cancel()
+            self._background_task = None
+
+    async def async_stop_background_refresh(self):
+        """Stop any background refresh without blocking the event loop."""
+        self._stop_event.set()
+        if self._background_task is not None:
+            self._background_task.cancel()
+            self._background_task = None
+        if self._background_thread is not None:
+            # The thread may be in the middle of a token request.
+            await asyncio.to_thread(self._background_thread.join)
+            self._background_thread = None
+
+    def _next_refresh_delay(self, failures: int = 0) -> float:
+        """Return the seconds until the next background refresh.
+
+        A token is refreshed refresh_margin seconds before it expires, but
+        no sooner than halfway through what is left of its lifetime, and
+        never within RETRY_INTERVAL seconds, so a short-lived token does not
+        make the refresh spin. After failures in a row, the wait doubles
+        from RETRY_INTERVAL up to MAX_RETRY_INTERVAL.
+        """
+        if failures:
+            return min(RETRY_INTERVAL * 2 ** (failures - 1), MAX_RETRY_INTERVAL)
+
+        expires_in = self.token.expires_in()
+        return max(expires_in - self._refresh_margin, expires_in / 2, RETRY_INTERVAL)
+
+    def _background_refresh(self):
+        """Refresh the token ahead of expiry until stopped."""
+        failures = 0
+        while not self._stop_event.wait(self._next_refresh_delay(failures)):
+            try:
+                self.refresh()
+            except (httpx.HTTPError, UnexpectedStatusError, UnexpectedPayloadError):
+                logger.exception("Background refresh of Airthings API token failed.")
+                failures += 1
+            else:
+                failures = 0
+
+    async def _async_background_refresh(self):
+        """Refresh the token ahead of expiry until cancelled."""
+        failures = 0
+        while True:
+            await asyncio.sleep(self._next_refresh_delay(failures))
+            try:
+                await self.async_refresh()
+            except (httpx.HTTPError, UnexpectedStatusError, UnexpectedPayloadError):
+                logger.exception("Background refresh of Airthings API token failed.")
+                failures += 1
+            else:
+                failures = 0
+
+    async def _async_refresh_once(self):
+        """Fetch a new token, joining a request already in flight if any."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(
+                self._async_refresh()
+            )
+
+        # Shield the shared request from the cancellation of one caller.
+        await asyncio.shield(self._refresh_task)
+
+    def _refresh(self):
+        """Fetch and store a new token."""
+        request_kwargs = self._token_request_kwargs()
+        sent = time.perf_counter()
+        response = self._auth_client.get_httpx_client().request(
+            **{**request_kwargs, "url": AUTH_URL + request_kwargs["url"]}
+        )
+        self._handle_response(request_kwargs, response, sent)
+
+    async def _async_refresh(self):
+        """Fetch and store a new token."""
+        request_kwargs = self._token_request_kwargs()
+        sent = time.perf_counter()
+        response = await self._auth_client.get_async_httpx_client().request(
+            **{**request_kwargs, "url": AUTH_URL + request_kwargs["url"]}
+        )
+        self._handle_response(request_kwargs, response, sent)
+
+    def _token_request_kwargs(self) -> dict:
+        """Build the request arguments for the client credentials grant."""
+        return {
+            "url": "/v1/token",
+            "method": "POST",
+            "data": {
+                "grant_type": "client_credentials",
+                "client_id": self._client_id,
+                "client_secret": self._client_secret,
+            },
+        }
+
+    def _handle_response(
+        self, request_kwargs: dict, response: httpx.Response, sent: float
+    ):
+        """Store the token from an auth response, reporting the request."""
+        received = time.perf_counter()
+        try:
+            self._set_token(response)
+        finally:
+            self._emit_request(
+                request_kwargs, response, (sent, received, time.perf_counter())
+            )
+
+    def _emit_request(
+        self,
+        request_kwargs: dict,
+        response: httpx.Response,
+        timing: Tuple[float, float, float],
+    ):
+        """Pass the event of a token request to the hooks."""
+        if self._hooks is None:
+            return
+
+        emit(
+            self._hooks.on_request,
+            request_event(
+                "token",
+                request_kwargs,
+                response,
+                kwargs={},
+                timing=timing,
+                attempt=0,
+            ),
+        )
+
+    def _set_token(self, response: httpx.Response):
+        """Store the token from an auth response and report it."""
+        if response.status_code != HTTPStatus.OK:
+            raise UnexpectedStatusError(response.status_code, response.content)
+
+        payload = self._auth_client.json_decoder(response.content)
+        access_token = payload.get("access_token")
+        expires_in = payload.get("expires_in")
+
+        if not isinstance(access_token, str) or not isinstance(expires_in, int):
+            raise UnexpectedPayloadError(response.content)
+
+        self.token.set_token(access_token=access_token, expires_in=expires_in)
+        logger.debug("Fetched a new Airthings API token.")
+        self._on_refresh(access_token)
@@ -0,0 +1,251 @@
+"""Module providing caching for the Airthings API SDK."""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from airthings_api_client.decoders import JSONDecoder, stdlib_decoder
+from airthings_api_client.models import DeviceResponse
+from airthings_sdk.types import AirthingsChanges, AirthingsDevice, AirthingsSensor
+
+if TYPE_CHECKING:
+    import sqlite3
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB);
+CREATE TABLE IF NOT EXISTS metadata (
+    serial_number TEXT PRIMARY KEY, account_id TEXT, data BLOB
+);
+CREATE TABLE IF NOT EXISTS devices (serial_number TEXT PRIMARY KEY, data BLOB);
+"""
+
+_CLEAR = """
+DELETE FROM meta;
+DELETE FROM metadata;
+DELETE FROM devices;
+"""
+
+
+class TTLCache(Generic[K, V]):
+    """A mapping whose entries expire ttl seconds after they were set.
+
+    A ttl of zero or less disables caching: every lookup is a miss, but for
+    that of a seeded entry.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """Init TTL cache."""
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[K, Tuple[float, V]] = {}
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires, value = entry
+        if self.ttl <= 0:
+            # A seeded value, which is served once.
+            del self._entries[key]
+        elif expires <= self._clock():
+            del self._entries[key]
+            return None
+
+        return value
+
+    def set(self, key: K, value: V):
+        """Cache a value for key."""
+        if self.ttl > 0:
+            self._entries[key] = (self._clock() + self.ttl, value)
+
+    def seed(self, key: K, value: V):
+        """Cache a value for key, even with caching disabled.
+
+        With a ttl of zero or less, only the next lookup of key returns it.
+        """
+        if self.ttl > 0:
+            self.set(key, value)
+        else:
+            self._entries[key] = (math.inf, value)
+
+    def invalidate(self, key: Optional[K] = None):
+        """Drop the entry for key, or every entry if no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+class DiskCache:
+    """SQLite file holding the state of one Airthings data handler.
+
+    Keeps the access token, the device metadata and the latest devices, so a
+    restarted data handler can serve data before its first request. The file
+    belongs to one client id and unit; it is cleared when opened with others.
+
+    The access token is a credential, stored in plain text. The file is
+    created readable and writable by its owner only, and an existing file
+    is restricted the same way.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        client_id: str,
+        unit: str,
+        json_decoder: JSONDecoder = stdlib_decoder,
+    ):
+        """Init disk cache."""
+        self._json_decoder = json_decoder
+        self._lock = threading.Lock()
+
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(path, 0o600)
+        # Imported here, as most data handlers have no disk cache.
+        # pylint: disable-next=import-outside-toplevel
+        import sqlite3
+
+        self._connection: "sqlite3.Connection" = sqlite3.connect(
+            path, check_same_thread=False
+        )
+
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+            owner = json.dumps({"client_id": client_id, "unit": unit}).encode()
+            if self._get_meta("owner") != owner:
+                self._connection.executescript(_CLEAR)
+                self._set_meta("owner", owner)
+
+    def load_token(self) -> Optional[Tuple[str, float]]:
+        """Return the cached access token and its expiry in epoch seconds."""
+        with self._lock:
+            data = self._get_meta("token")
+        if data is None:
+            return None
+
+        token = self._json_decoder(data)
+        return token["value"], token["expires_at"]
+
+    def save_token(self, value: str, expires_at: float):
+        """Cache an access token."""
+        data = json.dumps({"value": value, "expires_at": expires_at}).encode()
+        with self._lock, self._connection:
+            self._set_meta("token", data)
+
+    def load_metadata(self) -> Dict[str, Tuple[str, DeviceResponse]]:
+        """Return the cached account id and metadata of every device."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT serial_number, account_id, data FROM metadata"
+            ).fetchall()
+
+        return {
+            serial_number: (
+                account_id,
+                DeviceResponse.from_dict(self._json_decoder(data)),
+            )
+            for serial_number, account_id, data in rows
+        }
+
+    def save_metadata(self, account_id: str, device_map: Dict[str, DeviceResponse]):
+        """Replace the cached metadata of the devices of an account."""
+        rows = [
+            (serial_number, account_id, json.dumps(device.to_dict()).encode())
+            for serial_number, device in device_map.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM metadata WHERE account_id = ?", (account_id,)
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?)", rows
+            )
+
+    def load_devices(self) -> Dict[str, AirthingsDevice]:
+        """Return the cached devices."""
+        with self._lock:
+            rows = self._connection.execute("SELECT data FROM devices").fetchall()
+
+        devices = (_device_from_dict(self._json_decoder(data)) for (data,) in rows)
+        return {device.serial_number: device for device in devices}
+
+    def save_changes(self, changes: AirthingsChanges):
+        """Apply the changes of an update to the cached devices."""
+        rows = [
+            (device.serial_number, json.dumps(_device_to_dict(device)).encode())
+            for changed in (changes.added, changes.updated)
+            for device in changed.values()
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO devices VALUES (?, ?)", rows
+            )
+            self._connection.executemany(
+                "DELETE FROM devices WHERE serial_number = ?",
+                [(serial_number,) for serial_number in changes.removed],
+            )
+
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            self._connection.close()
+
+    def _get_meta(self, key: str) -> Optional[bytes]:
+        """Return a value of the meta table."""
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value: bytes):
+        """Set a value of the meta table."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value)
+        )
+
+
+def _device_to_dict(device: AirthingsDevice) -> dict:
+    """Convert a device to a JSON compatible dict."""
+    return {
+        "serial_number": device.serial_number,
+        "type": device.type,
+        "name": device.name,
+        "home": device.home,
+        "recorded": device.recorded,
+        "sensors": [
+            [sensor.sensor_type, sensor.value, sensor.unit] for sensor in device.sensors
+        ],
+    }
+
+
+def _device_from_dict(data: dict) -> AirthingsDevice:
+    """Create a device from a dict made by _device_to_dict."""
+    return AirthingsDevice(
+        serial_number=data["serial_number"],
+        type=data["type"],
+        name=data["name"],
+        home=data["home"],
+        recorded=data["recorded"],
+        sensors=tuple(
+            AirthingsSensor(sensor_type=sensor_type, value=value, unit=unit)
+            for sensor_type, value, unit in data["sensors"]
+        ),
+    )
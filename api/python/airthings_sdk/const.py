@@ -2,3 +2,13 @@
 
 AUTH_URL = "https://accounts-api.airthings.com"
 API_URL = "https://consumer-api.airthings.com"
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Number of records returned per page by the sensors endpoint.
+SENSORS_PAGE_SIZE = 50
+
+DEFAULT_MAX_RATE_LIMIT_RETRIES = 3
+
+# Seconds an account that keeps failing is skipped before it is tried again.
+DEFAULT_CIRCUIT_RESET_TIMEOUT = 300
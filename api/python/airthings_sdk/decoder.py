@@ -0,0 +1,219 @@
+"""Module providing a fast decoder from raw sensors pages to Airthings devices.
+
+The generated client turns every page into GetMultipleSensorsResponse200,
+SensorsResponse and SensorResponse objects before the SDK maps them to
+AirthingsDevice. This decoder maps the decoded JSON of a page straight to
+AirthingsDevice and AirthingsSensor objects in a single pass.
+
+Its pages are LazySensorsPage objects, which also give access to the page
+as SensorsResponse objects, built only for the items that are accessed.
+"""
+
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import (
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+import httpx
+
+from airthings_api_client import AuthenticatedClient
+from airthings_api_client.api.sensor import get_multiple_sensors
+from airthings_api_client.errors import UnexpectedStatus as LibUnexpectedStatus
+from airthings_api_client.models import DeviceResponse, Error, SensorsResponse
+from airthings_api_client.types import RateLimit, Response
+from airthings_sdk.types import AirthingsDevice, AirthingsSensor
+
+_get_kwargs = get_multiple_sensors._get_kwargs  # pylint: disable=protected-access
+
+P = TypeVar("P", bound="RawSensorsPage")
+
+
+@dataclass
+class RawSensorsPage:
+    """A page of the sensors endpoint, kept as decoded JSON."""
+
+    results: List[dict] = field(default_factory=list)
+    has_next: Optional[bool] = None
+    total_pages: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls: Type[P], src_dict: dict) -> P:
+        """Create a RawSensorsPage from the decoded JSON of a page."""
+        return cls(
+            results=src_dict.get("results") or [],
+            has_next=src_dict.get("hasNext"),
+            total_pages=src_dict.get("totalPages"),
+        )
+
+    def serial_numbers(self) -> Iterator[str]:
+        """Yield the serial numbers of the devices on the page."""
+        for item in self.results:
+            serial_number = item.get("serialNumber")
+            if isinstance(serial_number, str):
+                yield serial_number
+
+
+@dataclass
+class LazySensorsPage(RawSensorsPage, Sequence[SensorsResponse]):
+    """A page of the sensors endpoint that parses its items on access.
+
+    The page keeps the decoded JSON, and a SensorsResponse is built the
+    first time its item is indexed or iterated over. get looks up the item
+    of a device by serial number, through an index built on first use.
+    """
+
+    _parsed: List[Optional[SensorsResponse]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _index: Optional[dict[str, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @overload
+    def __getitem__(self, index: int) -> SensorsResponse: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SensorsResponse]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[SensorsResponse, List[SensorsResponse]]:
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self.results)))]
+
+        if index < 0:
+            index += len(self.results)
+        if not 0 <= index < len(self.results):
+            raise IndexError("page index out of range")
+
+        return self._item(index)
+
+    def __iter__(self) -> Iterator[SensorsResponse]:
+        for index in range(len(self.results)):
+            yield self._item(index)
+
+    def get(self, serial_number: str) -> Optional[SensorsResponse]:
+        """Return the item of the device with a serial number, if on the page."""
+        if self._index is None:
+            self._index = {}
+            for position, item in enumerate(self.results):
+                serial = item.get("serialNumber")
+                if isinstance(serial, str):
+                    self._index.setdefault(serial, position)
+
+        index = self._index.get(serial_number)
+        return None if index is None else self._item(index)
+
+    def _item(self, index: int) -> SensorsResponse:
+        """Return the parsed item at a position, parsing it if needed."""
+        if not self._parsed:
+            self._parsed = [None] * len(self.results)
+
+        item = self._parsed[index]
+        if item is None:
+            item = self._parsed[index] = SensorsResponse.from_dict(self.results[index])
+        return item
+
+
+def decode_device(device: DeviceResponse, item: dict) -> AirthingsDevice:
+    """Create an AirthingsDevice from a DeviceResponse and a raw sensors item.
+
+    Equivalent to AirthingsDevice.from_response on the parsed item: fields
+    missing from the item are None, as are null ones.
+    """
+    sensors = [
+        AirthingsSensor(
+            sensor_type=cast(str, sensor.get("sensorType")),
+            value=cast(Union[int, float], sensor.get("value")),
+            unit=cast(str, sensor.get("unit")),
+        )
+        for sensor in item.get("sensors") or ()
+        if isinstance(sensor, dict)
+    ]
+
+    battery_percentage = item.get("batteryPercentage")
+    if battery_percentage is not None:
+        sensors.append(
+            AirthingsSensor(sensor_type="battery", value=battery_percentage, unit="%")
+        )
+
+    return AirthingsDevice(
+        serial_number=cast(str, device.serial_number),
+        type=cast(str, device.type),
+        name=cast(str, device.name),
+        home=cast(Optional[str], device.home),
+        recorded=item.get("recorded"),
+        sensors=tuple(sensors),
+    )
+
+
+def build_response(
+    *, client: AuthenticatedClient, response: httpx.Response
+) -> Response[Union[Error, LazySensorsPage]]:
+    """Build a Response like the generated endpoint, with a raw page."""
+    parsed: Optional[Union[Error, LazySensorsPage]]
+    if response.status_code == HTTPStatus.OK:
+        parsed = LazySensorsPage.from_dict(client.json_decoder(response.content))
+    elif response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        parsed = Error.from_dict(client.json_decoder(response.content))
+    elif client.raise_on_unexpected_status:
+        raise LibUnexpectedStatus(response.status_code, response.content)
+    else:
+        parsed = None
+
+    rate_limit = RateLimit.from_headers(response.headers)
+    if client.release_content and parsed is not None:
+        return Response(
+            status_code=HTTPStatus(response.status_code),
+            content=b"",
+            headers={},
+            parsed=parsed,
+            rate_limit=rate_limit,
+        )
+
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=parsed,
+        rate_limit=rate_limit,
+    )
+
+
+def sync_detailed(
+    account_id: str, *, client: AuthenticatedClient, **kwargs: Any
+) -> Response[Union[Error, LazySensorsPage]]:
+    """Get sensors for a set of devices, as a raw page.
+
+    Takes the same arguments as get_multiple_sensors.sync_detailed.
+    """
+    response = client.get_httpx_client().request(**_get_kwargs(account_id, **kwargs))
+
+    return build_response(client=client, response=response)
+
+
+async def asyncio_detailed(
+    account_id: str, *, client: AuthenticatedClient, **kwargs: Any
+) -> Response[Union[Error, LazySensorsPage]]:
+    """Get sensors for a set of devices, as a raw page.
+
+    Takes the same arguments as get_multiple_sensors.asyncio_detailed.
+    """
+    response = await client.get_async_httpx_client().request(
+        **_get_kwargs(account_id, **kwargs)
+    )
+
+    return build_response(client=client, response=response)
@@ -32,3 +32,13 @@ class ApiError(Exception):
     def __init__(self, error: str):
         self.error = error
         super().__init__(f"{self.message} Error: {error}")
+
+
+class CircuitOpenError(Exception):
+    """Circuit open error."""
+
+    message = "Skipped an account that keeps failing."
+
+    def __init__(self, account_id: str):
+        self.account_id = account_id
+        super().__init__(f"{self.message} Account: {account_id}")
@@ -0,0 +1,167 @@
+"""Module providing in-memory sensor history for the Airthings API SDK."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from airthings_sdk.types import AirthingsDevice
+
+Reading = Tuple[float, float]
+
+
+class _TimestampsView:
+    """Sequence view of the timestamps of a ring buffer, oldest first."""
+
+    def __init__(self, buffer: "RingBuffer"):
+        """Init timestamps view."""
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        """Return the number of timestamps."""
+        return len(self._buffer)
+
+    def __getitem__(self, index: int) -> float:
+        """Return the timestamp at a position, counted from the oldest."""
+        # pylint: disable=protected-access
+        buffer = self._buffer
+        return buffer._timestamps[(buffer._start + index) % buffer.capacity]
+
+
+class RingBuffer:
+    """Fixed capacity buffer of readings, ordered by time.
+
+    Memory for all readings is allocated up front. Once full, every append
+    overwrites the oldest reading. Readings that are not newer than the
+    latest one are ignored, which keeps the buffer sorted for range queries.
+    """
+
+    def __init__(self, capacity: int):
+        """Init ring buffer."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of readings."""
+        return self._size
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """Add a reading. Return False if it is not newer than the latest."""
+        if self._size and timestamp <= self._timestamps[self._last()]:
+            return False
+
+        if self._size < self.capacity:
+            position = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            position = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._timestamps[position] = timestamp
+        self._values[position] = value
+        return True
+
+    def latest(self) -> Optional[Reading]:
+        """Return the latest reading, if any."""
+        if not self._size:
+            return None
+        position = self._last()
+        return self._timestamps[position], self._values[position]
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[Reading]:
+        """Return the readings from start to end, both included, oldest first."""
+        timestamps = _TimestampsView(self)
+        low = 0 if start is None else bisect_left(timestamps, start)
+        high = self._size if end is None else bisect_right(timestamps, end)
+
+        readings = []
+        for index in range(low, high):
+            position = (self._start + index) % self.capacity
+            readings.append((self._timestamps[position], self._values[position]))
+        return readings
+
+    def __iter__(self) -> Iterator[Reading]:
+        """Iterate over all readings, oldest first."""
+        return iter(self.between())
+
+    def _last(self) -> int:
+        """Return the position of the latest reading."""
+        return (self._start + self._size - 1) % self.capacity
+
+
+class SensorHistory:
+    """Recent readings of every device and sensor, kept in ring buffers.
+
+    Each sensor of a device gets a RingBuffer of capacity readings, so
+    memory is bounded by the number of sensors. A device is recorded once
+    per recorded time, however often it is polled.
+    """
+
+    def __init__(self, capacity: int):
+        """Init sensor history."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+
+        self.capacity = capacity
+        self._buffers: dict[str, dict[str, RingBuffer]] = {}
+        self._recorded: dict[str, float] = {}
+
+    def record(self, devices: Iterable[AirthingsDevice]):
+        """Append the readings of devices with a new recorded time."""
+        for device in devices:
+            timestamp = device.recorded_timestamp()
+            if timestamp is None:
+                continue
+
+            serial_number = device.serial_number
+            if self._recorded.get(serial_number) == timestamp:
+                continue
+            self._recorded[serial_number] = timestamp
+
+            buffers = self._buffers.setdefault(serial_number, {})
+            for sensor in device.sensors:
+                if not isinstance(sensor.value, (int, float)):
+                    continue
+
+                buffer = buffers.get(sensor.sensor_type)
+                if buffer is None:
+                    buffer = buffers[sensor.sensor_type] = RingBuffer(self.capacity)
+                buffer.append(timestamp, sensor.value)
+
+    def readings(
+        self,
+        serial_number: str,
+        sensor_type: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Reading]:
+        """Return the (timestamp, value) readings of a sensor from start to end."""
+        buffer = self._buffers.get(serial_number, {}).get(sensor_type)
+        if buffer is None:
+            return []
+        return buffer.between(start, end)
+
+    def latest(self, serial_number: str, sensor_type: str) -> Optional[Reading]:
+        """Return the latest reading of a sensor, if any."""
+        buffer = self._buffers.get(serial_number, {}).get(sensor_type)
+        return None if buffer is None else buffer.latest()
+
+    def sensor_types(self, serial_number: str) -> List[str]:
+        """Return the sensor types with history for a device."""
+        return list(self._buffers.get(serial_number, {}))
+
+    def forget(self, serial_number: str):
+        """Drop the history of a device."""
+        self._recorded.pop(serial_number, None)
+        self._buffers.pop(serial_number, None)
+
+    def __len__(self) -> int:
+        """Return the number of devices with history."""
+        return len(self._buffers)
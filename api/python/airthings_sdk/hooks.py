@@ -0,0 +1,124 @@
+"""Module providing instrumentation hooks for the Airthings API SDK.
+
+Subclass AirthingsHooks and pass it to Airthings to receive an event for
+every API request, every mapped sensors page and every update. Adapters
+for Prometheus, OpenTelemetry and the like only need to implement the
+methods they care about. Without hooks, nothing is measured.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+
+from airthings_sdk.ratelimit import RateLimitState
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RequestEvent:  # pylint: disable=too-many-instance-attributes
+    """A request to an Airthings API endpoint.
+
+    network_time covers sending the request and reading the response,
+    parse_time building the parsed payload from it. For a streamed sensors
+    page, network_time ends with the headers, and parse_time covers reading
+    and parsing the body as it arrives. attempt counts the retries of a rate
+    limited request, from 0. rate_limit is the budget reported by the
+    response, if it had rate limit headers.
+    """
+
+    endpoint: str
+    method: str
+    path: str
+    status_code: int
+    response_bytes: int
+    network_time: float
+    parse_time: float
+    attempt: int
+    account_id: Optional[str]
+    page_number: Optional[int]
+    rate_limit: Optional[RateLimitState]
+
+
+@dataclass(frozen=True, slots=True)
+class MappingEvent:
+    """A sensors page of an account mapped to Airthings devices."""
+
+    account_id: str
+    devices: int
+    duration: float
+    raw: bool
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateEvent:
+    """An update of the devices of a data handler."""
+
+    devices: int
+    added: int
+    updated: int
+    removed: int
+    partial: bool
+    failed_accounts: int
+    duration: float
+
+
+class AirthingsHooks:
+    """Receiver of instrumentation events. Every method does nothing here.
+
+    Hooks are called synchronously on the thread or event loop that made
+    the request, so they should be quick. Exceptions they raise are
+    logged and otherwise ignored.
+    """
+
+    def on_request(self, event: RequestEvent):
+        """Handle a finished API request."""
+
+    def on_mapping(self, event: MappingEvent):
+        """Handle a mapped sensors page."""
+
+    def on_update(self, event: UpdateEvent):
+        """Handle a finished update of the devices."""
+
+
+def emit(hook: Callable[[Any], None], event: Any):
+    """Call a hook with an event, logging any exception it raises."""
+    try:
+        hook(event)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception("Airthings hook %s failed.", hook)
+
+
+def request_event(  # pylint: disable=too-many-arguments
+    endpoint: str,
+    request_kwargs: dict,
+    response: "httpx.Response",
+    *,
+    kwargs: dict,
+    timing: Tuple[float, float, float],
+    attempt: int,
+    response_bytes: Optional[int] = None,
+) -> RequestEvent:
+    """Build the event of a request from its (sent, received, parsed) times.
+
+    response_bytes defaults to the size of the content of the response.
+    """
+    sent, received, parsed = timing
+    return RequestEvent(
+        endpoint=endpoint,
+        method=str(request_kwargs.get("method", "")).upper(),
+        path=str(request_kwargs.get("url", "")),
+        status_code=response.status_code,
+        response_bytes=(
+            len(response.content) if response_bytes is None else response_bytes
+        ),
+        network_time=received - sent,
+        parse_time=parsed - received,
+        attempt=attempt,
+        account_id=kwargs.get("account_id"),
+        page_number=kwargs.get("page_number"),
+        rate_limit=RateLimitState.from_headers(response.headers),
+    )
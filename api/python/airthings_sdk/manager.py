@@ -0,0 +1,175 @@
+"""Module providing a multi-tenant manager for the Airthings API SDK."""
+
+import asyncio
+import logging
+from typing import Any, Iterator, Optional
+
+import httpx
+
+from airthings_sdk.const import DEFAULT_MAX_CONCURRENCY
+from airthings_sdk.mapper import ACCOUNT_ERRORS, Airthings
+from airthings_sdk.types import AirthingsDevice
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=20,
+    keepalive_expiry=60,
+)
+
+
+class AirthingsManager:
+    """Manage Airthings data handlers for many sets of credentials.
+
+    Every tenant has its own token, caches and devices, while all of them
+    send their requests over one shared connection pool. A tenant that
+    fails does not fail the update of the others: its devices are kept as
+    they were, and its error is put in errors.
+    """
+
+    errors: dict[str, Exception]
+
+    def __init__(
+        self,
+        *,
+        limits: httpx.Limits = DEFAULT_POOL_LIMITS,
+        http2: bool = False,
+        max_concurrent_tenants: int = DEFAULT_MAX_CONCURRENCY,
+        **options: Any,
+    ):
+        """Init Airthings manager.
+
+        limits and http2 configure the shared connection pool; http2 requires
+        the h2 package. options are passed to every Airthings data handler.
+        """
+        self._transport = httpx.HTTPTransport(limits=limits, http2=http2)
+        self._async_transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        self._max_concurrent_tenants = max_concurrent_tenants
+        self._options = options
+        self._tenants: dict[str, Airthings] = {}
+        self.errors = {}
+
+    def add(
+        self,
+        tenant_id: str,
+        client_id: str,
+        client_secret: str,
+        is_metric: bool = True,
+    ) -> Airthings:
+        """Add a tenant and return its data handler."""
+        if tenant_id in self._tenants:
+            raise ValueError(f"Tenant {tenant_id} already exists.")
+
+        airthings = Airthings(
+            client_id=client_id,
+            client_secret=client_secret,
+            is_metric=is_metric,
+            transport=self._transport,
+            async_transport=self._async_transport,
+            **self._options,
+        )
+        self._tenants[tenant_id] = airthings
+        return airthings
+
+    def remove(self, tenant_id: str) -> Optional[Airthings]:
+        """Remove a tenant and return its data handler, if it existed."""
+        airthings = self._tenants.pop(tenant_id, None)
+        if airthings is not None:
+            airthings.close()
+        return airthings
+
+    def __getitem__(self, tenant_id: str) -> Airthings:
+        """Return the data handler of a tenant."""
+        return self._tenants[tenant_id]
+
+    def __contains__(self, tenant_id: object) -> bool:
+        """Tell whether a tenant exists."""
+        return tenant_id in self._tenants
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the tenant ids."""
+        return iter(self._tenants)
+
+    def __len__(self) -> int:
+        """Return the number of tenants."""
+        return len(self._tenants)
+
+    def update_devices(self) -> dict[str, dict[str, AirthingsDevice]]:
+        """Update the devices of every tenant. Return them by tenant id."""
+        self.errors = {}
+        res = {}
+        for tenant_id, airthings in self._tenants.items():
+            try:
+                res[tenant_id] = airthings.update_devices()
+            except ACCOUNT_ERRORS as e:
+                res[tenant_id] = self._tenant_failed(tenant_id, e)
+
+        return res
+
+    async def async_update_devices(self) -> dict[str, dict[str, AirthingsDevice]]:
+        """Update the devices of every tenant. Return them by tenant id.
+
+        At most max_concurrent_tenants tenants are updated at once.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrent_tenants)
+
+        async def update(airthings: Airthings) -> dict[str, AirthingsDevice]:
+            async with semaphore:
+                return await airthings.async_update_devices()
+
+        self.errors = {}
+        tenant_ids = list(self._tenants)
+        results = await asyncio.gather(
+            *(update(self._tenants[tenant_id]) for tenant_id in tenant_ids),
+            return_exceptions=True,
+        )
+
+        res = {}
+        for tenant_id, result in zip(tenant_ids, results):
+            if isinstance(result, ACCOUNT_ERRORS):
+                res[tenant_id] = self._tenant_failed(tenant_id, result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                res[tenant_id] = result
+
+        return res
+
+    def _tenant_failed(
+        self, tenant_id: str, error: Exception
+    ) -> dict[str, AirthingsDevice]:
+        """Record the failure of a tenant. Return its current devices."""
+        logger.warning("Failed to update tenant %s: %s", tenant_id, error)
+        self.errors[tenant_id] = error
+        return self._tenants[tenant_id].devices
+
+    def close(self):
+        """Stop all tenants and close the shared connection pool."""
+        for airthings in self._tenants.values():
+            airthings.close()
+        self._transport.close()
+
+    async def aclose(self):
+        """Stop all tenants and close the shared connection pool."""
+        await asyncio.gather(
+            *(airthings.aclose() for airthings in self._tenants.values())
+        )
+        self._transport.close()
+        await self._async_transport.aclose()
+
+    def __enter__(self) -> "AirthingsManager":
+        """Enter a context manager that closes the pool on exit."""
+        return self
+
+    def __exit__(self, *args: Any):
+        """Exit the context manager and close the pool."""
+        self.close()
+
+    async def __aenter__(self) -> "AirthingsManager":
+        """Enter a context manager that closes the pool on exit."""
+        return self
+
+    async def __aexit__(self, *args: Any):
+        """Exit the context manager and close the pool."""
+        await self.aclose()
@@ -1,50 +1,75 @@
 """Module providing an Airthings API SDK."""
 
+import asyncio
 import logging
-from typing import List, Optional
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
+import httpx
 from httpx import AsyncClient
 
-from airthings_api_client import Client, AuthenticatedClient
-from airthings_api_client.api.accounts import get_accounts_ids
-from airthings_api_client.api.device import get_devices
-from airthings_api_client.api.sensor import get_multiple_sensors
 from airthings_api_client.errors import UnexpectedStatus as LibUnexpectedStatus
-from airthings_api_client.models import (
-    Error,
-    GetMultipleSensorsResponse200,
-)
 from airthings_api_client.models.device_response import DeviceResponse
-from airthings_api_client.models.get_multiple_sensors_unit import GetMultipleSensorsUnit
 from airthings_api_client.models.sensors_response import SensorsResponse
 from airthings_api_client.types import Unset
-from airthings_sdk.const import AUTH_URL, API_URL
-from airthings_sdk.errors import UnexpectedStatusError, UnexpectedPayloadError, ApiError
-from airthings_sdk.types import AirthingsToken, AirthingsDevice
+from airthings_sdk.cache import DiskCache
+from airthings_sdk.decoder import LazySensorsPage, RawSensorsPage, decode_device
+from airthings_sdk.errors import (
+    UnexpectedStatusError,
+    UnexpectedPayloadError,
+    ApiError,
+    CircuitOpenError,
+)
+from airthings_sdk.history import SensorHistory
+from airthings_sdk.metadata import DeviceMetadata
+from airthings_sdk.options import AirthingsOptions, check_options
+from airthings_sdk.pages import SensorPages, SensorsPage, chunks
+from airthings_sdk.store import DeviceStore
+from airthings_sdk.stream import SensorsPageParser
+from airthings_sdk.hooks import MappingEvent, UpdateEvent, emit
+from airthings_sdk.requester import ApiRequester
+from airthings_sdk.types import AirthingsChanges, AirthingsDevice
+
+if TYPE_CHECKING:
+    from typing_extensions import Unpack
+
+    from airthings_sdk.snapshot import FleetSnapshot, FleetSnapshotBuilder
 
 logger = logging.getLogger(__name__)
 
+# Failures of one account that do not stop the update of the others.
+ACCOUNT_ERRORS = (
+    UnexpectedStatusError,
+    UnexpectedPayloadError,
+    ApiError,
+    CircuitOpenError,
+    httpx.HTTPError,
+)
+
 
 class Airthings:
     """Representation of Airthings API data handler."""
 
-    _client_id: str
-    _client_secret: str
-
-    _unit: GetMultipleSensorsUnit
-    _access_token: AirthingsToken = AirthingsToken()
-
-    _auth_api_client: Client = Client(
-        base_url=AUTH_URL,
-        raise_on_unexpected_status=True,
-    )
-    _api_client: AuthenticatedClient = AuthenticatedClient(
-        base_url=API_URL,
-        token="invalid_token",  # Should authenticate and update before using
-        raise_on_unexpected_status=True,
-    )
+    _requester: ApiRequester
+    _metadata: DeviceMetadata
+    _pages: SensorPages
+    _store: DeviceStore
 
-    devices: dict[str, AirthingsDevice] = {}
+    devices: dict[str, AirthingsDevice]
+    changes: AirthingsChanges
+    errors: dict[str, Exception]
 
     def __init__(
         self,
@@ -52,151 +77,686 @@ class Airthings:
         client_secret: str,
         is_metric: bool,
         web_session: Optional[AsyncClient] = None,
+        **options: "Unpack[AirthingsOptions]",
     ):
-        """Init Airthings data handler."""
-        self._client_id = client_id
-        self._client_secret = client_secret
-        self._unit = (
-            GetMultipleSensorsUnit.METRIC
-            if is_metric
-            else GetMultipleSensorsUnit.IMPERIAL
+        """Init Airthings data handler.
+
+        The options are keyword arguments, all optional; unknown ones raise a
+        TypeError.
+
+        max_concurrency caps the number of requests in flight at once when
+        using the async methods. With parallel_pages, the async methods derive
+        the number of sensor pages from the device count and fetch them
+        concurrently instead of one after another.
+
+        Requests are paced using the rate limit headers of the API. A rate
+        limited request is retried up to max_rate_limit_retries times once the
+        API allows it again.
+
+        With a positive metadata_ttl, account ids and device metadata are
+        cached for that many seconds, so a poll only fetches sensors. Sensors
+        of a device missing from the cache trigger a refresh of the devices
+        of its account.
+
+        web_session is used for the async requests. It is not modified, so
+        it can be shared with other code, and needs no base URL.
+
+        httpx_args are passed to the httpx clients the data handler builds.
+        Given a transport or async_transport, its httpx clients send requests
+        through it, which lets several data handlers share one connection pool.
+        Otherwise limits sets the size and keep-alive expiry of their pools,
+        and http2 enables HTTP/2, which requires the h2 package.
+
+        With fast_decode, sensors pages are mapped from their JSON straight
+        to devices, skipping the generated response models. With lazy_pages,
+        iter_sensor_pages and aiter_sensor_pages yield LazySensorsPage objects,
+        which build a SensorsResponse only for the items that are accessed,
+        and look items up by serial number with get.
+
+        json_decoder decodes response bodies from bytes. By default orjson or
+        msgspec is used when installed, and the standard library otherwise.
+
+        With build_snapshot, every full update also builds the columnar
+        snapshot returned by snapshot_arrays while mapping devices. This
+        requires NumPy.
+
+        With a positive history_capacity, history keeps up to that many
+        readings per device and sensor.
+
+        With a cache_path, the access token, device metadata and devices are
+        kept in an SQLite file there. A new data handler loads them, so it
+        serves the devices of its last run right away; start_revalidation
+        then updates them in the background. The file holds the access
+        token in plain text, so it is only accessible to its owner. close
+        closes it.
+
+        hooks receive an event for every API request, mapped sensors page
+        and update, with timings and the rate limit budget.
+
+        With a retry_policy, requests failing with a transport error or a
+        server error are retried with backoff. An account that fails does not
+        fail the update: its devices are kept as they were, and its error is
+        put in errors. Only when every account fails is the error raised.
+        With a positive failure_threshold, an account failing that many
+        updates in a row is skipped for circuit_reset_timeout seconds.
+
+        With background_token_refresh, the access token is refreshed ahead
+        of expiry from a background thread, or a task on the running loop,
+        started by the first sync or async request. close and aclose stop
+        it.
+        """
+        check_options(options)
+
+        self._store = DeviceStore(
+            options.get("history_capacity", 0),
+            options.get("build_snapshot", False),
+            options.get("hooks"),
+        )
+        self._requester = ApiRequester(
+            client_id,
+            client_secret,
+            options,
+            web_session,
+            on_token=self._store.save_token,
+        )
+        self._metadata = DeviceMetadata(
+            self._requester,
+            client_id,
+            options.get("metadata_ttl", 0),
+            on_fetch=self._store.save_metadata,
         )
+        self._pages = SensorPages(self._requester, is_metric, options)
+        self.devices = {}
+        self.changes = AirthingsChanges()
+        self.errors = {}
+
+        cache_path = options.get("cache_path")
+        if cache_path is not None:
+            self._load_disk_cache(
+                self._store.open_disk_cache(
+                    cache_path,
+                    client_id,
+                    self._pages.unit.value,
+                    self._requester.api_client.json_decoder,
+                )
+            )
 
-        if web_session:
-            self._auth_api_client.set_async_httpx_client(web_session)
-            self._api_client.set_async_httpx_client(web_session)
+    @property
+    def history(self) -> Optional[SensorHistory]:
+        """Return the sensor history, kept with a positive history_capacity."""
+        return self._store.history
 
     def verify_auth(self):
         """Make sure the access token is valid. If not, fetch a new one."""
+        self._requester.token_manager.ensure_valid()
+
+    async def async_verify_auth(self):
+        """Make sure the access token is valid. If not, fetch a new one.
+
+        Concurrent callers share a single token request.
+        """
+        await self._requester.token_manager.async_ensure_valid()
+
+    def close(self):
+        """Stop refreshing the access token and close the disk cache."""
+        self._requester.token_manager.stop_background_refresh()
+        self._store.close()
+
+    async def aclose(self):
+        """Stop refreshing the access token and close the disk cache.
+
+        Waits for a background thread without blocking the event loop.
+        """
+        await self._requester.token_manager.async_stop_background_refresh()
+        self._store.close()
+
+    def warm_up(self):
+        """Open connections to the auth and API hosts ahead of the first poll.
+
+        Resolves DNS and completes the TLS handshakes with a request to the
+        health endpoint of each host, so the connections are kept alive for
+        the requests that follow. Failures are logged, not raised.
+        """
+        self._requester.warm_up()
+
+    async def async_warm_up(self, connections: int = 1):
+        """Open connections to the auth and API hosts ahead of the first poll.
+
+        Resolves DNS and completes the TLS handshakes with a request to the
+        health endpoint of each host, so the connections are kept alive for
+        the requests that follow. With HTTP/1.1, up to connections
+        connections are opened to the API host at once, to serve concurrent
+        requests. Failures are logged, not raised.
+        """
+        await self._requester.async_warm_up(connections)
+
+    def start_revalidation(self) -> threading.Thread:
+        """Update the devices from a daemon thread.
+
+        Meant to refresh the devices loaded from the disk cache while they
+        are already being served.
+        """
+        thread = threading.Thread(
+            target=self._revalidate, name="airthings-revalidation", daemon=True
+        )
+        thread.start()
+        return thread
 
-        if self._access_token.is_valid():
-            return
+    def async_start_revalidation(self) -> asyncio.Task:
+        """Update the devices from a task on the running loop.
+
+        Meant to refresh the devices loaded from the disk cache while they
+        are already being served.
+        """
+        return asyncio.get_running_loop().create_task(self.async_update_devices())
 
+    def _revalidate(self):
+        """Update the devices, logging any failure."""
         try:
-            auth_response = self._auth_api_client.get_httpx_client().request(
-                url=AUTH_URL + "/v1/token",
-                method="POST",
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": self._client_id,
-                    "client_secret": self._client_secret,
-                },
-            )
+            self.update_devices()
+        except (
+            httpx.HTTPError,
+            UnexpectedStatusError,
+            UnexpectedPayloadError,
+            ApiError,
+        ):
+            logger.exception("Revalidation of Airthings devices failed.")
 
-            access_token = auth_response.json().get("access_token")
-            expires_in = auth_response.json().get("expires_in")
+    def _load_disk_cache(self, disk_cache: DiskCache) -> None:
+        """Restore the token, device metadata and devices from the disk cache."""
+        token = disk_cache.load_token()
+        if token is not None:
+            self._requester.restore_token(*token)
 
-            self._access_token.set_token(
-                access_token=access_token, expires_in=expires_in
-            )
-            self._api_client.token = self._access_token.value
-        except LibUnexpectedStatus as e:
-            raise UnexpectedStatusError(e.status_code, e.content) from e
+        self._metadata.restore(disk_cache.load_metadata())
 
-    def update_devices(self) -> dict[str, AirthingsDevice]:
-        """Update devices and sensors from Airthings API. Return a dict of devices."""
+        self.devices = disk_cache.load_devices()
+        logger.debug("Loaded %s devices from the disk cache.", len(self.devices))
+
+    def update_devices(
+        self, serial_numbers: Optional[Iterable[str]] = None
+    ) -> dict[str, AirthingsDevice]:
+        """Update devices and sensors from Airthings API. Return a dict of devices.
+
+        With serial_numbers, only those devices are fetched and merged into
+        the existing devices. Devices of accounts that failed are kept as
+        they were.
+        """
         logger.info("Fetching devices and sensors from Airthings API.")
 
-        self.verify_auth()
+        started = time.perf_counter()
+        builder = self._store.snapshot_builder(serial_numbers is not None)
+        res = {}
+        try:
+            for device in self.iter_devices(serial_numbers):
+                res[device.serial_number] = device
+                if builder is not None:
+                    builder.add(device)
+        except UnexpectedStatusError as e:
+            logger.error(
+                "Unexpected status code %s received when fetching devices and sensors.",
+                e.status_code,
+            )
+            raise
+
+        self._keep_failed_accounts(res, builder)
+        return self._store_devices(
+            res,
+            partial=serial_numbers is not None,
+            snapshot=builder.build() if builder is not None else None,
+            started=started,
+        )
+
+    async def async_update_devices(
+        self, serial_numbers: Optional[Iterable[str]] = None
+    ) -> dict[str, AirthingsDevice]:
+        """Update devices and sensors from Airthings API. Return a dict of devices.
 
+        All accounts are fetched concurrently, with at most max_concurrency
+        requests in flight. With serial_numbers, only those devices are
+        fetched and merged into the existing devices. Devices of accounts that
+        failed are kept as they were.
+        """
+        logger.info("Fetching devices and sensors from Airthings API.")
+
+        started = time.perf_counter()
+        builder = self._store.snapshot_builder(serial_numbers is not None)
+        res = {}
         try:
-            account_ids = self._fetch_all_accounts_ids()
+            async for device in self.aiter_devices(serial_numbers):
+                res[device.serial_number] = device
+                if builder is not None:
+                    builder.add(device)
+        except UnexpectedStatusError as e:
+            logger.error(
+                "Unexpected status code %s received when fetching devices and sensors.",
+                e.status_code,
+            )
+            raise
+
+        self._keep_failed_accounts(res, builder)
+        return self._store_devices(
+            res,
+            partial=serial_numbers is not None,
+            snapshot=builder.build() if builder is not None else None,
+            started=started,
+        )
 
-            res = {}
-            for account_id in account_ids:
+    def refresh_device(self, serial_number: str) -> Optional[AirthingsDevice]:
+        """Update a single device from Airthings API and return it."""
+        return self.update_devices([serial_number]).get(serial_number)
 
-                devices = self._fetch_all_devices(account_id=account_id)
+    async def async_refresh_device(
+        self, serial_number: str
+    ) -> Optional[AirthingsDevice]:
+        """Update a single device from Airthings API and return it."""
+        return (await self.async_update_devices([serial_number])).get(serial_number)
 
-                device_map = {}
-                for device in devices:
-                    device_map[device.serial_number] = device
+    def snapshot_arrays(self) -> "FleetSnapshot":
+        """Return a columnar snapshot of the current devices. Requires NumPy.
 
-                sensors = self._fetch_all_device_sensors(
-                    account_id=account_id, unit=self._unit
-                )
+        Without build_snapshot, or after a partial update, the snapshot is
+        built from the devices on first use.
+        """
+        return self._store.snapshot(self.devices.values())
+
+    def _keep_failed_accounts(
+        self,
+        res: dict[str, AirthingsDevice],
+        builder: Optional["FleetSnapshotBuilder"],
+    ):
+        """Add the current devices of accounts that failed to the fetched ones."""
+        if not self.errors:
+            return
 
-                for sensor in sensors:
-                    serial_number = sensor.serial_number
+        for serial_number, device in self.devices.items():
+            if (
+                self._metadata.account_of(serial_number) in self.errors
+                and serial_number not in res
+            ):
+                res[serial_number] = device
+                if builder is not None:
+                    builder.add(device)
+
+    def _store_devices(
+        self,
+        res: dict[str, AirthingsDevice],
+        partial: bool,
+        snapshot: Optional["FleetSnapshot"],
+        started: float,
+    ) -> dict[str, AirthingsDevice]:
+        """Replace the devices, or merge into them for a partial update.
+
+        started is the time.perf_counter() value at the start of the update.
+        """
+        logger.info("Fetched %s devices and sensors from Airthings API.", len(res))
+
+        previous = self.devices
+        self.devices = {**previous, **res} if partial else res
+        self.changes = AirthingsChanges.between(previous, self.devices, partial)
+        self._store.record(
+            self.changes,
+            snapshot,
+            UpdateEvent(
+                devices=len(res),
+                added=len(self.changes.added),
+                updated=len(self.changes.updated),
+                removed=len(self.changes.removed),
+                partial=partial,
+                failed_accounts=len(self.errors),
+                duration=time.perf_counter() - started,
+            ),
+        )
 
-                    if isinstance(serial_number, Unset):
-                        continue
+        return self.devices
 
-                    sensor_device = device_map.get(serial_number)
-                    if sensor_device is None:
-                        continue
-                    mapped = AirthingsDevice.from_response(sensor_device, sensor)
-                    res[serial_number] = mapped
+    def iter_devices(
+        self, serial_numbers: Optional[Iterable[str]] = None
+    ) -> Iterator[AirthingsDevice]:
+        """Yield the devices of all accounts, one sensors page at a time.
 
-            self.devices = res
-            logger.info("Fetched %s devices and sensors from Airthings API.", len(res))
-            return res
+        With serial_numbers, only those devices are fetched, using requests
+        filtered by serial number.
+        """
+        self.verify_auth()
+        self.errors = {}
+
+        try:
+            accounts: dict[str, Iterator[AirthingsDevice]]
+            if serial_numbers is None:
+                accounts = {
+                    account_id: self._iter_account_devices(account_id)
+                    for account_id in self._metadata.account_ids()
+                }
+            else:
+                accounts = {
+                    account_id: self._iter_selected_devices(account_id, serials)
+                    for account_id, serials in self._metadata.locate(
+                        serial_numbers
+                    ).items()
+                }
         except LibUnexpectedStatus as e:
-            logger.error(
-                "Unexpected status code %s received when fetching devices and sensors.",
-                e.status_code,
-            )
             raise UnexpectedStatusError(e.status_code, e.content) from e
 
-    def _fetch_all_accounts_ids(self) -> List[str]:
-        """Fetch accounts for the given client"""
-        response = get_accounts_ids.sync_detailed(client=self._api_client)
+        for account_id, devices in accounts.items():
+            if not self._account_allowed(account_id):
+                continue
+            try:
+                yield from devices
+            except (LibUnexpectedStatus, *ACCOUNT_ERRORS) as e:
+                self._account_failed(account_id, e)
+            else:
+                self._account_succeeded(account_id)
+
+        self._raise_if_all_failed(len(accounts))
+
+    def _iter_account_devices(self, account_id: str) -> Iterator[AirthingsDevice]:
+        """Fetch and map the devices of a given account, page by page."""
+        device_map, fresh = self._metadata.device_map(account_id)
+
+        for page in self._pages.iter_pages(account_id, raw=self._pages.fast_decode):
+            if not fresh and self._has_unknown_devices(device_map, page):
+                device_map, fresh = self._metadata.device_map(account_id, refresh=True)
+            yield from self._map_account_page(account_id, device_map, page)
+
+    def _iter_selected_devices(
+        self, account_id: str, serials: List[str]
+    ) -> Iterator[AirthingsDevice]:
+        """Fetch and map the given devices of an account, page by page."""
+        device_map = self._metadata.known_device_map(serials)
+
+        for chunk in chunks(serials):
+            for page in self._pages.iter_pages(
+                account_id, chunk, raw=self._pages.fast_decode
+            ):
+                yield from self._map_account_page(account_id, device_map, page)
+
+    async def aiter_devices(
+        self, serial_numbers: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[AirthingsDevice]:
+        """Yield the devices of all accounts as their sensors pages arrive.
+
+        Accounts are fetched concurrently, so devices of different accounts
+        may be interleaved. With serial_numbers, only those devices are
+        fetched, using requests filtered by serial number.
+        """
+        await self.async_verify_auth()
+        self.errors = {}
+
+        semaphore = self._requester.semaphore()
+        queue: asyncio.Queue[Optional[List[AirthingsDevice]]] = asyncio.Queue()
+        tasks: List[asyncio.Task] = []
 
-        payload = response.parsed
+        try:
+            producers: List[Tuple[str, AsyncIterator[List[AirthingsDevice]]]]
+            if serial_numbers is None:
+                producers = [
+                    (account_id, self._aiter_account_devices(account_id, semaphore))
+                    for account_id in await self._metadata.async_account_ids(semaphore)
+                ]
+            else:
+                located = await self._metadata.async_locate(serial_numbers, semaphore)
+                producers = [
+                    (
+                        account_id,
+                        self._aiter_selected_devices(account_id, chunk, semaphore),
+                    )
+                    for account_id, serials in located.items()
+                    for chunk in chunks(serials)
+                ]
+
+            tasks = [
+                asyncio.create_task(self._async_produce(account_id, producer, queue))
+                for account_id, producer in producers
+                if self._account_allowed(account_id)
+            ]
+
+            remaining = len(tasks)
+            while remaining:
+                devices = await queue.get()
+                if devices is None:
+                    remaining -= 1
+                    continue
+                for device in devices:
+                    yield device
 
-        if payload is None:
-            raise UnexpectedPayloadError(response.content)
+            await asyncio.gather(*tasks)
+            self._raise_if_all_failed(len({account_id for account_id, _ in producers}))
+        except LibUnexpectedStatus as e:
+            raise UnexpectedStatusError(e.status_code, e.content) from e
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        return [
-            account.id
-            for account in (payload.accounts or [])
-            if isinstance(account.id, str)
-        ]
+    def iter_sensor_pages(self, account_id: str) -> Iterator[Sequence[SensorsResponse]]:
+        """Yield the sensors of a given account, one page at a time."""
+        self.verify_auth()
 
-    def _fetch_all_devices(self, account_id: str) -> List[DeviceResponse]:
-        """Fetch devices for a given account"""
-        response = get_devices.sync_detailed(
-            account_id=account_id, client=self._api_client
-        )
+        try:
+            for page in self._pages.iter_pages(account_id, raw=self._pages.lazy_pages):
+                yield self._page_sensors(page)
+        except LibUnexpectedStatus as e:
+            raise UnexpectedStatusError(e.status_code, e.content) from e
 
-        payload = response.parsed
+    async def aiter_sensor_pages(
+        self, account_id: str
+    ) -> AsyncIterator[Sequence[SensorsResponse]]:
+        """Yield the sensors of a given account, one page at a time."""
+        await self.async_verify_auth()
 
-        if payload is None:
-            raise UnexpectedPayloadError(response.content)
+        try:
+            async for page in self._pages.aiter_pages(
+                account_id,
+                self._requester.semaphore(),
+                raw=self._pages.lazy_pages,
+            ):
+                yield self._page_sensors(page)
+        except LibUnexpectedStatus as e:
+            raise UnexpectedStatusError(e.status_code, e.content) from e
 
-        return payload.devices or []
+    @staticmethod
+    def _page_sensors(page: SensorsPage) -> Sequence[SensorsResponse]:
+        """Return the sensors of a page, as a LazySensorsPage if it is one."""
+        if isinstance(page, LazySensorsPage):
+            return page
+
+        return cast(List[SensorsResponse], page.results or [])
+
+    async def aiter_sensors(self, account_id: str) -> AsyncIterator[SensorsResponse]:
+        """Yield the sensors of a given account, one device at a time.
+
+        Sensors pages are streamed and parsed as they arrive, so a page is
+        never held in memory as a whole. Rate limited requests are retried,
+        but a page is not retried once it has started to arrive.
+        """
+        await self.async_verify_auth()
+
+        page_number = 1
+        while True:
+            parser = SensorsPageParser()
+            async for sensor in self._pages.astream_page(
+                account_id, page_number, parser
+            ):
+                yield sensor
+
+            if parser.fields.get("hasNext") is not True:
+                return
+
+            page_number += 1
+
+    def invalidate_metadata(self, account_id: Optional[str] = None):
+        """Drop cached device metadata of an account, or all cached metadata."""
+        self._metadata.invalidate(account_id)
+
+    @staticmethod
+    def _has_unknown_devices(
+        device_map: dict[str, DeviceResponse], page: SensorsPage
+    ) -> bool:
+        """Tell whether a page of sensors has devices missing from device_map."""
+        if isinstance(page, RawSensorsPage):
+            serial_numbers: Iterable[Any] = page.serial_numbers()
+        else:
+            serial_numbers = (sensor.serial_number for sensor in page.results or [])
+
+        return any(
+            isinstance(serial_number, str) and serial_number not in device_map
+            for serial_number in serial_numbers
+        )
 
-    def _fetch_all_device_sensors(
+    def _map_account_page(
         self,
         account_id: str,
-        unit: GetMultipleSensorsUnit,
-        page_number: int = 1,
-    ) -> List[SensorsResponse]:
-        """Fetch sensors for a given account"""
-        response = get_multiple_sensors.sync_detailed(
-            account_id=account_id,
-            client=self._api_client,
-            page_number=page_number,
-            unit=unit,
+        device_map: dict[str, DeviceResponse],
+        page: SensorsPage,
+    ) -> Iterable[AirthingsDevice]:
+        """Map a page of sensors of one account, timed when there are hooks."""
+        hooks = self._requester.hooks
+        if hooks is None:
+            return self._map_page(device_map, page)
+
+        started = time.perf_counter()
+        devices = list(self._map_page(device_map, page))
+        emit(
+            hooks.on_mapping,
+            MappingEvent(
+                account_id=account_id,
+                devices=len(devices),
+                duration=time.perf_counter() - started,
+                raw=isinstance(page, RawSensorsPage),
+            ),
         )
+        return devices
+
+    def _map_page(
+        self, device_map: dict[str, DeviceResponse], page: SensorsPage
+    ) -> Iterator[AirthingsDevice]:
+        """Map a page of sensors of one account to AirthingsDevices.
+
+        A device with the same recorded time and metadata as in the current
+        devices is reused as is.
+        """
+        if isinstance(page, RawSensorsPage):
+            for item in page.results:
+                serial_number = item.get("serialNumber")
+                if not isinstance(serial_number, str):
+                    continue
+
+                sensor_device = device_map.get(serial_number)
+                if sensor_device is None:
+                    continue
+
+                previous = self._reusable_device(
+                    serial_number, item.get("recorded"), sensor_device
+                )
+                yield previous or decode_device(sensor_device, item)
+            return
+
+        for sensor in page.results or []:
+            serial_number = sensor.serial_number
 
-        payload = response.parsed
+            if isinstance(serial_number, Unset):
+                continue
 
-        if isinstance(payload, Error):
-            raise ApiError(payload.message or "Unknown error")
+            sensor_device = device_map.get(serial_number)
+            if sensor_device is None:
+                continue
+
+            previous = self._reusable_device(
+                serial_number, sensor.recorded, sensor_device
+            )
+            yield previous or AirthingsDevice.from_response(sensor_device, sensor)
 
+    def _reusable_device(
+        self, serial_number: str, recorded: Any, sensor_device: DeviceResponse
+    ) -> Optional[AirthingsDevice]:
+        """Return the current device if nothing about it changed."""
+        previous = self.devices.get(serial_number)
         if (
-            payload is None
-            or isinstance(payload, GetMultipleSensorsResponse200) is False
+            previous is not None
+            and previous.recorded is not None
+            and (previous.recorded, previous.name, previous.home, previous.type)
+            == (recorded, sensor_device.name, sensor_device.home, sensor_device.type)
         ):
-            raise UnexpectedPayloadError(response.content)
+            return previous
 
-        sensors = payload.results or []
+        return None
 
-        if payload.has_next is not True:
-            return sensors
+    async def _async_produce(
+        self,
+        account_id: str,
+        producer: AsyncIterator[List[AirthingsDevice]],
+        queue: "asyncio.Queue[Optional[List[AirthingsDevice]]]",
+    ):
+        """Put the batches of devices of an account on the queue.
 
-        return sensors + self._fetch_all_device_sensors(
-            account_id=account_id,
-            page_number=page_number + 1,
-            unit=unit,
-        )
+        A failure of the account is recorded. A None marks the end of the
+        producer, whether it succeeded or not.
+        """
+        try:
+            async for devices in producer:
+                await queue.put(devices)
+        except (LibUnexpectedStatus, *ACCOUNT_ERRORS) as e:
+            self._account_failed(account_id, e)
+        else:
+            self._account_succeeded(account_id)
+        finally:
+            await queue.put(None)
+
+    def _account_allowed(self, account_id: str) -> bool:
+        """Tell whether an account may be fetched, recording it if not."""
+        if self._requester.retries.account_allowed(account_id):
+            return True
+
+        logger.warning("Skipping account %s, which keeps failing.", account_id)
+        self.errors.setdefault(account_id, CircuitOpenError(account_id))
+        return False
+
+    def _account_succeeded(self, account_id: str):
+        """Close the circuit of an account that was fetched."""
+        self._requester.retries.account_succeeded(account_id)
+
+    def _account_failed(self, account_id: str, error: Exception):
+        """Record the failure of an account and count it against its circuit."""
+        if isinstance(error, LibUnexpectedStatus):
+            cause = error
+            error = UnexpectedStatusError(cause.status_code, cause.content)
+            error.__cause__ = cause
+
+        logger.warning("Failed to fetch account %s: %s", account_id, error)
+        self.errors.setdefault(account_id, error)
+        self._requester.retries.account_failed(account_id)
+
+    def _raise_if_all_failed(self, accounts: int):
+        """Raise the first error if every one of the accounts failed."""
+        if accounts and len(self.errors) >= accounts:
+            raise next(iter(self.errors.values()))
+
+    async def _aiter_account_devices(
+        self, account_id: str, semaphore: asyncio.Semaphore
+    ) -> AsyncIterator[List[AirthingsDevice]]:
+        """Fetch and map the devices of a given account, page by page."""
+        device_map, fresh = await self._metadata.async_device_map(account_id, semaphore)
+        expected_pages = self._pages.expected_pages(len(device_map))
+
+        async for page in self._pages.aiter_pages(
+            account_id,
+            semaphore,
+            expected_pages=expected_pages,
+            raw=self._pages.fast_decode,
+        ):
+            if not fresh and self._has_unknown_devices(device_map, page):
+                device_map, fresh = await self._metadata.async_device_map(
+                    account_id, semaphore, refresh=True
+                )
+            yield list(self._map_account_page(account_id, device_map, page))
+
+    async def _aiter_selected_devices(
+        self, account_id: str, serials: List[str], semaphore: asyncio.Semaphore
+    ) -> AsyncIterator[List[AirthingsDevice]]:
+        """Fetch and map the given devices of an account, page by page."""
+        device_map = self._metadata.known_device_map(serials)
+
+        async for page in self._pages.aiter_pages(
+            account_id, semaphore, serial_numbers=serials, raw=self._pages.fast_decode
+        ):
+            yield list(self._map_account_page(account_id, device_map, page))
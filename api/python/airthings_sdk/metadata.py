@@ -0,0 +1,196 @@
+"""Module providing the account and device metadata of the Airthings API SDK."""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from airthings_api_client.models import AccountsResponse, DevicesResponse
+from airthings_api_client.models.device_response import DeviceResponse
+from airthings_api_client.types import Response
+from airthings_sdk.cache import TTLCache
+from airthings_sdk.errors import UnexpectedPayloadError
+from airthings_sdk.requester import ACCOUNTS_IDS, DEVICES, ApiRequester
+
+logger = logging.getLogger(__name__)
+
+DeviceMap = Dict[str, DeviceResponse]
+
+
+class DeviceMetadata:
+    """Account ids and device metadata of one set of credentials.
+
+    With a positive ttl, both are cached for that many seconds. Every
+    device fetched is remembered with its account, for targeted updates,
+    and passed to on_fetch with its account id.
+    """
+
+    def __init__(
+        self,
+        requester: ApiRequester,
+        client_id: str,
+        ttl: float = 0,
+        on_fetch: Optional[Callable[[str, DeviceMap], None]] = None,
+    ):
+        """Init device metadata."""
+        self._requester = requester
+        self._client_id = client_id
+        self._on_fetch = on_fetch
+        self._account_ids: TTLCache[str, List[str]] = TTLCache(ttl)
+        self._device_maps: TTLCache[str, DeviceMap] = TTLCache(ttl)
+        self._known: Dict[str, Tuple[str, DeviceResponse]] = {}
+
+    def restore(self, known: Dict[str, Tuple[str, DeviceResponse]]):
+        """Restore the devices of a previous run, by serial number.
+
+        They are seeded into the caches, so the next lookups use them even
+        without a ttl.
+        """
+        self._known.update(known)
+
+        device_maps: Dict[str, DeviceMap] = {}
+        for serial, (account_id, device) in known.items():
+            device_maps.setdefault(account_id, {})[serial] = device
+        if device_maps:
+            self._account_ids.seed(self._client_id, list(device_maps))
+        for account_id, device_map in device_maps.items():
+            self._device_maps.seed(account_id, device_map)
+
+    def invalidate(self, account_id: Optional[str] = None):
+        """Drop cached device metadata of an account, or all cached metadata."""
+        if account_id is None:
+            self._account_ids.invalidate()
+        self._device_maps.invalidate(account_id)
+
+    def account_of(self, serial_number: str) -> Optional[str]:
+        """Return the account a known device belongs to."""
+        known = self._known.get(serial_number)
+        return None if known is None else known[0]
+
+    def known_device_map(self, serials: List[str]) -> DeviceMap:
+        """Return the last known metadata of the given devices by serial number."""
+        return {serial: self._known[serial][1] for serial in serials}
+
+    def account_ids(self) -> List[str]:
+        """Return the account ids, from the cache if possible."""
+        account_ids = self._account_ids.get(self._client_id)
+        if account_ids is None:
+            account_ids = self._parse_accounts(self._requester.request(ACCOUNTS_IDS))
+            self._account_ids.set(self._client_id, account_ids)
+
+        return account_ids
+
+    async def async_account_ids(self, semaphore: asyncio.Semaphore) -> List[str]:
+        """Return the account ids, from the cache if possible."""
+        account_ids = self._account_ids.get(self._client_id)
+        if account_ids is None:
+            account_ids = self._parse_accounts(
+                await self._requester.async_request(ACCOUNTS_IDS, semaphore)
+            )
+            self._account_ids.set(self._client_id, account_ids)
+
+        return account_ids
+
+    def device_map(
+        self, account_id: str, refresh: bool = False
+    ) -> Tuple[DeviceMap, bool]:
+        """Return the devices of an account by serial number, from the cache if possible.
+
+        The flag tells whether they were fetched just now.
+        """
+        device_map = None if refresh else self._device_maps.get(account_id)
+        if device_map is not None:
+            return device_map, False
+
+        response = self._requester.request(DEVICES, account_id=account_id)
+        return self._remember(account_id, response), True
+
+    async def async_device_map(
+        self, account_id: str, semaphore: asyncio.Semaphore, refresh: bool = False
+    ) -> Tuple[DeviceMap, bool]:
+        """Return the devices of an account by serial number, from the cache if possible.
+
+        The flag tells whether they were fetched just now.
+        """
+        device_map = None if refresh else self._device_maps.get(account_id)
+        if device_map is not None:
+            return device_map, False
+
+        response = await self._requester.async_request(
+            DEVICES, semaphore, account_id=account_id
+        )
+        return self._remember(account_id, response), True
+
+    def locate(self, serial_numbers: Iterable[str]) -> Dict[str, List[str]]:
+        """Group serial numbers by account, fetching metadata for unknown ones."""
+        serials = list(dict.fromkeys(serial_numbers))
+
+        if any(serial not in self._known for serial in serials):
+            for account_id in self.account_ids():
+                self.device_map(account_id, refresh=True)
+                if all(serial in self._known for serial in serials):
+                    break
+
+        return self._group_by_account(serials)
+
+    async def async_locate(
+        self, serial_numbers: Iterable[str], semaphore: asyncio.Semaphore
+    ) -> Dict[str, List[str]]:
+        """Group serial numbers by account, fetching metadata for unknown ones."""
+        serials = list(dict.fromkeys(serial_numbers))
+
+        if any(serial not in self._known for serial in serials):
+            for account_id in await self.async_account_ids(semaphore):
+                await self.async_device_map(account_id, semaphore, refresh=True)
+                if all(serial in self._known for serial in serials):
+                    break
+
+        return self._group_by_account(serials)
+
+    def _group_by_account(self, serials: List[str]) -> Dict[str, List[str]]:
+        """Group known serial numbers by the account they belong to."""
+        res: Dict[str, List[str]] = {}
+        for serial in serials:
+            account_id = self.account_of(serial)
+            if account_id is None:
+                logger.warning("Device %s not found in any account.", serial)
+                continue
+            res.setdefault(account_id, []).append(serial)
+
+        return res
+
+    def _remember(
+        self, account_id: str, response: Response[DevicesResponse]
+    ) -> DeviceMap:
+        """Cache and remember the devices of an account from a devices response."""
+        payload = response.parsed
+
+        if payload is None:
+            raise UnexpectedPayloadError(response.content)
+
+        device_map = {
+            device.serial_number: device
+            for device in payload.devices or []
+            if isinstance(device.serial_number, str)
+        }
+        self._device_maps.set(account_id, device_map)
+        for serial, device in device_map.items():
+            self._known[serial] = (account_id, device)
+
+        if self._on_fetch is not None:
+            self._on_fetch(account_id, device_map)
+
+        return device_map
+
+    @staticmethod
+    def _parse_accounts(response: Response[AccountsResponse]) -> List[str]:
+        """Extract the account ids from an accounts response"""
+        payload = response.parsed
+
+        if payload is None:
+            raise UnexpectedPayloadError(response.content)
+
+        return [
+            account.id
+            for account in (payload.accounts or [])
+            if isinstance(account.id, str)
+        ]
@@ -0,0 +1,45 @@
+"""Module providing the options of the Airthings API SDK data handler."""
+
+import os
+from typing import Any, Dict, Mapping, Optional, TypedDict, Union
+
+import httpx
+
+from airthings_api_client.decoders import JSONDecoder
+from airthings_sdk.hooks import AirthingsHooks
+from airthings_sdk.retry import RetryPolicy
+
+
+class AirthingsOptions(TypedDict, total=False):
+    """Keyword options of the Airthings data handler, all optional.
+
+    What each of them does is described on Airthings.
+    """
+
+    max_concurrency: int
+    parallel_pages: bool
+    max_rate_limit_retries: int
+    metadata_ttl: float
+    httpx_args: Optional[Dict[str, Any]]
+    transport: Optional[httpx.BaseTransport]
+    async_transport: Optional[httpx.AsyncBaseTransport]
+    fast_decode: bool
+    lazy_pages: bool
+    json_decoder: Optional[JSONDecoder]
+    build_snapshot: bool
+    history_capacity: int
+    cache_path: Optional[Union[str, os.PathLike]]
+    limits: Optional[httpx.Limits]
+    http2: bool
+    hooks: Optional[AirthingsHooks]
+    retry_policy: Optional[RetryPolicy]
+    failure_threshold: int
+    circuit_reset_timeout: float
+    background_token_refresh: bool
+
+
+def check_options(options: Mapping[str, Any]):
+    """Raise a TypeError for keys that are not options of the data handler."""
+    unknown = options.keys() - AirthingsOptions.__annotations__.keys()
+    if unknown:
+        raise TypeError(f"Unexpected options: {', '.join(sorted(unknown))}.")
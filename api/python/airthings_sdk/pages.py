@@ -0,0 +1,214 @@
+"""Module providing the sensors pages of the Airthings API SDK."""
+
+import asyncio
+import logging
+import math
+from typing import Any, AsyncIterator, Iterator, List, Optional, Union
+
+from airthings_api_client.models import Error, GetMultipleSensorsResponse200
+from airthings_api_client.models.get_multiple_sensors_unit import GetMultipleSensorsUnit
+from airthings_api_client.models.sensors_response import SensorsResponse
+from airthings_api_client.types import UNSET, Response
+from airthings_sdk.const import SENSORS_PAGE_SIZE
+from airthings_sdk.decoder import RawSensorsPage
+from airthings_sdk.errors import ApiError, UnexpectedPayloadError
+from airthings_sdk.options import AirthingsOptions
+from airthings_sdk.requester import RAW_SENSORS, SENSORS, ApiRequester, Endpoint
+from airthings_sdk.stream import SensorsPageParser
+
+logger = logging.getLogger(__name__)
+
+SensorsPage = Union[GetMultipleSensorsResponse200, RawSensorsPage]
+
+
+def chunks(serials: List[str]) -> Iterator[List[str]]:
+    """Split serial numbers into chunks that fit on one sensors page."""
+    for start in range(0, len(serials), SENSORS_PAGE_SIZE):
+        yield serials[start : start + SENSORS_PAGE_SIZE]
+
+
+class SensorPages:
+    """Fetch the sensors pages of accounts in the unit of a data handler.
+
+    With fast_decode, the pages of updates are RawSensorsPage objects; with
+    lazy_pages, so are the pages handed out as such. With parallel_pages,
+    async paging fetches the pages it expects concurrently.
+    """
+
+    def __init__(
+        self, requester: ApiRequester, is_metric: bool, options: AirthingsOptions
+    ):
+        """Init sensor pages."""
+        self._requester = requester
+        self.unit = (
+            GetMultipleSensorsUnit.METRIC
+            if is_metric
+            else GetMultipleSensorsUnit.IMPERIAL
+        )
+        self.parallel_pages = options.get("parallel_pages", False)
+        self.fast_decode = options.get("fast_decode", False)
+        self.lazy_pages = options.get("lazy_pages", False)
+
+    def expected_pages(self, devices: int) -> Optional[int]:
+        """Return the number of pages to fetch concurrently for that many devices."""
+        if not self.parallel_pages:
+            return None
+
+        return math.ceil(devices / SENSORS_PAGE_SIZE)
+
+    def iter_pages(
+        self,
+        account_id: str,
+        serial_numbers: Optional[List[str]] = None,
+        raw: bool = False,
+    ) -> Iterator[SensorsPage]:
+        """Fetch sensors for a given account, one page at a time"""
+        page_number = 1
+
+        while True:
+            payload = self._fetch(account_id, page_number, serial_numbers, raw)
+            yield payload
+
+            if payload.has_next is not True:
+                return
+
+            page_number += 1
+
+    async def aiter_pages(
+        self,
+        account_id: str,
+        semaphore: asyncio.Semaphore,
+        expected_pages: Optional[int] = None,
+        serial_numbers: Optional[List[str]] = None,
+        raw: bool = False,
+    ) -> AsyncIterator[SensorsPage]:
+        """Fetch sensors for a given account, one page at a time
+
+        When expected_pages is given and agrees with the total page count of
+        the first page, pages 2..expected_pages are fetched concurrently and
+        yielded as they arrive. Otherwise, and for any pages beyond them,
+        paging is sequential.
+        """
+        payload = await self._async_fetch(
+            account_id,
+            semaphore,
+            page_number=1,
+            serial_numbers=serial_numbers,
+            raw=raw,
+        )
+        yield payload
+        page_number = 1
+
+        if (
+            payload.has_next is True
+            and expected_pages is not None
+            and expected_pages > 1
+            and payload.total_pages in (expected_pages, UNSET, None)
+        ):
+
+            async def fetch_numbered(number: int):
+                return number, await self._async_fetch(
+                    account_id, semaphore, page_number=number, raw=raw
+                )
+
+            tasks = [
+                asyncio.create_task(fetch_numbered(number))
+                for number in range(2, expected_pages + 1)
+            ]
+            try:
+                for next_page in asyncio.as_completed(tasks):
+                    number, page_payload = await next_page
+                    yield page_payload
+                    if number == expected_pages:
+                        payload = page_payload
+            finally:
+                # Stop the pages still in flight when one fails or paging stops.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            page_number = expected_pages
+        elif payload.has_next is True and expected_pages is not None:
+            logger.debug(
+                "Expected %s sensor pages for account %s but got %s, paging sequentially.",
+                expected_pages,
+                account_id,
+                payload.total_pages,
+            )
+
+        while payload.has_next is True:
+            page_number += 1
+            payload = await self._async_fetch(
+                account_id,
+                semaphore,
+                page_number=page_number,
+                serial_numbers=serial_numbers,
+                raw=raw,
+            )
+            yield payload
+
+    def astream_page(
+        self, account_id: str, page_number: int, parser: SensorsPageParser
+    ) -> AsyncIterator[SensorsResponse]:
+        """Stream a single page of sensors for a given account"""
+        return self._requester.astream(
+            SENSORS,
+            parser,
+            account_id=account_id,
+            page_number=page_number,
+            unit=self.unit,
+        )
+
+    def _fetch(
+        self,
+        account_id: str,
+        page_number: int,
+        serial_numbers: Optional[List[str]] = None,
+        raw: bool = False,
+    ) -> SensorsPage:
+        """Fetch a single page of sensors for a given account"""
+        endpoint: Endpoint[Any] = RAW_SENSORS if raw else SENSORS
+        response = self._requester.request(
+            endpoint,
+            account_id=account_id,
+            sn=UNSET if serial_numbers is None else serial_numbers,
+            page_number=page_number,
+            unit=self.unit,
+        )
+
+        return self._parse(response)
+
+    async def _async_fetch(
+        self,
+        account_id: str,
+        semaphore: asyncio.Semaphore,
+        page_number: int,
+        serial_numbers: Optional[List[str]] = None,
+        raw: bool = False,
+    ) -> SensorsPage:
+        """Fetch a single page of sensors for a given account"""
+        endpoint: Endpoint[Any] = RAW_SENSORS if raw else SENSORS
+        response = await self._requester.async_request(
+            endpoint,
+            semaphore,
+            account_id=account_id,
+            sn=UNSET if serial_numbers is None else serial_numbers,
+            page_number=page_number,
+            unit=self.unit,
+        )
+
+        return self._parse(response)
+
+    @staticmethod
+    def _parse(response: Response[Any]) -> SensorsPage:
+        """Validate a sensors response and return its page payload"""
+        payload = response.parsed
+
+        if isinstance(payload, Error):
+            raise ApiError(payload.message or "Unknown error")
+
+        if payload is None or not isinstance(
+            payload, (GetMultipleSensorsResponse200, RawSensorsPage)
+        ):
+            raise UnexpectedPayloadError(response.content)
+
+        return payload
@@ -0,0 +1,164 @@
+"""Module providing rate limit tracking for the Airthings API SDK."""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+
+RATE_LIMIT_HEADER = "X-RateLimit-Limit"
+RATE_LIMIT_REMAINING_HEADER = "X-RateLimit-Remaining"
+RATE_LIMIT_RESET_HEADER = "X-RateLimit-Reset"
+RETRY_AFTER_HEADERS = ("Retry-After", "X-RateLimit-Retry-After")
+
+# Values below this are taken as seconds from now rather than epoch seconds.
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def _parse_timestamp(value: str, now: float) -> Optional[float]:
+    """Parse a header timestamp into epoch seconds.
+
+    Accepts epoch seconds, seconds from now, ISO 8601 and HTTP dates.
+    """
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        pass
+    else:
+        return number if number >= _EPOCH_THRESHOLD else now + number
+
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """Parse an integer header value, ignoring malformed ones."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitState:
+    """Rate limit budget as reported by the Airthings API."""
+
+    limit: Optional[int]
+    remaining: Optional[int]
+    reset: Optional[float]
+
+    @classmethod
+    def from_headers(
+        cls, headers: Mapping[str, str], now: Optional[float] = None
+    ) -> Optional["RateLimitState"]:
+        """Create a RateLimitState from response headers, if they have any."""
+        now = time.time() if now is None else now
+
+        remaining = _parse_int(headers.get(RATE_LIMIT_REMAINING_HEADER))
+        if remaining is None:
+            return None
+
+        reset_header = headers.get(RATE_LIMIT_RESET_HEADER)
+        return cls(
+            limit=_parse_int(headers.get(RATE_LIMIT_HEADER)),
+            remaining=remaining,
+            reset=(
+                _parse_timestamp(reset_header, now)
+                if reset_header is not None
+                else None
+            ),
+        )
+
+
+def retry_after(headers: Mapping[str, str], now: Optional[float] = None) -> float:
+    """Return the number of seconds a rate limited response asks to wait."""
+    now = time.time() if now is None else now
+
+    for header in RETRY_AFTER_HEADERS:
+        value = headers.get(header)
+        if value is None:
+            continue
+        timestamp = _parse_timestamp(value, now)
+        if timestamp is not None:
+            return max(0.0, timestamp - now)
+
+    state = RateLimitState.from_headers(headers, now)
+    if state is not None and state.reset is not None:
+        return max(0.0, state.reset - now)
+
+    return 0.0
+
+
+class RateLimiter:
+    """Pace requests of one credential to stay within its rate limit budget.
+
+    Requests go out unthrottled while the remaining budget is above
+    pacing_threshold (a fraction of the limit). Below it, the remaining
+    requests are spread evenly over what is left of the window, and once the
+    budget is spent requests are deferred until the window resets.
+    """
+
+    state: Optional[RateLimitState] = None
+
+    def __init__(
+        self,
+        pacing_threshold: float = 0.2,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Init rate limiter."""
+        self._pacing_threshold = pacing_threshold
+        self._clock = clock
+        self._next_slot = 0.0
+
+    def update(self, headers: Mapping[str, str]):
+        """Update the budget from the headers of a response."""
+        state = RateLimitState.from_headers(headers, self._clock())
+        if state is not None:
+            self.state = state
+
+    def defer(self, seconds: float):
+        """Hold back all requests for the given number of seconds."""
+        self._next_slot = max(self._next_slot, self._clock() + seconds)
+
+    def acquire(self) -> float:
+        """Reserve a request slot. Return the seconds to wait before sending it."""
+        now = self._clock()
+        interval = self._interval(now)
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + interval
+
+        state = self.state
+        if state is not None and state.remaining is not None and state.remaining > 0:
+            state.remaining -= 1
+
+        return slot - now
+
+    def _interval(self, now: float) -> float:
+        """Return the spacing to keep between requests at the current budget."""
+        state = self.state
+        if state is None or state.remaining is None:
+            return 0.0
+
+        window = max(0.0, state.reset - now) if state.reset is not None else 0.0
+
+        if state.remaining <= 0:
+            # Budget spent: nothing may go out before the window resets.
+            self._next_slot = max(self._next_slot, now + window)
+            return 0.0
+
+        if state.limit and state.remaining > state.limit * self._pacing_threshold:
+            return 0.0
+
+        return window / state.remaining
@@ -0,0 +1,459 @@
+"""Module providing the requests of the Airthings API SDK to the API."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from airthings_api_client import AuthenticatedClient, Client
+from airthings_api_client.api.accounts import get_accounts_ids
+from airthings_api_client.api.device import get_devices
+from airthings_api_client.api.health import get_health
+from airthings_api_client.api.sensor import get_multiple_sensors
+from airthings_api_client.models import Error, SensorsResponse
+from airthings_api_client.decoders import default_decoder
+from airthings_api_client.types import Response
+from airthings_sdk import decoder
+from airthings_sdk.auth import TokenManager
+from airthings_sdk.const import (
+    API_URL,
+    AUTH_URL,
+    DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RATE_LIMIT_RETRIES,
+)
+from airthings_sdk.errors import ApiError, UnexpectedPayloadError, UnexpectedStatusError
+from airthings_sdk.hooks import emit, request_event
+from airthings_sdk.options import AirthingsOptions
+from airthings_sdk.ratelimit import RateLimiter
+from airthings_sdk.retry import Attempts, RetryHandler
+from airthings_sdk.stream import SensorsPageParser, aiter_sensors
+from airthings_sdk.types import AirthingsToken
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Endpoint(Generic[T]):
+    """An API endpoint: how to build its requests and parse its responses.
+
+    name identifies the endpoint in request events.
+    """
+
+    name: str
+    get_kwargs: Callable[..., Dict[str, Any]]
+    build_response: Callable[..., Response[T]]
+
+
+# The generated endpoint modules keep building requests and responses to
+# themselves, so their endpoints are wrapped here once.
+# pylint: disable=protected-access
+ACCOUNTS_IDS = Endpoint(
+    "get_accounts_ids", get_accounts_ids._get_kwargs, get_accounts_ids._build_response
+)
+DEVICES = Endpoint("get_devices", get_devices._get_kwargs, get_devices._build_response)
+SENSORS = Endpoint(
+    "get_multiple_sensors",
+    get_multiple_sensors._get_kwargs,
+    get_multiple_sensors._build_response,
+)
+RAW_SENSORS = Endpoint(
+    "get_multiple_sensors", get_multiple_sensors._get_kwargs, decoder.build_response
+)
+HEALTH = Endpoint("get_health", get_health._get_kwargs, get_health._build_response)
+# pylint: enable=protected-access
+
+
+@dataclass(frozen=True)
+class _Call(Generic[T]):
+    """A call of an endpoint: its arguments and the request built from them."""
+
+    endpoint: Endpoint[T]
+    kwargs: Dict[str, Any]
+    request_kwargs: Dict[str, Any]
+
+    @classmethod
+    def build(cls, endpoint: Endpoint[T], kwargs: Dict[str, Any]) -> "_Call[T]":
+        """Build the call of an endpoint with the given arguments."""
+        return cls(endpoint, kwargs, endpoint.get_kwargs(**kwargs))
+
+
+class ApiRequester:
+    """Send the requests of one data handler within its rate limit budget.
+
+    It owns the clients and the access token of the data handler. Repeated
+    attempts are decided by the retry handler, the same way for
+    synchronous, asynchronous and streamed requests.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        options: AirthingsOptions,
+        web_session: Optional[httpx.AsyncClient] = None,
+        on_token: Optional[Callable[[str, float], None]] = None,
+    ):
+        """Init API requester.
+
+        Its clients, retry handler and token manager are built from the
+        options of the data handler. on_token is passed every new access
+        token with the time it expires at.
+        """
+        max_concurrency = options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        self.max_concurrency = max_concurrency
+        self.hooks = options.get("hooks")
+        self.auth_client, self.api_client = self._build_clients(options, web_session)
+        self.retries = RetryHandler(
+            RateLimiter(),
+            options.get("max_rate_limit_retries", DEFAULT_MAX_RATE_LIMIT_RETRIES),
+            options.get("retry_policy"),
+            options.get("failure_threshold", 0),
+            options.get("circuit_reset_timeout", DEFAULT_CIRCUIT_RESET_TIMEOUT),
+        )
+        self.token_manager = TokenManager(
+            client_id,
+            client_secret,
+            auth_client=self.auth_client,
+            token=AirthingsToken(),
+            on_refresh=self._set_token,
+            background_refresh=options.get("background_token_refresh", False),
+            hooks=self.hooks,
+        )
+        self._on_token = on_token
+
+    @staticmethod
+    def _build_clients(
+        options: AirthingsOptions, web_session: Optional[httpx.AsyncClient]
+    ) -> Tuple[Client, AuthenticatedClient]:
+        """Build the auth and API clients from the options of the data handler."""
+        httpx_args = {**(options.get("httpx_args") or {})}
+        if options.get("limits") is not None:
+            httpx_args.setdefault("limits", options["limits"])
+        if options.get("http2"):
+            httpx_args.setdefault("http2", True)
+        json_decoder = options.get("json_decoder") or default_decoder()
+
+        auth_client = Client(
+            base_url=AUTH_URL,
+            raise_on_unexpected_status=True,
+            httpx_args=httpx_args,
+            json_decoder=json_decoder,
+        )
+        api_client = AuthenticatedClient(
+            base_url=API_URL,
+            token="invalid_token",  # Should authenticate and update before using
+            raise_on_unexpected_status=True,
+            httpx_args=httpx_args,
+            json_decoder=json_decoder,
+        )
+
+        transport = options.get("transport")
+        async_transport = options.get("async_transport")
+        for client, base_url in ((auth_client, AUTH_URL), (api_client, API_URL)):
+            if transport is not None:
+                client.set_httpx_client(
+                    httpx.Client(base_url=base_url, transport=transport, **httpx_args)
+                )
+            if async_transport is not None:
+                client.set_async_httpx_client(
+                    httpx.AsyncClient(
+                        base_url=base_url, transport=async_transport, **httpx_args
+                    )
+                )
+            if web_session:
+                client.set_async_httpx_client(web_session)
+
+        return auth_client, api_client
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Return a semaphore capping the requests in flight at max_concurrency."""
+        return asyncio.Semaphore(self.max_concurrency)
+
+    def restore_token(self, access_token: str, expires_at: float):
+        """Use an access token of a previous run, if it has not expired."""
+        expires_in = int(expires_at - time.time())
+        if expires_in > 0:
+            self.token_manager.token.set_token(access_token, expires_in)
+            self.api_client.token = access_token
+
+    def _set_token(self, access_token: str):
+        """Hand a new access token to the API client."""
+        self.api_client.token = access_token
+
+        if self._on_token is not None:
+            self._on_token(
+                access_token, time.time() + self.token_manager.token.expires_in()
+            )
+
+    def request(self, endpoint: Endpoint[T], **kwargs: Any) -> Response[T]:
+        """Call an endpoint with the given arguments and parse its response."""
+        call = _Call.build(endpoint, kwargs)
+        attempts = Attempts()
+
+        while True:
+            delay = self.retries.rate_limiter.acquire()
+            if delay > 0:
+                time.sleep(delay)
+
+            sent = time.perf_counter()
+            try:
+                response = self.api_client.get_httpx_client().request(
+                    **self._send_kwargs(call.request_kwargs)
+                )
+            except httpx.TransportError as e:
+                backoff = self.retries.retry_delay(attempts, error=e)
+                if backoff is None:
+                    raise
+                time.sleep(backoff)
+                continue
+            received = time.perf_counter()
+
+            attempt = attempts.total
+            backoff = self.retries.retry_delay(attempts, response)
+            if backoff is None:
+                return self._build_response(call, response, (sent, received), attempt)
+
+            self._emit_request(call, response, (sent, received, received), attempt)
+            if backoff > 0:
+                time.sleep(backoff)
+
+    async def async_request(
+        self, endpoint: Endpoint[T], semaphore: asyncio.Semaphore, **kwargs: Any
+    ) -> Response[T]:
+        """Call an endpoint with the given arguments and parse its response.
+
+        The request holds the semaphore while it is in flight.
+        """
+        call = _Call.build(endpoint, kwargs)
+        attempts = Attempts()
+
+        while True:
+            delay = self.retries.rate_limiter.acquire()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                async with semaphore:
+                    sent = time.perf_counter()
+                    response = await self.api_client.get_async_httpx_client().request(
+                        **self._send_kwargs(call.request_kwargs)
+                    )
+                    received = time.perf_counter()
+            except httpx.TransportError as e:
+                backoff = self.retries.retry_delay(attempts, error=e)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+                continue
+
+            attempt = attempts.total
+            backoff = self.retries.retry_delay(attempts, response)
+            if backoff is None:
+                return self._build_response(call, response, (sent, received), attempt)
+
+            self._emit_request(call, response, (sent, received, received), attempt)
+            if backoff > 0:
+                await asyncio.sleep(backoff)
+
+    async def astream(
+        self, endpoint: Endpoint, parser: SensorsPageParser, **kwargs: Any
+    ) -> AsyncIterator[SensorsResponse]:
+        """Call a sensors endpoint and yield its sensors as they are parsed.
+
+        Failed attempts are repeated as for other requests, but a page is
+        not retried once it has started to arrive.
+        """
+        call = _Call.build(endpoint, kwargs)
+        attempts = Attempts()
+        client = self.api_client.get_async_httpx_client()
+
+        while True:
+            delay = self.retries.rate_limiter.acquire()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            sent = time.perf_counter()
+            try:
+                response = await client.send(
+                    client.build_request(**self._send_kwargs(call.request_kwargs)),
+                    stream=True,
+                )
+            except httpx.TransportError as e:
+                backoff = self.retries.retry_delay(attempts, error=e)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+                continue
+            received = time.perf_counter()
+
+            try:
+                if response.status_code != HTTPStatus.OK:
+                    await response.aread()
+                    attempt = attempts.total
+                    backoff = self.retries.retry_delay(attempts, response)
+                    self._emit_request(
+                        call, response, (sent, received, received), attempt
+                    )
+                    if backoff is None:
+                        raise self._stream_error(response)
+                    await asyncio.sleep(backoff)
+                    continue
+
+                try:
+                    async for sensor in aiter_sensors(response, parser):
+                        yield sensor
+                except ValueError as e:
+                    raise UnexpectedPayloadError(str(e).encode()) from e
+                finally:
+                    self._emit_request(
+                        call,
+                        response,
+                        (sent, received, time.perf_counter()),
+                        attempts.total,
+                        response_bytes=parser.size,
+                    )
+                return
+            finally:
+                await response.aclose()
+
+    def warm_up(self):
+        """Open connections to the auth and API hosts with health requests.
+
+        Failures are logged, not raised.
+        """
+        for client, base_url in (
+            (self.auth_client, AUTH_URL),
+            (self.api_client, API_URL),
+        ):
+            sent = time.perf_counter()
+            try:
+                # Any response means the connection is open.
+                response = client.get_httpx_client().request(
+                    **self._health_kwargs(base_url)
+                )
+            except httpx.HTTPError as e:
+                logger.warning("Warming up connection failed: %s", e)
+            else:
+                self._emit_health(response, sent)
+
+    async def async_warm_up(self, connections: int = 1):
+        """Open connections to the auth and API hosts with health requests.
+
+        Up to connections requests go to the API host at once. Failures are
+        logged, not raised.
+        """
+
+        async def warm_up(client: Union[Client, AuthenticatedClient], base_url: str):
+            sent = time.perf_counter()
+            try:
+                # Any response means the connection is open.
+                response = await client.get_async_httpx_client().request(
+                    **self._health_kwargs(base_url)
+                )
+            except httpx.HTTPError as e:
+                logger.warning("Warming up connection failed: %s", e)
+            else:
+                self._emit_health(response, sent)
+
+        await asyncio.gather(
+            warm_up(self.auth_client, AUTH_URL),
+            *(warm_up(self.api_client, API_URL) for _ in range(max(1, connections))),
+        )
+
+    def _emit_request(
+        self,
+        call: _Call,
+        response: httpx.Response,
+        timing: Tuple[float, float, float],
+        attempt: int,
+        response_bytes: Optional[int] = None,
+    ):
+        """Pass the event of a request to the hooks."""
+        if self.hooks is not None:
+            emit(
+                self.hooks.on_request,
+                request_event(
+                    call.endpoint.name,
+                    call.request_kwargs,
+                    response,
+                    kwargs=call.kwargs,
+                    timing=timing,
+                    attempt=attempt,
+                    response_bytes=response_bytes,
+                ),
+            )
+
+    def _send_kwargs(self, request_kwargs: dict) -> dict:
+        """Return the arguments to send the request of an endpoint with.
+
+        The URL is made absolute, so a web_session needs no base URL, and
+        the access token goes with the request rather than on an httpx
+        client that may be shared with others.
+        """
+        client = self.api_client
+        return {
+            **request_kwargs,
+            "url": API_URL + request_kwargs["url"],
+            "headers": {
+                **request_kwargs.get("headers", {}),
+                client.auth_header_name: (
+                    f"{client.prefix} {client.token}" if client.prefix else client.token
+                ),
+            },
+        }
+
+    def _build_response(
+        self,
+        call: _Call[T],
+        response: httpx.Response,
+        timing: Tuple[float, float],
+        attempt: int,
+    ) -> Response[T]:
+        """Parse a response with its endpoint, reporting the request."""
+        try:
+            return call.endpoint.build_response(
+                client=self.api_client, response=response
+            )
+        finally:
+            self._emit_request(call, response, (*timing, time.perf_counter()), attempt)
+
+    def _stream_error(self, response: httpx.Response) -> Exception:
+        """Return the error to raise for a streamed response that failed."""
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            error = Error.from_dict(self.api_client.json_decoder(response.content))
+            return ApiError(error.message or "Unknown error")
+
+        return UnexpectedStatusError(response.status_code, response.content)
+
+    @staticmethod
+    def _health_kwargs(base_url: str = "") -> dict:
+        """Build the request arguments for the health endpoint of a host."""
+        request_kwargs = HEALTH.get_kwargs()
+        return {**request_kwargs, "url": base_url + request_kwargs["url"]}
+
+    def _emit_health(self, response: httpx.Response, sent: float):
+        """Pass the event of a warm-up request to the hooks."""
+        received = time.perf_counter()
+        self._emit_request(
+            _Call.build(HEALTH, {}), response, (sent, received, received), 0
+        )
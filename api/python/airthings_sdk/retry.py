@@ -0,0 +1,225 @@
+"""Module providing retries and circuit breakers for the Airthings API SDK."""
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Optional
+
+from airthings_sdk import ratelimit
+from airthings_sdk.const import DEFAULT_CIRCUIT_RESET_TIMEOUT
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How to retry requests that failed for a transient reason.
+
+    A request that fails with a transport error or one of retry_statuses is
+    retried up to max_retries times. Retry n waits backoff * 2**n seconds,
+    capped at max_backoff, less a random fraction of up to jitter of that,
+    but never less than the Retry-After of the response.
+    """
+
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    jitter: float = 1.0
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+
+    def __post_init__(self):
+        """Validate the policy."""
+        if self.max_retries < 0:
+            raise ValueError("max_retries must not be negative.")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+
+    def delay(self, retries: int, retry_after: float = 0.0) -> float:
+        """Return the seconds to wait before a retry, given the retries so far."""
+        delay = min(self.max_backoff, self.backoff * 2**retries)
+        delay -= delay * self.jitter * random.random()
+        return max(delay, retry_after)
+
+
+class CircuitBreaker:
+    """Stop calling something that keeps failing, for a while.
+
+    After failure_threshold failures in a row the circuit opens, and allow
+    returns False for reset_timeout seconds. Then a single call is let
+    through: its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Init circuit breaker."""
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def is_open(self) -> bool:
+        """Tell whether calls are currently being refused."""
+        return self._opened_at is not None and (
+            self._trial or self._clock() < self._opened_at + self._reset_timeout
+        )
+
+    def allow(self) -> bool:
+        """Tell whether a call may go ahead, letting one trial call through."""
+        if self._opened_at is None:
+            return True
+        if self.is_open:
+            return False
+
+        self._trial = True
+        return True
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold."""
+        self.failures += 1
+        self._trial = False
+        if self.failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+
+
+@dataclass
+class Attempts:
+    """The attempts of one request that were repeated, by reason."""
+
+    rate_limited: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        """Return the number of attempts that were repeated."""
+        return self.rate_limited + self.failed
+
+
+class RetryHandler:
+    """Decide whether and when to repeat a request, and to skip an account.
+
+    A rate limited request is repeated once the API allows it again, up to
+    max_rate_limit_retries times; the rate_limiter paces it. With a policy,
+    a request that failed with a transport error or one of its
+    retry_statuses is retried with backoff. With a positive
+    failure_threshold, an account failing that many updates in a row is
+    skipped for reset_timeout seconds.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: ratelimit.RateLimiter,
+        max_rate_limit_retries: int,
+        policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 0,
+        reset_timeout: float = DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    ):
+        """Init retry handler."""
+        self.rate_limiter = rate_limiter
+        self._max_rate_limit_retries = max_rate_limit_retries
+        self._policy = policy
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def retry_delay(
+        self,
+        attempts: Attempts,
+        response: Optional["httpx.Response"] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """Return the seconds to wait before repeating a request, or None.
+
+        Takes the response of the last attempt, or the transport error it
+        failed with. The attempt is counted when the request is repeated.
+        """
+        if response is None:
+            return self._failure_delay(attempts, error)
+
+        self.rate_limiter.update(response.headers)
+
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            delay = ratelimit.retry_after(response.headers)
+            self.rate_limiter.defer(delay)
+            if attempts.rate_limited >= self._max_rate_limit_retries:
+                return None
+
+            logger.warning(
+                "Rate limited by Airthings API, retrying in %.1f seconds.", delay
+            )
+            attempts.rate_limited += 1
+            # The rate limiter holds the request back.
+            return 0.0
+
+        if self._policy is None or response.status_code not in (
+            self._policy.retry_statuses
+        ):
+            return None
+
+        return self._failure_delay(
+            attempts,
+            f"status code {response.status_code}",
+            ratelimit.retry_after(response.headers),
+        )
+
+    def _failure_delay(
+        self, attempts: Attempts, reason: object, minimum: float = 0.0
+    ) -> Optional[float]:
+        """Return the seconds to wait before retrying a transient failure, or None."""
+        policy = self._policy
+        if policy is None or attempts.failed >= policy.max_retries:
+            return None
+
+        delay = policy.delay(attempts.failed, minimum)
+        logger.warning(
+            "Request to Airthings API failed (%s), retrying in %.1f seconds.",
+            reason,
+            delay,
+        )
+        attempts.failed += 1
+        return delay
+
+    def account_allowed(self, account_id: str) -> bool:
+        """Tell whether an account may be fetched."""
+        breaker = self._breakers.get(account_id)
+        return breaker is None or breaker.allow()
+
+    def account_succeeded(self, account_id: str):
+        """Close the circuit of an account that was fetched."""
+        breaker = self._breakers.get(account_id)
+        if breaker is not None:
+            breaker.record_success()
+
+    def account_failed(self, account_id: str):
+        """Count the failure of an account against its circuit."""
+        if self._failure_threshold <= 0:
+            return
+
+        breaker = self._breakers.get(account_id)
+        if breaker is None:
+            breaker = self._breakers[account_id] = CircuitBreaker(
+                self._failure_threshold, self._reset_timeout
+            )
+        breaker.record_failure()
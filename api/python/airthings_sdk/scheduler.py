@@ -0,0 +1,184 @@
+"""Module providing adaptive polling for the Airthings API SDK."""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
+
+from airthings_sdk.types import AirthingsDevice
+
+if TYPE_CHECKING:
+    from airthings_sdk.mapper import Airthings
+
+# Seconds between samples assumed for a device until two have been seen.
+DEFAULT_SAMPLE_INTERVAL = 300
+# Seconds between full updates, which find added and removed devices.
+DEFAULT_FULL_UPDATE_INTERVAL = 3600
+# Seconds to wait past the predicted time of a sample before fetching it.
+DEFAULT_GRACE = 30
+# Weight of a new observation in the estimated sample interval.
+_SMOOTHING = 0.3
+
+
+@dataclass(slots=True)
+class _DeviceSchedule:
+    """What is known about the sampling of one device."""
+
+    recorded: Optional[float]
+    interval: Optional[float] = None
+    misses: int = 0
+    due: float = 0.0
+
+
+class PollScheduler:  # pylint: disable=too-many-instance-attributes
+    """Poll an Airthings data handler only for devices with new data due.
+
+    Each device is learned to sample at a fixed interval, estimated from
+    successive recorded times. A poll fetches, filtered by serial number,
+    only the devices whose next sample should be available by now. A device
+    that has no new sample yet is retried with exponential backoff. A full
+    update every full_update_interval seconds picks up added and removed
+    devices.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        airthings: "Airthings",
+        *,
+        full_update_interval: float = DEFAULT_FULL_UPDATE_INTERVAL,
+        default_interval: float = DEFAULT_SAMPLE_INTERVAL,
+        min_interval: float = 60,
+        max_interval: float = 3600,
+        grace: float = DEFAULT_GRACE,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Init poll scheduler."""
+        self.airthings = airthings
+        self._full_update_interval = full_update_interval
+        self._default_interval = default_interval
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._grace = grace
+        self._clock = clock
+
+        self._schedules: dict[str, _DeviceSchedule] = {}
+        self._next_full_update = 0.0
+
+    def interval(self, serial_number: str) -> Optional[float]:
+        """Return the estimated sample interval of a device, if learned."""
+        schedule = self._schedules.get(serial_number)
+        return None if schedule is None else schedule.interval
+
+    def pending(self) -> List[str]:
+        """Return the serial numbers of the devices with new data due."""
+        now = self._clock()
+        return [
+            serial_number
+            for serial_number, schedule in self._schedules.items()
+            if schedule.due <= now
+        ]
+
+    def next_due(self) -> float:
+        """Return the time of the next poll that would fetch anything."""
+        due = [schedule.due for schedule in self._schedules.values()]
+        return min([self._next_full_update, *due])
+
+    def poll(self) -> dict[str, AirthingsDevice]:
+        """Fetch the devices that are due. Return the devices."""
+        if self._clock() >= self._next_full_update:
+            self.airthings.update_devices()
+            self._observe_full_update()
+        else:
+            serial_numbers = self.pending()
+            if serial_numbers:
+                self.airthings.update_devices(serial_numbers)
+                self._observe(serial_numbers)
+
+        return self.airthings.devices
+
+    async def async_poll(self) -> dict[str, AirthingsDevice]:
+        """Fetch the devices that are due. Return the devices."""
+        if self._clock() >= self._next_full_update:
+            await self.airthings.async_update_devices()
+            self._observe_full_update()
+        else:
+            serial_numbers = self.pending()
+            if serial_numbers:
+                await self.airthings.async_update_devices(serial_numbers)
+                self._observe(serial_numbers)
+
+        return self.airthings.devices
+
+    def run(self, stop_event: threading.Event):
+        """Poll whenever data is due, until stop_event is set."""
+        while not stop_event.is_set():
+            self.poll()
+            stop_event.wait(max(0.0, self.next_due() - self._clock()))
+
+    async def async_run(self):
+        """Poll whenever data is due, until cancelled."""
+        while True:
+            await self.async_poll()
+            await asyncio.sleep(max(0.0, self.next_due() - self._clock()))
+
+    def _observe_full_update(self):
+        """Learn from a full update and schedule the next one."""
+        devices = self.airthings.devices
+        for serial_number in list(self._schedules):
+            if serial_number not in devices:
+                del self._schedules[serial_number]
+
+        self._observe(devices)
+        self._next_full_update = self._clock() + self._full_update_interval
+
+    def _observe(self, serial_numbers: Iterable[str]):
+        """Learn from the devices just fetched and schedule their next fetch."""
+        now = self._clock()
+        devices = self.airthings.devices
+
+        for serial_number in serial_numbers:
+            device = devices.get(serial_number)
+            recorded = None if device is None else device.recorded_timestamp()
+
+            schedule = self._schedules.get(serial_number)
+            if schedule is None:
+                schedule = self._schedules[serial_number] = _DeviceSchedule(recorded)
+            elif recorded is None or (
+                schedule.recorded is not None and recorded <= schedule.recorded
+            ):
+                schedule.misses += 1
+            else:
+                if schedule.recorded is not None:
+                    self._learn(schedule, recorded - schedule.recorded)
+                schedule.recorded = recorded
+                schedule.misses = 0
+
+            schedule.due = self._due(schedule, now)
+
+    def _learn(self, schedule: _DeviceSchedule, elapsed: float):
+        """Update the sample interval of a device from a new sample."""
+        if schedule.interval is None:
+            interval = elapsed
+        else:
+            # A much longer gap most likely means missed samples rather than a
+            # slower cycle, so it only moves the estimate a little.
+            smoothing = (
+                _SMOOTHING if elapsed < schedule.interval * 1.5 else _SMOOTHING / 4
+            )
+            interval = schedule.interval + smoothing * (elapsed - schedule.interval)
+
+        schedule.interval = min(self._max_interval, max(self._min_interval, interval))
+
+    def _due(self, schedule: _DeviceSchedule, now: float) -> float:
+        """Return when a device should next be fetched."""
+        interval = schedule.interval or self._default_interval
+
+        if schedule.misses:
+            backoff = self._grace * 2 ** min(schedule.misses, 16)
+            return now + min(backoff, interval)
+
+        if schedule.recorded is None:
+            return now + interval
+
+        return max(schedule.recorded + interval + self._grace, now + self._grace)
@@ -0,0 +1,119 @@
+"""Module providing columnar snapshots of Airthings devices.
+
+Requires NumPy, which is installed with the numpy extra.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+    from numpy.typing import NDArray
+except ImportError as e:
+    raise ImportError("Snapshots require NumPy; install airthings-sdk[numpy].") from e
+
+from airthings_sdk.types import AirthingsDevice
+
+BATTERY_SENSOR_TYPE = "battery"
+
+
+@dataclass(frozen=True)
+class FleetSnapshot:  # pylint: disable=too-many-instance-attributes
+    """Columnar view of the sensors of many Airthings devices.
+
+    Device columns (home, recorded, battery) have one row per device, in the
+    order of serial_numbers. Reading columns (device, sensor_type, value)
+    have one row per sensor reading. home and sensor_type hold codes, which
+    index homes and sensor_types.
+    """
+
+    serial_numbers: tuple[str, ...]
+    homes: tuple[Optional[str], ...]
+    sensor_types: tuple[str, ...]
+    home: NDArray[np.int32]
+    recorded: NDArray[np.float64]
+    battery: NDArray[np.float64]
+    device: NDArray[np.int32]
+    sensor_type: NDArray[np.int32]
+    value: NDArray[np.float64]
+
+    @classmethod
+    def from_devices(cls, devices: Iterable[AirthingsDevice]) -> "FleetSnapshot":
+        """Create a FleetSnapshot from Airthings devices."""
+        builder = FleetSnapshotBuilder()
+        for device in devices:
+            builder.add(device)
+        return builder.build()
+
+    def sensor_code(self, sensor_type: str) -> int:
+        """Return the code of a sensor type, or -1 if no device has it."""
+        try:
+            return self.sensor_types.index(sensor_type)
+        except ValueError:
+            return -1
+
+    def readings(
+        self, sensor_type: str
+    ) -> tuple[NDArray[np.int32], NDArray[np.float64]]:
+        """Return the device rows and values of all readings of a sensor type."""
+        mask = self.sensor_type == self.sensor_code(sensor_type)
+        return self.device[mask], self.value[mask]
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        return len(self.serial_numbers)
+
+
+class FleetSnapshotBuilder:  # pylint: disable=too-many-instance-attributes
+    """Collect Airthings devices into compact columns for a FleetSnapshot."""
+
+    def __init__(self) -> None:
+        """Init fleet snapshot builder."""
+        self._serial_numbers: list[str] = []
+        self._home_codes: dict[Optional[str], int] = {}
+        self._sensor_codes: dict[str, int] = {}
+
+        self._home = array("i")
+        self._recorded = array("d")
+        self._battery = array("d")
+        self._device = array("i")
+        self._sensor_type = array("i")
+        self._value = array("d")
+
+    def add(self, device: AirthingsDevice):
+        """Append a device and its sensor readings."""
+        row = len(self._serial_numbers)
+        self._serial_numbers.append(device.serial_number)
+        self._home.append(
+            self._home_codes.setdefault(device.home, len(self._home_codes))
+        )
+        recorded = device.recorded_timestamp()
+        self._recorded.append(float("nan") if recorded is None else recorded)
+
+        battery = float("nan")
+        for sensor in device.sensors:
+            value = sensor.value if isinstance(sensor.value, (int, float)) else None
+            code = self._sensor_codes.setdefault(
+                sensor.sensor_type, len(self._sensor_codes)
+            )
+            self._device.append(row)
+            self._sensor_type.append(code)
+            self._value.append(float("nan") if value is None else value)
+            if sensor.sensor_type == BATTERY_SENSOR_TYPE and value is not None:
+                battery = value
+        self._battery.append(battery)
+
+    def build(self) -> FleetSnapshot:
+        """Create the FleetSnapshot of the devices added so far."""
+        return FleetSnapshot(
+            serial_numbers=tuple(self._serial_numbers),
+            homes=tuple(self._home_codes),
+            sensor_types=tuple(self._sensor_codes),
+            home=np.array(self._home, dtype=np.int32),
+            recorded=np.array(self._recorded, dtype=np.float64),
+            battery=np.array(self._battery, dtype=np.float64),
+            device=np.array(self._device, dtype=np.int32),
+            sensor_type=np.array(self._sensor_type, dtype=np.int32),
+            value=np.array(self._value, dtype=np.float64),
+        )
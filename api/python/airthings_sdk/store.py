@@ -0,0 +1,107 @@
+"""Module providing what the Airthings API SDK keeps of updated devices."""
+
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Union
+
+from airthings_api_client.decoders import JSONDecoder
+from airthings_api_client.models.device_response import DeviceResponse
+from airthings_sdk.cache import DiskCache
+from airthings_sdk.history import SensorHistory
+from airthings_sdk.hooks import AirthingsHooks, UpdateEvent, emit
+from airthings_sdk.types import AirthingsChanges, AirthingsDevice
+
+if TYPE_CHECKING:
+    from airthings_sdk.snapshot import FleetSnapshot, FleetSnapshotBuilder
+
+
+class DeviceStore:
+    """Keep the disk cache, history and snapshot of a data handler's devices.
+
+    Every update is saved to the disk cache and recorded in the history,
+    if there are any, and reported to the hooks. With build_snapshot, full
+    updates build the columnar snapshot while mapping devices; otherwise it
+    is built on first use.
+    """
+
+    history: Optional[SensorHistory]
+
+    def __init__(
+        self,
+        history_capacity: int = 0,
+        build_snapshot: bool = False,
+        hooks: Optional[AirthingsHooks] = None,
+    ):
+        """Init device store."""
+        self.history = SensorHistory(history_capacity) if history_capacity > 0 else None
+        self._build_snapshot = build_snapshot
+        self._hooks = hooks
+        self._snapshot: Optional["FleetSnapshot"] = None
+        self._disk_cache: Optional[DiskCache] = None
+
+    def open_disk_cache(
+        self,
+        path: Union[str, os.PathLike],
+        client_id: str,
+        unit: str,
+        json_decoder: JSONDecoder,
+    ) -> DiskCache:
+        """Open the disk cache at path and return it, to load its contents."""
+        self._disk_cache = DiskCache(path, client_id, unit, json_decoder)
+        return self._disk_cache
+
+    def close(self):
+        """Close the disk cache, if any."""
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def save_token(self, access_token: str, expires_at: float):
+        """Save the access token to the disk cache, if any."""
+        if self._disk_cache is not None:
+            self._disk_cache.save_token(access_token, expires_at)
+
+    def save_metadata(self, account_id: str, device_map: Dict[str, DeviceResponse]):
+        """Save the metadata of the devices of an account to the disk cache, if any."""
+        if self._disk_cache is not None:
+            self._disk_cache.save_metadata(account_id, device_map)
+
+    def snapshot_builder(self, partial: bool) -> Optional["FleetSnapshotBuilder"]:
+        """Return a snapshot builder for a full update with build_snapshot."""
+        if not self._build_snapshot or partial:
+            return None
+
+        # pylint: disable-next=import-outside-toplevel
+        from airthings_sdk.snapshot import FleetSnapshotBuilder
+
+        return FleetSnapshotBuilder()
+
+    def snapshot(self, devices: Iterable[AirthingsDevice]) -> "FleetSnapshot":
+        """Return the snapshot of the last update, building it from devices if none."""
+        if self._snapshot is None:
+            # pylint: disable-next=import-outside-toplevel
+            from airthings_sdk.snapshot import FleetSnapshot
+
+            self._snapshot = FleetSnapshot.from_devices(devices)
+
+        return self._snapshot
+
+    def record(
+        self,
+        changes: AirthingsChanges,
+        snapshot: Optional["FleetSnapshot"],
+        event: UpdateEvent,
+    ):
+        """Keep the changes of an update and the snapshot built during it."""
+        self._snapshot = snapshot
+
+        if self._disk_cache is not None:
+            self._disk_cache.save_changes(changes)
+
+        if self.history is not None:
+            self.history.record(changes.added.values())
+            self.history.record(changes.updated.values())
+            for serial_number in changes.removed:
+                self.history.forget(serial_number)
+
+        if self._hooks is not None:
+            emit(self._hooks.on_update, event)
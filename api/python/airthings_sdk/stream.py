@@ -0,0 +1,181 @@
+"""Module providing streaming parsing of sensors pages.
+
+The generated get_multiple_sensors endpoint holds the whole body of a page
+as bytes, then as a str and then as a dict before it builds any model. The
+parser here takes the body chunk by chunk as it arrives, and hands out every
+item of results as soon as it is complete, so only the item being parsed is
+held in memory and parsing overlaps with the transfer.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, List, Tuple
+
+import httpx
+
+from airthings_api_client.models import SensorsResponse
+
+_TOKEN = re.compile(r"[^ \t\n\r]")
+
+# Characters that can continue a number.
+_NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+# Parser states, by what is expected next.
+_START = 0
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_FIRST_ITEM = 4
+_ITEM = 5
+_ITEM_END = 6
+_FIELD_END = 7
+_DONE = 8
+
+
+class SensorsPageParser:  # pylint: disable=too-many-instance-attributes
+    """Incremental parser of the body of a sensors page.
+
+    feed takes the next chunk of the body and returns the items of results
+    completed by it, as decoded JSON. The other top level fields, such as
+    hasNext and totalPages, are collected in fields, and size counts the
+    bytes fed so far.
+    """
+
+    def __init__(self) -> None:
+        """Init sensors page parser."""
+        self.fields: dict[str, Any] = {}
+        self.size = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key = ""
+
+    @property
+    def done(self) -> bool:
+        """Tell whether the whole page has been parsed."""
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Parse the next chunk of the body. Return the items it completes.
+
+        With final, the chunk is the end of the body, and a page left
+        incomplete raises a ValueError.
+        """
+        self.size += len(chunk)
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk, final)
+        self._pos = 0
+
+        items: List[Any] = []
+        while self._step(items, final):
+            pass
+
+        if final and self._state != _DONE:
+            raise ValueError("Incomplete sensors page.")
+        return items
+
+    def close(self) -> List[Any]:
+        """Mark the end of the body. Return the items it completes."""
+        return self.feed(b"", final=True)
+
+    def _step(  # pylint: disable=too-many-branches
+        self, items: List[Any], final: bool
+    ) -> bool:
+        """Parse the next token of the buffer. Tell whether to go on."""
+        token = _TOKEN.search(self._buffer, self._pos)
+        if token is None:
+            self._pos = len(self._buffer)
+            return False
+        self._pos = token.start()
+
+        char = self._buffer[self._pos]
+        state = self._state
+
+        if state == _START:
+            self._expect(char, "{")
+            self._state = _KEY
+        elif state == _KEY and char == "}":
+            self._pos += 1
+            self._state = _DONE
+        elif state == _KEY:
+            complete, key = self._decode(final)
+            if not complete:
+                return False
+            if not isinstance(key, str):
+                raise ValueError("Expected a key in sensors page.")
+            self._key = key
+            self._state = _COLON
+        elif state == _COLON:
+            self._expect(char, ":")
+            self._state = _VALUE
+        elif state == _VALUE and self._key == "results" and char == "[":
+            self._pos += 1
+            self._state = _FIRST_ITEM
+        elif state == _VALUE:
+            complete, value = self._decode(final)
+            if not complete:
+                return False
+            self.fields[self._key] = value
+            self._state = _FIELD_END
+        elif state in (_FIRST_ITEM, _ITEM_END) and char == "]":
+            self._pos += 1
+            self._state = _FIELD_END
+        elif state == _ITEM_END:
+            self._expect(char, ",")
+            self._state = _ITEM
+        elif state in (_FIRST_ITEM, _ITEM):
+            complete, item = self._decode(final)
+            if not complete:
+                return False
+            items.append(item)
+            self._state = _ITEM_END
+        elif state == _FIELD_END and char == "}":
+            self._pos += 1
+            self._state = _DONE
+        elif state == _FIELD_END:
+            self._expect(char, ",")
+            self._state = _KEY
+        else:
+            raise ValueError(f"Unexpected {char!r} after sensors page.")
+
+        return True
+
+    def _expect(self, char: str, expected: str):
+        """Consume the expected character, or raise a ValueError."""
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} in sensors page, got {char!r}.")
+        self._pos += 1
+
+    def _decode(self, final: bool) -> Tuple[bool, Any]:
+        """Decode the JSON value at the current position, if it is complete."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+
+        # A number at the end of the buffer may go on in the next chunk.
+        if not final and (
+            end == len(self._buffer) or self._buffer[end] in _NUMBER_TAIL
+        ):
+            return False, None
+
+        self._pos = end
+        return True, value
+
+
+async def aiter_sensors(
+    response: httpx.Response, parser: SensorsPageParser
+) -> AsyncIterator[SensorsResponse]:
+    """Yield the sensors of a streamed sensors page as they are parsed."""
+    async for chunk in response.aiter_bytes():
+        for item in parser.feed(chunk):
+            if isinstance(item, dict):
+                yield SensorsResponse.from_dict(item)
+
+    for item in parser.close():
+        if isinstance(item, dict):
+            yield SensorsResponse.from_dict(item)
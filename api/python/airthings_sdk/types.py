@@ -1,18 +1,55 @@
 """Airthings API SDK types."""
 
+import sys
 import time
 from dataclasses import dataclass, field
-from typing import Optional, cast
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional, cast
 
 from airthings_api_client.models import (
-    SensorResponseType0,
+    SensorResponse,
     DeviceResponse,
     SensorsResponse,
 )
 from airthings_api_client.types import Unset
 
 
-@dataclass
+@lru_cache(maxsize=1024)
+def _recorded_timestamp(recorded: str) -> Optional[float]:
+    """Parse a recorded time into epoch seconds. Naive times are UTC."""
+    try:
+        parsed = datetime.fromisoformat(recorded.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _unset_to_none(value: Any) -> Any:
+    """Return None for a field missing from a response, the value otherwise."""
+    return None if isinstance(value, Unset) else value
+
+
+# Sensor type to position maps, shared by all devices with the same sensors.
+_SENSOR_INDEXES: dict[tuple[str, ...], dict[str, int]] = {}
+
+
+def _sensor_index(sensors: tuple["AirthingsSensor", ...]) -> dict[str, int]:
+    """Return the shared sensor type to position map for a sensor layout."""
+    layout = tuple(sensor.sensor_type for sensor in sensors)
+    index = _SENSOR_INDEXES.get(layout)
+    if index is None:
+        index = {}
+        for position, sensor_type in enumerate(layout):
+            index.setdefault(sensor_type, position)
+        index = _SENSOR_INDEXES.setdefault(layout, index)
+    return index
+
+
+@dataclass(frozen=True, slots=True)
 class AirthingsSensor:
     """Representation of Airthings device sensor."""
 
@@ -20,21 +57,28 @@ class AirthingsSensor:
     value: int | float
     unit: str
 
+    def __post_init__(self):
+        """Intern the sensor type and unit, which repeat across devices."""
+        if isinstance(self.sensor_type, str):
+            object.__setattr__(self, "sensor_type", sys.intern(self.sensor_type))
+        if isinstance(self.unit, str):
+            object.__setattr__(self, "unit", sys.intern(self.unit))
+
     @classmethod
-    def from_response(cls, sensor_response: SensorResponseType0 | None | Unset):
-        """Create an AirthingsSensor from a SensorResponseType0"""
+    def from_response(cls, sensor_response: SensorResponse | None | Unset):
+        """Create an AirthingsSensor from a SensorResponse"""
 
-        if sensor_response is None or isinstance(sensor_response, Unset):
+        if not isinstance(sensor_response, SensorResponse):
             return None
 
         return cls(
-            sensor_type=cast(str, sensor_response.sensor_type),
-            value=cast(float | int, sensor_response.value),
-            unit=cast(str, sensor_response.unit),
+            sensor_type=cast(str, _unset_to_none(sensor_response.sensor_type)),
+            value=cast(float | int, _unset_to_none(sensor_response.value)),
+            unit=cast(str, _unset_to_none(sensor_response.unit)),
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AirthingsDevice:
     """Representation of an Airthings device"""
 
@@ -43,7 +87,25 @@ class AirthingsDevice:
     name: str
     home: Optional[str]
     recorded: Optional[str]
-    sensors: list[AirthingsSensor] = field(default_factory=list)
+    sensors: tuple[AirthingsSensor, ...] = ()
+    _index: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Intern the device type and index the sensors by type."""
+        if isinstance(self.type, str):
+            object.__setattr__(self, "type", sys.intern(self.type))
+        object.__setattr__(self, "_index", _sensor_index(self.sensors))
+
+    def sensor(self, sensor_type: str) -> Optional[AirthingsSensor]:
+        """Return the sensor of the given type, if the device has one."""
+        position = self._index.get(sensor_type)
+        return None if position is None else self.sensors[position]
+
+    def recorded_timestamp(self) -> Optional[float]:
+        """Return the recorded time in epoch seconds, if known."""
+        if not isinstance(self.recorded, str):
+            return None
+        return _recorded_timestamp(self.recorded)
 
     @classmethod
     def from_response(
@@ -54,7 +116,9 @@ class AirthingsDevice:
         mapped = map(AirthingsSensor.from_response, sensors_response.sensors or [])
         filtered = list(filter(lambda sensor: sensor is not None, mapped))
 
-        if sensors_response.battery_percentage is not None:
+        if sensors_response.battery_percentage is not None and not isinstance(
+            sensors_response.battery_percentage, Unset
+        ):
             filtered.append(
                 AirthingsSensor(
                     sensor_type="battery",
@@ -67,11 +131,66 @@ class AirthingsDevice:
             name=cast(str, device_response.name),
             type=cast(str, device_response.type),
             home=cast(str | None, device_response.home),
-            recorded=cast(str | None, sensors_response.recorded),
-            sensors=filtered,
+            recorded=cast(str | None, _unset_to_none(sensors_response.recorded)),
+            sensors=tuple(filtered),
         )
 
 
+@dataclass
+class AirthingsChanges:
+    """Representation of the changes between two updates of Airthings devices"""
+
+    added: dict[str, AirthingsDevice] = field(default_factory=dict)
+    updated: dict[str, AirthingsDevice] = field(default_factory=dict)
+    removed: dict[str, AirthingsDevice] = field(default_factory=dict)
+    changed_sensors: dict[str, list[AirthingsSensor]] = field(default_factory=dict)
+
+    @classmethod
+    def between(
+        cls,
+        previous: dict[str, AirthingsDevice],
+        current: dict[str, AirthingsDevice],
+        partial: bool = False,
+    ) -> "AirthingsChanges":
+        """Create the changes from previous to current devices.
+
+        Devices that were not remapped are the same objects in both, so only
+        remapped devices are compared sensor by sensor. A partial update
+        never removes devices.
+        """
+        changes = cls()
+
+        for serial_number, device in current.items():
+            previous_device = previous.get(serial_number)
+            if previous_device is None:
+                changes.added[serial_number] = device
+            elif previous_device is not device:
+                changes.updated[serial_number] = device
+                previous_values = {
+                    sensor.sensor_type: (sensor.value, sensor.unit)
+                    for sensor in previous_device.sensors
+                }
+                changed = [
+                    sensor
+                    for sensor in device.sensors
+                    if previous_values.get(sensor.sensor_type)
+                    != (sensor.value, sensor.unit)
+                ]
+                if changed:
+                    changes.changed_sensors[serial_number] = changed
+
+        if not partial:
+            for serial_number, device in previous.items():
+                if serial_number not in current:
+                    changes.removed[serial_number] = device
+
+        return changes
+
+    def __bool__(self) -> bool:
+        """Tell whether anything changed."""
+        return bool(self.added or self.updated or self.removed)
+
+
 class AirthingsToken:
     """Representation of an Airthings API token."""
 
@@ -83,6 +202,12 @@ class AirthingsToken:
         self.value = access_token
         self._expires = expires_in + int(time.time())
 
+    def expires_in(self) -> float:
+        """Return the seconds until the token expires, or 0 if there is none."""
+        if self._expires is None:
+            return 0.0
+        return max(0.0, self._expires - time.time())
+
     def is_valid(self) -> bool:
         """Check if the token is valid."""
         return (
@@ -0,0 +1,127 @@
+"""Benchmark of decoding sensors pages into Airthings devices.
+
+Compares the generated models path with the fast decoder on a synthetic
+page, after checking that both produce the same devices. Also decodes a
+few watched devices of the page through a LazySensorsPage, which parses
+only their items.
+
+Usage:
+PYTHONPATH=. python benchmarks/bench_decoder.py [iterations]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from common import sensors_page
+
+from airthings_api_client.models import DeviceResponse, GetMultipleSensorsResponse200
+from airthings_sdk.decoder import LazySensorsPage, RawSensorsPage, decode_device
+from airthings_sdk.types import AirthingsDevice
+
+WATCHED = 5
+
+
+def build_device_map(content: bytes) -> dict[str, DeviceResponse]:
+    """Build the device metadata for every device of a page."""
+    return {
+        item["serialNumber"]: DeviceResponse(
+            serial_number=item["serialNumber"],
+            name=f"Device {item['serialNumber']}",
+            type="VIEW_PLUS",
+            home="Home",
+        )
+        for item in json.loads(content)["results"]
+    }
+
+
+def decode_models(
+    content: bytes, device_map: dict[str, DeviceResponse]
+) -> List[AirthingsDevice]:
+    """Decode a page through the generated models, as the SDK does by default."""
+    page = GetMultipleSensorsResponse200.from_dict(json.loads(content))
+    return [
+        AirthingsDevice.from_response(device_map[sensor.serial_number], sensor)
+        for sensor in page.results or []
+        if isinstance(sensor.serial_number, str)
+    ]
+
+
+def decode_fast(
+    content: bytes, device_map: dict[str, DeviceResponse]
+) -> List[AirthingsDevice]:
+    """Decode a page with the fast decoder."""
+    page = RawSensorsPage.from_dict(json.loads(content))
+    return [
+        decode_device(device_map[item["serialNumber"]], item) for item in page.results
+    ]
+
+
+def decode_lazy(
+    content: bytes, device_map: dict[str, DeviceResponse]
+) -> List[AirthingsDevice]:
+    """Decode the devices of device_map only, looking them up on a lazy page."""
+    page = LazySensorsPage.from_dict(json.loads(content))
+    devices = []
+    for serial_number, device in device_map.items():
+        sensor = page.get(serial_number)
+        if sensor is not None:
+            devices.append(AirthingsDevice.from_response(device, sensor))
+    return devices
+
+
+def measure(
+    name: str,
+    decode: Callable[[bytes, dict[str, DeviceResponse]], List[AirthingsDevice]],
+    content: bytes,
+    device_map: dict[str, DeviceResponse],
+    iterations: int,
+):
+    """Print the time per page and the allocations of a single page."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(content, device_map)
+    per_page = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    devices = decode(content, device_map)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    print(
+        f"{name:<8} {per_page * 1e6:10.1f} us/page "
+        f"{blocks:8d} blocks kept {peak / 1024:10.1f} KiB peak "
+        f"({len(devices)} devices)"
+    )
+
+
+if __name__ == "__main__":
+    ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    page_content = sensors_page()
+    devices_by_serial = build_device_map(page_content)
+
+    if decode_models(page_content, devices_by_serial) != decode_fast(
+        page_content, devices_by_serial
+    ):
+        print("Fast decoder output differs from the generated models.")
+        sys.exit(1)
+
+    measure("models", decode_models, page_content, devices_by_serial, ITERATIONS)
+    measure("fast", decode_fast, page_content, devices_by_serial, ITERATIONS)
+
+    watched = dict(list(devices_by_serial.items())[:WATCHED])
+    if decode_lazy(page_content, watched) != [
+        device
+        for device in decode_models(page_content, devices_by_serial)
+        if device.serial_number in watched
+    ]:
+        print("Lazy page output differs from the generated models.")
+        sys.exit(1)
+
+    measure("lazy", decode_lazy, page_content, watched, ITERATIONS)
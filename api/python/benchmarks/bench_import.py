@@ -0,0 +1,65 @@
+"""Benchmark of the cold start cost of importing the SDK.
+
+Runs each import statement in a fresh interpreter several times and
+reports the median time it takes and the number of modules it loads.
+
+Usage:
+PYTHONPATH=. python benchmarks/bench_import.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+STATEMENTS = [
+    "import airthings_sdk",
+    "from airthings_sdk import AirthingsDevice",
+    "from airthings_sdk import Airthings",
+    "from airthings_api_client.models import SensorsResponse",
+    "import airthings_api_client.api.sensor.get_multiple_sensors",
+]
+
+PROBE = """
+import sys, time
+before = len(sys.modules)
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start, len(sys.modules) - before, "httpx" in sys.modules)
+"""
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(statement: str) -> Tuple[float, int, bool]:
+    """Run a statement in a fresh interpreter. Return seconds, modules and httpx."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout.split()
+    return float(output[0]), int(output[1]), output[2] == "True"
+
+
+def main() -> None:
+    """Run the benchmark and print a table of results."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'statement':<62} {'ms':>7} {'modules':>8} {'httpx':>6}")
+    for statement in STATEMENTS:
+        results = [measure(statement) for _ in range(runs)]
+        times: List[float] = [seconds for seconds, _, _ in results]
+        _, modules, httpx = results[0]
+        print(
+            f"{statement:<62} {statistics.median(times) * 1000:>7.1f} "
+            f"{modules:>8} {'yes' if httpx else 'no':>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
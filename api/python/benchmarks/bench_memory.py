@@ -0,0 +1,129 @@
+"""Benchmark of the memory used by Airthings devices.
+
+Compares plain dataclasses with a list of sensors, as AirthingsDevice and
+AirthingsSensor used to be, with the current slotted types. Devices are
+built from decoded JSON pages, so every reading brings its own strings.
+
+Usage:
+PYTHONPATH=. python benchmarks/bench_memory.py [devices]
+"""
+
+# The legacy types mirror AirthingsDevice and AirthingsSensor on purpose.
+# pylint: disable=duplicate-code
+
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from common import sensors_page
+
+from airthings_sdk.const import SENSORS_PAGE_SIZE
+from airthings_sdk.types import AirthingsDevice, AirthingsSensor
+
+# The last sensor of a device, the worst case for a linear scan.
+LOOKUP_SENSOR_TYPE = "pm25"
+
+
+@dataclass
+class LegacySensor:
+    """AirthingsSensor as a plain dataclass."""
+
+    sensor_type: str
+    value: int | float
+    unit: str
+
+
+@dataclass
+class LegacyDevice:
+    """AirthingsDevice as a plain dataclass."""
+
+    serial_number: str
+    type: str
+    name: str
+    home: Optional[str]
+    recorded: Optional[str]
+    sensors: list[LegacySensor] = field(default_factory=list)
+
+
+def build_legacy(item: dict) -> LegacyDevice:
+    """Build a device with the plain dataclasses."""
+    return LegacyDevice(
+        serial_number=item["serialNumber"],
+        type="VIEW_PLUS",
+        name="Device",
+        home="Home",
+        recorded=item["recorded"],
+        sensors=[
+            LegacySensor(sensor["sensorType"], sensor["value"], sensor["unit"])
+            for sensor in item["sensors"]
+        ],
+    )
+
+
+def build_slotted(item: dict) -> AirthingsDevice:
+    """Build a device with the current types."""
+    return AirthingsDevice(
+        serial_number=item["serialNumber"],
+        type="VIEW_PLUS",
+        name="Device",
+        home="Home",
+        recorded=item["recorded"],
+        sensors=tuple(
+            AirthingsSensor(sensor["sensorType"], sensor["value"], sensor["unit"])
+            for sensor in item["sensors"]
+        ),
+    )
+
+
+def measure(name: str, build: Callable[[dict], Any], pages: List[bytes]) -> List[Any]:
+    """Print the bytes held per device once all pages are mapped."""
+    tracemalloc.start()
+    devices: List[Any] = []
+    for page in pages:
+        devices.extend(build(item) for item in json.loads(page)["results"])
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<8} {size / len(devices):8.0f} bytes/device")
+    return devices
+
+
+def legacy_lookup(device: LegacyDevice) -> Optional[LegacySensor]:
+    """Find a sensor by a linear scan."""
+    for sensor in device.sensors:
+        if sensor.sensor_type == LOOKUP_SENSOR_TYPE:
+            return sensor
+    return None
+
+
+def slotted_lookup(device: AirthingsDevice) -> Optional[AirthingsSensor]:
+    """Find a sensor by its index."""
+    return device.sensor(LOOKUP_SENSOR_TYPE)
+
+
+def time_lookup(name: str, lookup: Callable[[Any], Any], devices: List[Any]):
+    """Print the time to look up a sensor of every device."""
+    start = time.perf_counter()
+    for device in devices:
+        lookup(device)
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<8} {elapsed / len(devices) * 1e9:8.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    DEVICES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    sensor_pages = [
+        sensors_page(page_number)
+        for page_number in range(max(1, DEVICES // SENSORS_PAGE_SIZE))
+    ]
+
+    legacy_devices = measure("legacy", build_legacy, sensor_pages)
+    slotted_devices = measure("slotted", build_slotted, sensor_pages)
+
+    time_lookup("legacy", legacy_lookup, legacy_devices)
+    time_lookup("slotted", slotted_lookup, slotted_devices)
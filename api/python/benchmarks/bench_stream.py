@@ -0,0 +1,74 @@
+"""Benchmark of streaming the parsing of large sensors pages.
+
+Compares decoding a whole page and then building every SensorsResponse,
+as the generated endpoint does, with feeding the page chunk by chunk to a
+SensorsPageParser. Both consume the sensors one at a time and keep none of
+them, so the peak memory is what parsing a page takes.
+
+Usage:
+PYTHONPATH=. python benchmarks/bench_stream.py [devices] [chunk size]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from common import sensors_page
+
+from airthings_api_client.models import GetMultipleSensorsResponse200, SensorsResponse
+from airthings_sdk.stream import SensorsPageParser
+
+
+def parse_whole(content: bytes, _: int) -> Iterator[SensorsResponse]:
+    """Decode the page at once and build all of its sensors."""
+    page = GetMultipleSensorsResponse200.from_dict(json.loads(content))
+    yield from page.results or []
+
+
+def parse_streamed(content: bytes, chunk_size: int) -> Iterator[SensorsResponse]:
+    """Feed the page to a SensorsPageParser chunk by chunk."""
+    parser = SensorsPageParser()
+    for start in range(0, len(content), chunk_size):
+        for item in parser.feed(content[start : start + chunk_size]):
+            yield SensorsResponse.from_dict(item)
+    for item in parser.close():
+        yield SensorsResponse.from_dict(item)
+
+
+def measure(
+    name: str,
+    parse: Callable[[bytes, int], Iterator[SensorsResponse]],
+    content: bytes,
+    chunk_size: int,
+):
+    """Print the time and the peak memory of parsing a page."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    sensors = sum(1 for _ in parse(content, chunk_size))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<8} {elapsed * 1000:10.1f} ms {peak / 1024:10.1f} KiB peak "
+        f"({sensors} sensors)"
+    )
+
+
+if __name__ == "__main__":
+    DEVICES = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    CHUNK_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 65_536
+
+    page_content = sensors_page(size=DEVICES)
+    print(f"page of {len(page_content) / 1024:.1f} KiB")
+
+    if [sensor.to_dict() for sensor in parse_whole(page_content, CHUNK_SIZE)] != [
+        sensor.to_dict() for sensor in parse_streamed(page_content, CHUNK_SIZE)
+    ]:
+        print("Streamed sensors differ from the generated models.")
+        sys.exit(1)
+
+    measure("whole", parse_whole, page_content, CHUNK_SIZE)
+    measure("stream", parse_streamed, page_content, CHUNK_SIZE)
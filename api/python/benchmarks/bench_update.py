@@ -0,0 +1,132 @@
+"""Benchmark of updating devices against a fake Airthings API.
+
+Runs a cold update (token, accounts, devices and sensors) followed by a
+warm one for each fleet size, and reports requests, wall time, CPU time
+and peak memory. Peak memory is measured in a separate run, as tracing
+allocations slows everything else down.
+
+Usage:
+PYTHONPATH=. python benchmarks/bench_update.py [--sizes 10 100 1000] [--async] [...]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, List
+
+from fake_api import FakeAirthingsApi
+
+from airthings_sdk import Airthings
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+@dataclass
+class Result:
+    """Measurements of one update."""
+
+    requests: int
+    wall: float
+    cpu: float
+
+
+def make_airthings(api: FakeAirthingsApi, args: argparse.Namespace) -> Airthings:
+    """Build a data handler that talks to the fake API."""
+    return Airthings(
+        client_id="client-id",
+        client_secret="client-secret",
+        is_metric=True,
+        transport=api.transport(),
+        async_transport=api.async_transport(),
+        max_concurrency=args.max_concurrency,
+        parallel_pages=args.parallel_pages,
+        fast_decode=args.fast_decode,
+        metadata_ttl=args.metadata_ttl,
+    )
+
+
+def update(airthings: Airthings, args: argparse.Namespace) -> Any:
+    """Update the devices once."""
+    if args.use_async:
+        return asyncio.run(airthings.async_update_devices())
+    return airthings.update_devices()
+
+
+def measure(
+    api: FakeAirthingsApi, airthings: Airthings, args: argparse.Namespace
+) -> Result:
+    """Update the devices once and measure it."""
+    requests = api.requests
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    update(airthings, args)
+    return Result(
+        requests=api.requests - requests,
+        wall=time.perf_counter() - wall,
+        cpu=time.process_time() - cpu,
+    )
+
+
+def peak_memory(size: int, args: argparse.Namespace) -> int:
+    """Return the peak memory in bytes of a cold update."""
+    api = FakeAirthingsApi(
+        size, accounts=args.accounts, page_size=args.page_size, latency=args.latency
+    )
+    airthings = make_airthings(api, args)
+
+    tracemalloc.start()
+    update(airthings, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--max-concurrency", type=int, default=10)
+    parser.add_argument("--parallel-pages", action="store_true")
+    parser.add_argument("--fast-decode", action="store_true")
+    parser.add_argument("--metadata-ttl", type=float, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark and print a table of results."""
+    args = parse_args()
+
+    print(
+        f"{'devices':>8} {'run':<5} {'requests':>8} {'wall s':>8} "
+        f"{'cpu s':>8} {'peak MiB':>9}"
+    )
+    for size in args.sizes:
+        api = FakeAirthingsApi(
+            size,
+            accounts=args.accounts,
+            page_size=args.page_size,
+            latency=args.latency,
+        )
+        airthings = make_airthings(api, args)
+        results: List[Result] = [measure(api, airthings, args) for _ in range(2)]
+        peak = None if args.no_memory else peak_memory(size, args)
+
+        for run, result in zip(("cold", "warm"), results):
+            memory = (
+                f"{peak / 2**20:9.1f}" if peak is not None and run == "cold" else ""
+            )
+            print(
+                f"{size:>8} {run:<5} {result.requests:>8} {result.wall:>8.3f} "
+                f"{result.cpu:>8.3f} {memory:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
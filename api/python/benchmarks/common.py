@@ -0,0 +1,38 @@
+"""Synthetic Airthings API data shared by the benchmarks."""
+
+import json
+
+from airthings_sdk.const import SENSORS_PAGE_SIZE
+
+SENSOR_TYPES = [
+    ("radonShortTermAvg", 42, "bq"),
+    ("temp", 21.4, "c"),
+    ("humidity", 38.0, "pct"),
+    ("pressure", 1002.3, "hpa"),
+    ("co2", 612.0, "ppm"),
+    ("voc", 120.0, "ppb"),
+    ("pm1", 2.0, "mgpc"),
+    ("pm25", 3.0, "mgpc"),
+]
+
+
+def sensors_item(serial_number: str, battery_percentage: int | None = None) -> dict:
+    """Build the sensors of one device, as in a sensors page."""
+    return {
+        "serialNumber": serial_number,
+        "recorded": "2024-05-01T12:00:00",
+        "batteryPercentage": battery_percentage,
+        "sensors": [
+            {"sensorType": sensor_type, "value": value, "unit": unit}
+            for sensor_type, value, unit in SENSOR_TYPES
+        ],
+    }
+
+
+def sensors_page(page_number: int = 1, size: int = SENSORS_PAGE_SIZE) -> bytes:
+    """Build the JSON body of a full sensors page."""
+    results = [
+        sensors_item(f"{page_number:05d}{index:05d}", 80 if index % 5 else None)
+        for index in range(size)
+    ]
+    return json.dumps({"results": results, "hasNext": False}).encode()
@@ -0,0 +1,188 @@
+"""In-process stand-in for the Airthings auth and consumer APIs.
+
+Serves /v1/token, /v1/accounts, /v1/accounts/{id}/devices and paginated
+/v1/accounts/{id}/sensors through an httpx MockTransport, with a
+configurable fleet, page size, latency and rate limit.
+"""
+
+import asyncio
+import json
+import math
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from common import sensors_item
+
+from airthings_sdk.const import SENSORS_PAGE_SIZE
+
+
+class FakeAirthingsApi:  # pylint: disable=too-many-instance-attributes
+    """Fake Airthings API with a synthetic fleet of devices.
+
+    Devices are spread evenly over accounts. Device lists and full sensors
+    pages are serialized up front, so serving them costs little next to
+    the SDK.
+    Every response carries rate limit headers for a budget of rate_limit
+    requests per rate_limit_window seconds; requests over budget get 429.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        devices: int,
+        *,
+        accounts: int = 1,
+        page_size: int = SENSORS_PAGE_SIZE,
+        latency: float = 0.0,
+        rate_limit: int = 1_000_000,
+        rate_limit_window: float = 3600,
+    ):
+        """Init fake Airthings API."""
+        self.page_size = page_size
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.requests = 0
+
+        self._window_start = time.time()
+        self._window_requests = 0
+
+        self._devices: Dict[str, List[str]] = {}
+        for index in range(devices):
+            account_id = f"account-{index % accounts}"
+            self._devices.setdefault(account_id, []).append(f"{index:010d}")
+        for index in range(len(self._devices), accounts):
+            self._devices[f"account-{index}"] = []
+
+        self._device_lists = {
+            account_id: self._devices_response(serials)
+            for account_id, serials in self._devices.items()
+        }
+        self._pages: Dict[tuple[str, int], bytes] = {
+            (account_id, page_number): self._sensors_page(serials, page_number)
+            for account_id, serials in self._devices.items()
+            for page_number in range(1, self._total_pages(serials) + 1)
+        }
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport for synchronous httpx clients."""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """Return a transport for asynchronous httpx clients."""
+        return httpx.MockTransport(self.async_handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request after the configured latency."""
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(request)
+
+    async def async_handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request after the configured latency."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(request)
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        """Route a request and add rate limit headers."""
+        self.requests += 1
+
+        now = time.time()
+        if now >= self._window_start + self.rate_limit_window:
+            self._window_start = now
+            self._window_requests = 0
+        self._window_requests += 1
+
+        reset = self._window_start + self.rate_limit_window
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(
+                max(0, self.rate_limit - self._window_requests)
+            ),
+            "X-RateLimit-Reset": str(int(reset)),
+        }
+
+        if self._window_requests > self.rate_limit:
+            headers["X-RateLimit-Retry-After"] = str(math.ceil(reset - now))
+            return httpx.Response(
+                429, headers=headers, json={"message": "Rate limit exceeded"}
+            )
+
+        content = self._route(request)
+        if content is None:
+            return httpx.Response(404, headers=headers)
+
+        headers["Content-Type"] = "application/json"
+        return httpx.Response(200, headers=headers, content=content)
+
+    def _route(  # pylint: disable=too-many-return-statements
+        self, request: httpx.Request
+    ) -> Optional[bytes]:
+        """Return the body for a request, or None if not found."""
+        parts = request.url.path.strip("/").split("/")
+
+        if parts == ["v1", "token"]:
+            return json.dumps({"access_token": "token", "expires_in": 3600}).encode()
+
+        if parts == ["v1", "accounts"]:
+            accounts = [{"id": account_id} for account_id in self._devices]
+            return json.dumps({"accounts": accounts}).encode()
+
+        if len(parts) != 4 or parts[:2] != ["v1", "accounts"]:
+            return None
+
+        serials = self._devices.get(parts[2])
+        if serials is None:
+            return None
+
+        if parts[3] == "devices":
+            return self._device_lists[parts[2]]
+
+        if parts[3] == "sensors":
+            page_number = int(request.url.params.get("pageNumber", "1"))
+            filtered = request.url.params.get_list("sn")
+            if filtered:
+                wanted = set(filtered)
+                return self._sensors_page(
+                    [serial for serial in serials if serial in wanted], page_number
+                )
+            page = self._pages.get((parts[2], page_number))
+            return page or self._sensors_page(serials, page_number)
+
+        return None
+
+    def _total_pages(self, serials: List[str]) -> int:
+        """Return the number of sensors pages for a list of devices."""
+        return max(1, math.ceil(len(serials) / self.page_size))
+
+    @staticmethod
+    def _devices_response(serials: List[str]) -> bytes:
+        """Build the body of a devices response."""
+        devices = [
+            {
+                "serialNumber": serial,
+                "home": f"Home {int(serial) % 100}",
+                "name": f"Device {serial}",
+                "type": "VIEW_PLUS",
+                "sensors": [],
+            }
+            for serial in serials
+        ]
+        return json.dumps({"devices": devices}).encode()
+
+    def _sensors_page(self, serials: List[str], page_number: int) -> bytes:
+        """Build the body of a sensors page."""
+        total_pages = self._total_pages(serials)
+        start = (page_number - 1) * self.page_size
+        results = [
+            sensors_item(serial, 80 if int(serial) % 5 else None)
+            for serial in serials[start : start + self.page_size]
+        ]
+        return json.dumps(
+            {
+                "results": results,
+                "hasNext": page_number < total_pages,
+                "totalPages": total_pages,
+            }
+        ).encode()
@@ -0,0 +1,37 @@
+"""Example of computing fleet statistics from a snapshot of Airthings devices."""
+
+import sys
+
+import numpy as np
+
+from airthings_sdk import Airthings
+
+if __name__ == "__main__":
+    if len(sys.argv) <= 2:
+        print("Please add client id and client secret as parameters.")
+        print("Usage:")
+        print("python fleet_statistics.py <client_id> <client_secret>")
+        sys.exit(1)
+    client_id = sys.argv[1]
+    client_secret = sys.argv[2]
+
+    airthings = Airthings(
+        client_id=client_id,
+        client_secret=client_secret,
+        is_metric=True,
+        build_snapshot=True,
+    )
+
+    airthings.update_devices()
+    snapshot = airthings.snapshot_arrays()
+
+    devices, co2 = snapshot.readings("co2")
+    homes = snapshot.home[devices]
+    mean_co2 = np.bincount(homes, weights=co2) / np.bincount(homes)
+    for code in np.unique(homes):
+        print(f"Mean CO2 in {snapshot.homes[code]}: {mean_co2[code]:.0f} ppm")
+
+    _, radon = snapshot.readings("radonShortTermAvg")
+    if radon.size:
+        p50, p95 = np.nanpercentile(radon, [50, 95])
+        print(f"Radon median {p50:.0f}, 95th percentile {p95:.0f}")
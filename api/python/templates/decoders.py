@@ -0,0 +1,35 @@
+""" Contains the JSON decoders used by API functions to parse response bodies """
+import json
+from typing import Any, Callable
+
+JSONDecoder = Callable[[bytes], Any]
+
+
+def stdlib_decoder(content: bytes) -> Any:
+    """Decode a JSON body with the standard library"""
+    return json.loads(content)
+
+
+def default_decoder() -> JSONDecoder:
+    """Get the fastest JSON decoder available: orjson, then msgspec, then the standard library
+
+    All of them decode straight from the raw response bytes.
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        pass
+    else:
+        return orjson.loads
+
+    try:
+        import msgspec  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        pass
+    else:
+        return msgspec.json.Decoder().decode
+
+    return stdlib_decoder
+
+
+__all__ = ["JSONDecoder", "default_decoder", "stdlib_decoder"]
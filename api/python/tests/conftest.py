@@ -0,0 +1,22 @@
+"""Fixtures shared by the Airthings API SDK tests."""
+
+from typing import Any, Callable
+
+import pytest
+from fake_api import FakeAirthingsApi
+
+from airthings_sdk import Airthings
+
+AirthingsFactory = Callable[..., Airthings]
+
+
+@pytest.fixture(name="make_airthings")
+def fixture_make_airthings() -> AirthingsFactory:
+    """Return a factory of data handlers that talk to a fake API."""
+
+    def make(api: FakeAirthingsApi, **options: Any) -> Airthings:
+        options.setdefault("transport", api.transport())
+        options.setdefault("async_transport", api.async_transport())
+        return Airthings("client-id", "client-secret", is_metric=True, **options)
+
+    return make
@@ -0,0 +1,196 @@
+"""Tests of the token manager."""
+
+# The tests look into the refresh schedule, which is private.
+# pylint: disable=protected-access
+
+import asyncio
+import json
+import threading
+import time
+from typing import List
+
+import httpx
+import pytest
+
+from airthings_api_client import Client
+from airthings_sdk import auth
+from airthings_sdk.auth import TokenManager
+from airthings_sdk.const import AUTH_URL
+from airthings_sdk.types import AirthingsToken
+
+
+class FakeTokenEndpoint:
+    """Token endpoint that counts requests and fails the first few."""
+
+    def __init__(self, expires_in: int = 3600, failures: int = 0, latency: float = 0):
+        """Init fake token endpoint."""
+        self.expires_in = expires_in
+        self.failures = failures
+        self.latency = latency
+        self.requests = 0
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport for httpx clients."""
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a token request."""
+        assert request.url.path == "/v1/token"
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.requests <= self.failures:
+            return httpx.Response(500)
+        body = {"access_token": f"token-{self.requests}", "expires_in": self.expires_in}
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+
+class StopAfter:
+    """Stop event of a token manager that records the waits and stops after some."""
+
+    def __init__(self, waits: int):
+        """Init stop event."""
+        self.delays: List[float] = []
+        self._waits = waits
+
+    def wait(self, timeout: float) -> bool:
+        """Record a wait, telling to stop once there were enough."""
+        self.delays.append(timeout)
+        return len(self.delays) > self._waits
+
+    def set(self):
+        """Do nothing, the waits decide when to stop."""
+
+    def clear(self):
+        """Do nothing, the waits decide when to stop."""
+
+
+def make_manager(endpoint: FakeTokenEndpoint, **options) -> TokenManager:
+    """Return a token manager that talks to a fake token endpoint."""
+    client = Client(
+        base_url=AUTH_URL,
+        httpx_args={"transport": endpoint.transport()},
+    )
+    return TokenManager(
+        "client-id",
+        "client-secret",
+        auth_client=client,
+        token=AirthingsToken(),
+        on_refresh=lambda _: None,
+        **options,
+    )
+
+
+def test_single_flight_refresh_threads() -> None:
+    """Threads that all need a token share one token request."""
+    endpoint = FakeTokenEndpoint(latency=0.05)
+    manager = make_manager(endpoint)
+
+    threads = [threading.Thread(target=manager.ensure_valid) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert endpoint.requests == 1
+    assert manager.token.value == "token-1"
+
+
+def test_single_flight_refresh_async() -> None:
+    """Tasks that all need a token share one token request."""
+    endpoint = FakeTokenEndpoint()
+    manager = make_manager(endpoint)
+
+    async def run():
+        await asyncio.gather(*(manager.async_ensure_valid() for _ in range(10)))
+
+    asyncio.run(run())
+
+    assert endpoint.requests == 1
+    assert manager.token.value == "token-1"
+
+
+def test_refresh_delay() -> None:
+    """Refreshes are due ahead of expiry, but never spin on a short-lived token."""
+    manager = make_manager(FakeTokenEndpoint(), refresh_margin=120)
+
+    manager.token.set_token("token", 3600)
+    assert manager._next_refresh_delay() == pytest.approx(3480, abs=1)
+
+    # A lifetime within the margin waits for half of what is left.
+    manager.token.set_token("token", 100)
+    assert manager._next_refresh_delay() == pytest.approx(50, abs=1)
+
+    manager.token.set_token("token", 10)
+    assert manager._next_refresh_delay() == auth.RETRY_INTERVAL
+
+    assert [manager._next_refresh_delay(failures) for failures in (1, 2, 3)] == [
+        auth.RETRY_INTERVAL,
+        auth.RETRY_INTERVAL * 2,
+        auth.RETRY_INTERVAL * 4,
+    ]
+    assert manager._next_refresh_delay(100) == auth.MAX_RETRY_INTERVAL
+
+
+def test_background_refresh_schedule() -> None:
+    """The background refresh backs off after failures and resets on success."""
+    endpoint = FakeTokenEndpoint(expires_in=100, failures=2)
+    manager = make_manager(endpoint, refresh_margin=120)
+    stop_event = StopAfter(waits=4)
+    manager._stop_event = stop_event  # type: ignore[assignment]
+
+    manager.start_background_refresh()
+    manager.stop_background_refresh()
+
+    assert endpoint.requests == 4
+    assert stop_event.delays[:3] == [
+        auth.RETRY_INTERVAL,
+        auth.RETRY_INTERVAL,
+        auth.RETRY_INTERVAL * 2,
+    ]
+    # Back on schedule after the success: half of the 100 second lifetime.
+    assert stop_event.delays[3] == pytest.approx(50, abs=1)
+
+
+def test_background_refresh_does_not_spin() -> None:
+    """A token that lives shorter than the margin is not refreshed in a loop."""
+    endpoint = FakeTokenEndpoint(expires_in=100)
+    manager = make_manager(endpoint, refresh_margin=120)
+    manager.ensure_valid()
+
+    manager.start_background_refresh()
+    time.sleep(0.1)
+    manager.stop_background_refresh()
+
+    assert endpoint.requests == 1
+
+
+def test_stop_background_refresh() -> None:
+    """Stopping the background refresh ends its thread and task."""
+    manager = make_manager(FakeTokenEndpoint())
+
+    manager.start_background_refresh()
+    thread = manager._background_thread
+    assert thread is not None and thread.is_alive()
+    manager.stop_background_refresh()
+    assert not thread.is_alive()
+
+    async def run():
+        manager.async_start_background_refresh()
+        task = manager._background_task
+        assert task is not None
+        await manager.async_stop_background_refresh()
+        await asyncio.sleep(0)
+        return task
+
+    assert asyncio.run(run()).cancelled()
+
+
+def test_background_refresh_starts_on_first_check() -> None:
+    """With background_refresh, the first check of the token starts the refresh."""
+    manager = make_manager(FakeTokenEndpoint(), background_refresh=True)
+
+    manager.ensure_valid()
+    thread = manager._background_thread
+    assert thread is not None and thread.is_alive()
+    manager.stop_background_refresh()
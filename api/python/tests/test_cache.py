@@ -0,0 +1,105 @@
+"""Tests of the in-memory and disk caches."""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from airthings_api_client.models import DeviceResponse
+from airthings_sdk.cache import DiskCache, TTLCache
+from airthings_sdk.types import AirthingsChanges, AirthingsDevice, AirthingsSensor
+
+DEVICE = AirthingsDevice(
+    serial_number="0000000001",
+    type="VIEW_PLUS",
+    name="Living room",
+    home=None,
+    recorded="2024-05-01T12:00:00",
+    sensors=(AirthingsSensor("temp", 21.4, "c"), AirthingsSensor("battery", 80, "%")),
+)
+
+
+def test_ttl_cache_expiry() -> None:
+    """Entries expire ttl seconds after they were set."""
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(10, clock=lambda: now[0])
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    now[0] = 10
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_disabled() -> None:
+    """A ttl of zero caches nothing."""
+    cache: TTLCache[str, int] = TTLCache(0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_seed_without_ttl() -> None:
+    """A seeded entry is served once even with caching disabled."""
+    cache: TTLCache[str, int] = TTLCache(0)
+    cache.seed("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_invalidate() -> None:
+    """Entries can be dropped one by one or all at once."""
+    cache: TTLCache[str, int] = TTLCache(10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert (cache.get("a"), cache.get("b")) == (None, 2)
+    cache.invalidate()
+    assert cache.get("b") is None
+
+
+def test_disk_cache_round_trip(tmp_path: Path) -> None:
+    """The token, metadata and devices survive reopening the file."""
+    path = tmp_path / "airthings.db"
+    metadata = DeviceResponse(serial_number="0000000001", name="Living room")
+
+    cache = DiskCache(path, "client-id", "metric")
+    cache.save_token("token", 1234.5)
+    cache.save_metadata("account", {"0000000001": metadata})
+    cache.save_changes(AirthingsChanges(added={DEVICE.serial_number: DEVICE}))
+    cache.close()
+
+    cache = DiskCache(path, "client-id", "metric")
+    assert cache.load_token() == ("token", 1234.5)
+    assert cache.load_metadata() == {"0000000001": ("account", metadata)}
+    assert cache.load_devices() == {DEVICE.serial_number: DEVICE}
+
+    cache.save_changes(AirthingsChanges(removed={DEVICE.serial_number: DEVICE}))
+    assert cache.load_devices() == {}
+    cache.close()
+
+
+def test_disk_cache_cleared_for_other_owner(tmp_path: Path) -> None:
+    """A file opened with another client id or unit starts empty."""
+    path = tmp_path / "airthings.db"
+    cache = DiskCache(path, "client-id", "metric")
+    cache.save_token("token", 1234.5)
+    cache.close()
+
+    cache = DiskCache(path, "client-id", "imperial")
+    assert cache.load_token() is None
+    cache.close()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_disk_cache_owner_only(tmp_path: Path) -> None:
+    """The file holding the token is only accessible to its owner."""
+    created = tmp_path / "created.db"
+    existing = tmp_path / "existing.db"
+    existing.touch(mode=0o644)
+
+    for path in (created, existing):
+        DiskCache(path, "client-id", "metric").close()
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
@@ -0,0 +1,63 @@
+"""Tests of the responses of the generated API client."""
+
+from typing import Any, List
+
+import httpx
+import pytest
+from fake_api import FakeAirthingsApi
+
+from airthings_api_client import AuthenticatedClient
+from airthings_api_client.api.accounts import get_accounts_ids
+from airthings_api_client.types import RateLimit, Response
+from airthings_sdk import decoder
+from airthings_sdk.const import API_URL
+
+
+def make_client(
+    transport: httpx.BaseTransport, release_content: bool = False
+) -> AuthenticatedClient:
+    """Return an API client that sends its requests through a transport."""
+    return AuthenticatedClient(
+        base_url=API_URL,
+        token="token",
+        release_content=release_content,
+        httpx_args={"transport": transport},
+    )
+
+
+@pytest.mark.parametrize("release_content", [False, True])
+def test_rate_limit(release_content: bool) -> None:
+    """Every parsed response carries its rate limit, whether released or not."""
+    api = FakeAirthingsApi(10, rate_limit=100)
+    client = make_client(api.transport(), release_content)
+
+    responses: List[Response[Any]] = [
+        get_accounts_ids.sync_detailed(client=client),
+        decoder.sync_detailed("account-0", client=client),
+    ]
+
+    for number, response in enumerate(responses, start=1):
+        assert response.parsed is not None
+        assert response.rate_limit is not None
+        assert response.rate_limit.limit == 100
+        assert response.rate_limit.remaining == 100 - number
+        assert response.rate_limit.reset is not None
+        assert (response.content == b"") is release_content
+        assert (not response.headers) is release_content
+
+
+def test_release_content_keeps_unparsed_responses() -> None:
+    """A response that could not be parsed keeps its content and headers."""
+    headers = {"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "0"}
+    transport = httpx.MockTransport(
+        lambda _: httpx.Response(500, headers=headers, content=b"oops")
+    )
+    client = make_client(transport, release_content=True)
+    client.raise_on_unexpected_status = False
+
+    response = get_accounts_ids.sync_detailed(client=client)
+
+    assert response.parsed is None
+    assert response.content == b"oops"
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    assert response.rate_limit == RateLimit(limit=100, remaining=0)
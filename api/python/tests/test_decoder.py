@@ -0,0 +1,113 @@
+"""Tests of the fast decoder against the generated models."""
+
+import copy
+import json
+from typing import Any
+
+import pytest
+from common import sensors_item, sensors_page
+
+from airthings_api_client.models import DeviceResponse, SensorsResponse
+from airthings_sdk.decoder import LazySensorsPage, decode_device
+from airthings_sdk.types import AirthingsDevice
+
+DEVICE = DeviceResponse(
+    serial_number="0000000001", name="Living room", type="VIEW_PLUS", home="Home"
+)
+
+
+def _without(item: dict, key: str) -> dict:
+    """Return a copy of an item without a key."""
+    item = copy.deepcopy(item)
+    del item[key]
+    return item
+
+
+def _with(item: dict, key: str, value: Any) -> dict:
+    """Return a copy of an item with a key set to a value."""
+    item = copy.deepcopy(item)
+    item[key] = value
+    return item
+
+
+def _with_sensor(item: dict, **sensor: Any) -> dict:
+    """Return a copy of an item with its first sensor replaced."""
+    item = copy.deepcopy(item)
+    item["sensors"][0] = sensor
+    return item
+
+
+ITEM = sensors_item("0000000001", battery_percentage=80)
+
+ITEMS = {
+    "complete": ITEM,
+    "missing recorded": _without(ITEM, "recorded"),
+    "null recorded": _with(ITEM, "recorded", None),
+    "missing sensors": _without(ITEM, "sensors"),
+    "null sensors": _with(ITEM, "sensors", None),
+    "empty sensors": _with(ITEM, "sensors", []),
+    "null sensor": _with(ITEM, "sensors", [None, *ITEM["sensors"]]),
+    "missing value": _with_sensor(ITEM, sensorType="temp", unit="c"),
+    "null value": _with_sensor(ITEM, sensorType="temp", value=None, unit="c"),
+    "missing sensor type": _with_sensor(ITEM, value=21.4, unit="c"),
+    "missing unit": _with_sensor(ITEM, sensorType="temp", value=21.4),
+    "missing battery": _without(ITEM, "batteryPercentage"),
+    "null battery": _with(ITEM, "batteryPercentage", None),
+    "empty battery": _with(ITEM, "batteryPercentage", 0),
+    "extra fields": _with(ITEM, "firmware", "1.2.3"),
+}
+
+
+def _from_models(item: dict) -> AirthingsDevice:
+    """Map an item through the generated models, as the SDK does by default."""
+    return AirthingsDevice.from_response(DEVICE, SensorsResponse.from_dict(item))
+
+
+@pytest.mark.parametrize("item", ITEMS.values(), ids=ITEMS.keys())
+def test_decode_device_matches_models(item: dict) -> None:
+    """The fast decoder maps an item to the same device as the models."""
+    assert decode_device(DEVICE, item) == _from_models(item)
+
+
+def test_missing_fields_are_none() -> None:
+    """Fields missing from an item are None on both paths, as null ones."""
+    for decode in (decode_device, lambda _, item: _from_models(item)):
+        assert decode(DEVICE, ITEMS["missing recorded"]).recorded is None
+        assert decode(DEVICE, ITEMS["missing value"]).sensors[0].value is None
+        assert decode(DEVICE, ITEMS["missing unit"]).sensors[0].unit is None
+
+
+def test_battery_sensor() -> None:
+    """A battery percentage becomes a battery sensor, a null one none."""
+    assert decode_device(DEVICE, ITEM).sensor("battery") is not None
+    assert decode_device(DEVICE, ITEMS["null battery"]).sensor("battery") is None
+    assert decode_device(DEVICE, ITEMS["empty battery"]).sensor("battery") is not None
+
+
+def test_lazy_page_parses_items_on_access() -> None:
+    """A lazy page builds the same items as the models, one at a time."""
+    page = LazySensorsPage.from_dict(
+        {"results": [copy.deepcopy(item) for item in ITEMS.values()], "hasNext": False}
+    )
+
+    assert len(page) == len(ITEMS)
+    assert not any(page._parsed)  # pylint: disable=protected-access
+    assert (
+        page[1].to_dict()
+        == SensorsResponse.from_dict(ITEMS["missing recorded"]).to_dict()
+    )
+    assert page[-1].additional_properties == {"firmware": "1.2.3"}
+    assert [item.to_dict() for item in page] == [
+        SensorsResponse.from_dict(item).to_dict() for item in ITEMS.values()
+    ]
+    assert page.get("0000000001") is page[0]
+    assert page.get("missing") is None
+
+
+def test_lazy_page_from_synthetic_page() -> None:
+    """A lazy page of a full synthetic page knows its serial numbers."""
+    content = sensors_page(size=10)
+    page = LazySensorsPage.from_dict(json.loads(content))
+
+    assert len(list(page.serial_numbers())) == 10
+    assert page.has_next is False
@@ -0,0 +1,116 @@
+"""Tests of the sensor history."""
+
+from typing import List
+
+import httpx
+import pytest
+from conftest import AirthingsFactory
+from fake_api import FakeAirthingsApi
+
+from airthings_sdk.history import RingBuffer, SensorHistory
+from airthings_sdk.types import AirthingsDevice, AirthingsSensor
+
+
+def make_device(serial_number: str, recorded: str, temp: float) -> AirthingsDevice:
+    """Build a device with a temperature sensor."""
+    return AirthingsDevice(
+        serial_number=serial_number,
+        type="WAVE_PLUS",
+        name="Living room",
+        home=None,
+        recorded=recorded,
+        sensors=(AirthingsSensor(sensor_type="temp", value=temp, unit="c"),),
+    )
+
+
+def test_ring_buffer_wraps_around() -> None:
+    """A full buffer overwrites its oldest readings."""
+    buffer = RingBuffer(3)
+    for timestamp in range(1, 6):
+        assert buffer.append(timestamp, timestamp * 10)
+
+    assert len(buffer) == 3
+    assert list(buffer) == [(3, 30), (4, 40), (5, 50)]
+    assert buffer.latest() == (5, 50)
+
+
+def test_ring_buffer_between() -> None:
+    """Range queries include both bounds, also across the wraparound."""
+    buffer = RingBuffer(4)
+    for timestamp in range(1, 7):
+        buffer.append(timestamp, timestamp)
+
+    assert buffer.between(4, 5) == [(4, 4), (5, 5)]
+    assert buffer.between(3.5, 5.5) == [(4, 4), (5, 5)]
+    assert buffer.between(start=5) == [(5, 5), (6, 6)]
+    assert buffer.between(end=3) == [(3, 3)]
+    assert not buffer.between(7, 8)
+    assert not buffer.between(1, 2)
+
+
+def test_ring_buffer_ignores_older_readings() -> None:
+    """Readings that are not newer than the latest are dropped."""
+    buffer = RingBuffer(3)
+    assert buffer.latest() is None
+    assert buffer.append(10, 1)
+
+    assert not buffer.append(10, 2)
+    assert not buffer.append(5, 3)
+    assert list(buffer) == [(10, 1)]
+
+
+def test_capacity_must_be_positive() -> None:
+    """A buffer or history without room for a reading is rejected."""
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+    with pytest.raises(ValueError):
+        SensorHistory(0)
+
+
+def test_sensor_history_records_new_readings() -> None:
+    """A device is recorded once per recorded time."""
+    history = SensorHistory(10)
+
+    history.record([make_device("1", "2024-05-01T12:00:00", 21.0)])
+    history.record([make_device("1", "2024-05-01T12:00:00", 22.0)])
+    history.record([make_device("1", "2024-05-01T12:05:00", 23.0)])
+
+    assert history.sensor_types("1") == ["temp"]
+    assert [value for _, value in history.readings("1", "temp")] == [21.0, 23.0]
+    assert history.latest("1", "temp") == history.readings("1", "temp")[-1]
+    assert not history.readings("2", "temp")
+    assert history.latest("1", "co2") is None
+
+
+def test_history_forgets_removed_devices(make_airthings: AirthingsFactory) -> None:
+    """Devices that disappear from the API lose their history."""
+    fleets: List[FakeAirthingsApi] = [FakeAirthingsApi(3)]
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        return fleets[-1].handle(request)
+
+    airthings = make_airthings(
+        fleets[0], transport=httpx.MockTransport(handle), history_capacity=5
+    )
+
+    airthings.update_devices()
+    history = airthings.history
+    assert history is not None
+    assert len(history) == 3
+    assert history.sensor_types("0000000002")
+
+    fleets.append(FakeAirthingsApi(2))
+    airthings.update_devices()
+
+    assert list(airthings.changes.removed) == ["0000000002"]
+    assert len(history) == 2
+    assert not history.sensor_types("0000000002")
+    assert history.readings("0000000000", "temp")
+
+
+def test_history_disabled(make_airthings: AirthingsFactory) -> None:
+    """Without a history_capacity, no history is kept."""
+    airthings = make_airthings(FakeAirthingsApi(3))
+    airthings.update_devices()
+
+    assert airthings.history is None
@@ -0,0 +1,128 @@
+"""Tests of the instrumentation hooks."""
+
+import asyncio
+from typing import Any, List
+
+import httpx
+from conftest import AirthingsFactory
+from fake_api import FakeAirthingsApi
+
+from airthings_sdk.hooks import AirthingsHooks, MappingEvent, RequestEvent, UpdateEvent
+
+
+class RecordingHooks(AirthingsHooks):
+    """Hooks that keep every event they receive."""
+
+    def __init__(self) -> None:
+        """Init recording hooks."""
+        self.events: List[Any] = []
+
+    def on_request(self, event: RequestEvent):
+        """Keep a request event."""
+        self.events.append(event)
+
+    def on_mapping(self, event: MappingEvent):
+        """Keep a mapping event."""
+        self.events.append(event)
+
+    def on_update(self, event: UpdateEvent):
+        """Keep an update event."""
+        self.events.append(event)
+
+    def requests(self) -> List[RequestEvent]:
+        """Return the request events."""
+        return [event for event in self.events if isinstance(event, RequestEvent)]
+
+
+def test_update_events(make_airthings: AirthingsFactory) -> None:
+    """An update reports every request, every mapped page and itself."""
+    hooks = RecordingHooks()
+    airthings = make_airthings(FakeAirthingsApi(60), hooks=hooks)
+
+    airthings.update_devices()
+
+    assert [(event.endpoint, event.path) for event in hooks.requests()] == [
+        ("token", "/v1/token"),
+        ("get_accounts_ids", "/v1/accounts"),
+        ("get_devices", "/v1/accounts/account-0/devices"),
+        ("get_multiple_sensors", "/v1/accounts/account-0/sensors"),
+        ("get_multiple_sensors", "/v1/accounts/account-0/sensors"),
+    ]
+    assert [event.page_number for event in hooks.requests()][-2:] == [1, 2]
+    assert all(event.status_code == 200 for event in hooks.requests())
+    assert all(event.response_bytes > 0 for event in hooks.requests())
+    assert hooks.requests()[-1].rate_limit is not None
+    assert [
+        event.devices for event in hooks.events if isinstance(event, MappingEvent)
+    ] == [50, 10]
+    assert hooks.events[-1] == UpdateEvent(
+        devices=60,
+        added=60,
+        updated=0,
+        removed=0,
+        partial=False,
+        failed_accounts=0,
+        duration=hooks.events[-1].duration,
+    )
+
+
+def test_warm_up_events(make_airthings: AirthingsFactory) -> None:
+    """Warm-up requests to both hosts are reported."""
+    hooks = RecordingHooks()
+    api = FakeAirthingsApi(1)
+    airthings = make_airthings(api, hooks=hooks)
+
+    airthings.warm_up()
+    asyncio.run(airthings.async_warm_up(connections=2))
+
+    assert [event.endpoint for event in hooks.requests()] == ["get_health"] * 5
+    assert all(event.status_code == 404 for event in hooks.requests())
+
+
+def test_streamed_page_events(make_airthings: AirthingsFactory) -> None:
+    """Streamed sensors pages are reported, rate limited attempts included."""
+    hooks = RecordingHooks()
+    api = FakeAirthingsApi(75)
+    limited: List[httpx.Request] = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/sensors") and not limited:
+            limited.append(request)
+            return httpx.Response(
+                429, headers={"Retry-After": "0"}, json={"message": "Slow down"}
+            )
+        return await api.async_handle(request)
+
+    airthings = make_airthings(
+        api, async_transport=httpx.MockTransport(handle), hooks=hooks
+    )
+
+    async def collect() -> list:
+        return [sensor async for sensor in airthings.aiter_sensors("account-0")]
+
+    assert len(asyncio.run(collect())) == 75
+    assert [
+        (event.endpoint, event.status_code, event.page_number, event.attempt)
+        for event in hooks.requests()
+    ] == [
+        ("token", 200, None, 0),
+        ("get_multiple_sensors", 429, 1, 0),
+        ("get_multiple_sensors", 200, 1, 1),
+        ("get_multiple_sensors", 200, 2, 0),
+    ]
+    assert all(event.response_bytes > 0 for event in hooks.requests())
+
+
+def test_failing_hook_is_ignored(make_airthings: AirthingsFactory) -> None:
+    """An exception raised by a hook does not fail the update."""
+
+    class FailingHooks(AirthingsHooks):
+        """Hooks that fail on every request."""
+
+        def on_request(self, event: RequestEvent):
+            """Fail."""
+            raise RuntimeError("broken hook")
+
+    airthings = make_airthings(FakeAirthingsApi(10), hooks=FailingHooks())
+
+    assert len(airthings.update_devices()) == 10
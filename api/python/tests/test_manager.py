@@ -0,0 +1,88 @@
+"""Tests of the multi-tenant manager."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fake_api import FakeAirthingsApi
+
+from airthings_sdk import AirthingsManager
+from airthings_sdk.errors import UnexpectedStatusError
+
+
+def make_manager(monkeypatch: pytest.MonkeyPatch, **options) -> AirthingsManager:
+    """Return a manager of two tenants, one of which cannot authenticate."""
+    api = FakeAirthingsApi(20)
+
+    def refuse(request: httpx.Request) -> bool:
+        return request.url.path == "/v1/token" and b"client_id=broken" in (
+            request.content
+        )
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401) if refuse(request) else api.handle(request)
+
+    async def async_handle(request: httpx.Request) -> httpx.Response:
+        return (
+            httpx.Response(401) if refuse(request) else await api.async_handle(request)
+        )
+
+    monkeypatch.setattr(httpx, "HTTPTransport", lambda **_: httpx.MockTransport(handle))
+    monkeypatch.setattr(
+        httpx, "AsyncHTTPTransport", lambda **_: httpx.MockTransport(async_handle)
+    )
+
+    manager = AirthingsManager(**options)
+    manager.add("working", "working", "secret")
+    manager.add("broken", "broken", "secret")
+    return manager
+
+
+@pytest.fixture(name="manager")
+def fixture_manager(monkeypatch: pytest.MonkeyPatch) -> AirthingsManager:
+    """Return a manager of two tenants, one of which cannot authenticate."""
+    return make_manager(monkeypatch)
+
+
+def test_update_devices_isolates_tenants(manager: AirthingsManager) -> None:
+    """A failing tenant does not stop the update of the others."""
+    devices = manager.update_devices()
+
+    assert len(devices["working"]) == 20
+    assert devices["broken"] == {}
+    assert list(manager.errors) == ["broken"]
+    assert isinstance(manager.errors["broken"], UnexpectedStatusError)
+
+
+def test_async_update_devices_isolates_tenants(manager: AirthingsManager) -> None:
+    """A failing tenant does not stop the async update of the others."""
+
+    async def update():
+        async with manager:
+            return await manager.async_update_devices()
+
+    devices = asyncio.run(update())
+
+    assert len(devices["working"]) == 20
+    assert devices["broken"] == {}
+    assert list(manager.errors) == ["broken"]
+
+
+def test_aclose_stops_token_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    """aclose stops background token refresh threads."""
+    manager = make_manager(monkeypatch, background_token_refresh=True)
+    manager["working"].verify_auth()
+    assert [
+        thread
+        for thread in threading.enumerate()
+        if thread.name == "airthings-token-refresh"
+    ]
+
+    asyncio.run(manager.aclose())
+
+    assert not [
+        thread
+        for thread in threading.enumerate()
+        if thread.name == "airthings-token-refresh"
+    ]
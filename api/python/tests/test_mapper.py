@@ -0,0 +1,365 @@
+"""Tests of the Airthings data handler against a fake API."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+import httpx
+import pytest
+from common import sensors_item
+from conftest import AirthingsFactory
+from fake_api import FakeAirthingsApi
+
+from airthings_sdk import Airthings
+from airthings_sdk.errors import ApiError, UnexpectedStatusError
+from airthings_sdk.retry import RetryPolicy
+
+AsyncHandler = Callable[[httpx.Request], Coroutine[Any, Any, httpx.Response]]
+
+
+def _is_sensors(request: httpx.Request, page_number: int = 0) -> bool:
+    """Tell whether a request is for sensors, of a given page if not 0."""
+    return request.url.path.endswith("/sensors") and page_number in (
+        0,
+        int(request.url.params.get("pageNumber", "1")),
+    )
+
+
+def _expected_serials(devices: int) -> set[str]:
+    """Return the serial numbers of a fake fleet."""
+    return {f"{index:010d}" for index in range(devices)}
+
+
+def test_update_devices(make_airthings: AirthingsFactory) -> None:
+    """A sync update fetches every device of every account, page by page."""
+    api = FakeAirthingsApi(120, accounts=2, page_size=50)
+    airthings = make_airthings(api)
+
+    devices = airthings.update_devices()
+
+    assert set(devices) == _expected_serials(120)
+    assert devices["0000000001"].sensor("temp") is not None
+    # Token, accounts, two device lists and two sensors pages per account.
+    assert api.requests == 8
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"parallel_pages": True}, {"fast_decode": True}, {"lazy_pages": True}],
+    ids=["sequential", "parallel pages", "fast decode", "lazy pages"],
+)
+def test_async_update_matches_sync(
+    make_airthings: AirthingsFactory, options: dict
+) -> None:
+    """Every async update path gives the devices of a sync update."""
+    api = FakeAirthingsApi(330, accounts=3)
+    expected = make_airthings(api).update_devices()
+
+    devices = asyncio.run(make_airthings(api, **options).async_update_devices())
+
+    assert devices == expected
+
+
+def test_unknown_device_refreshes_metadata(make_airthings: AirthingsFactory) -> None:
+    """A sensors page with an unknown device refreshes its account once."""
+    api = FakeAirthingsApi(10)
+    paths: list[str] = []
+    installed = False
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        response = api.handle(request)
+        if not installed or request.url.path == "/v1/token":
+            return response
+        body = json.loads(response.content)
+        if request.url.path.endswith("/devices"):
+            body["devices"].append(
+                {"serialNumber": "9999999999", "name": "New", "type": "VIEW_PLUS"}
+            )
+        elif _is_sensors(request):
+            body["results"].append(sensors_item("9999999999"))
+        return httpx.Response(response.status_code, json=body)
+
+    airthings = make_airthings(
+        api, transport=httpx.MockTransport(handle), metadata_ttl=3600
+    )
+    airthings.update_devices()
+    installed = True
+    paths.clear()
+
+    assert "9999999999" in airthings.update_devices()
+    assert paths == [
+        "/v1/accounts/account-0/sensors",
+        "/v1/accounts/account-0/devices",
+    ]
+
+    paths.clear()
+    airthings.update_devices()
+    assert paths == ["/v1/accounts/account-0/sensors"]
+
+
+def test_invalidate_metadata(make_airthings: AirthingsFactory) -> None:
+    """Invalidated metadata is fetched again, of one account or of all."""
+    api = FakeAirthingsApi(20, accounts=2)
+    paths: list[str] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if not _is_sensors(request):
+            paths.append(request.url.path)
+        return api.handle(request)
+
+    airthings = make_airthings(
+        api, transport=httpx.MockTransport(handle), metadata_ttl=3600
+    )
+    airthings.update_devices()
+
+    paths.clear()
+    airthings.invalidate_metadata("account-1")
+    airthings.update_devices()
+    assert paths == ["/v1/accounts/account-1/devices"]
+
+    paths.clear()
+    airthings.invalidate_metadata()
+    airthings.update_devices()
+    assert paths == [
+        "/v1/accounts",
+        "/v1/accounts/account-0/devices",
+        "/v1/accounts/account-1/devices",
+    ]
+
+
+def test_targeted_update(make_airthings: AirthingsFactory) -> None:
+    """A targeted update fetches only the given devices and merges them."""
+    api = FakeAirthingsApi(100, accounts=2, page_size=20)
+    airthings = make_airthings(api)
+    airthings.update_devices()
+
+    devices = airthings.update_devices(["0000000003", "0000000004"])
+
+    assert len(devices) == 100
+    assert set(airthings.changes.updated) <= {"0000000003", "0000000004"}
+
+
+def test_max_concurrency(make_airthings: AirthingsFactory) -> None:
+    """No more than max_concurrency requests are in flight at once."""
+    api = FakeAirthingsApi(500, accounts=2, latency=0.01)
+    in_flight = peak = 0
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await api.async_handle(request)
+        finally:
+            in_flight -= 1
+
+    airthings = make_airthings(
+        api,
+        async_transport=httpx.MockTransport(handle),
+        max_concurrency=3,
+        parallel_pages=True,
+    )
+    devices = asyncio.run(airthings.async_update_devices())
+
+    assert len(devices) == 500
+    assert peak == 3
+
+
+def _rate_limit_once(
+    api: FakeAirthingsApi,
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Return a handler that rate limits the first sensors request."""
+    limited: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if _is_sensors(request) and not limited:
+            limited.append(request)
+            return httpx.Response(
+                429, headers={"Retry-After": "0"}, json={"message": "Slow down"}
+            )
+        return api.handle(request)
+
+    return handle
+
+
+def test_rate_limited_request_retried(make_airthings: AirthingsFactory) -> None:
+    """A rate limited request is sent again once the API allows it."""
+    api = FakeAirthingsApi(10)
+    airthings = make_airthings(
+        api, transport=httpx.MockTransport(_rate_limit_once(api))
+    )
+
+    assert len(airthings.update_devices()) == 10
+
+
+def test_rate_limit_retries_exhausted(make_airthings: AirthingsFactory) -> None:
+    """A request still rate limited after the retries fails."""
+    api = FakeAirthingsApi(10)
+    airthings = make_airthings(
+        api,
+        transport=httpx.MockTransport(_rate_limit_once(api)),
+        max_rate_limit_retries=0,
+    )
+
+    with pytest.raises(ApiError):
+        airthings.update_devices()
+
+
+def _fail_once(api: FakeAirthingsApi, status_code: int) -> AsyncHandler:
+    """Return a handler that fails the first sensors request."""
+    failed: list[httpx.Request] = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if _is_sensors(request) and not failed:
+            failed.append(request)
+            return httpx.Response(status_code)
+        return await api.async_handle(request)
+
+    return handle
+
+
+def test_transient_failure_retried(make_airthings: AirthingsFactory) -> None:
+    """A server error is retried with a retry policy."""
+    api = FakeAirthingsApi(10)
+    airthings = make_airthings(
+        api,
+        async_transport=httpx.MockTransport(_fail_once(api, 503)),
+        retry_policy=RetryPolicy(backoff=0.0),
+    )
+
+    assert len(asyncio.run(airthings.async_update_devices())) == 10
+
+
+def test_transient_failure_without_policy(make_airthings: AirthingsFactory) -> None:
+    """Without a retry policy, a server error fails the update."""
+    api = FakeAirthingsApi(10)
+    airthings = make_airthings(
+        api, async_transport=httpx.MockTransport(_fail_once(api, 503))
+    )
+
+    with pytest.raises(UnexpectedStatusError):
+        asyncio.run(airthings.async_update_devices())
+
+
+def test_failed_account_keeps_devices(make_airthings: AirthingsFactory) -> None:
+    """The devices of an account that fails are kept as they were."""
+    api = FakeAirthingsApi(20, accounts=2)
+    broken = False
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if broken and "/account-1/" in request.url.path:
+            return httpx.Response(500)
+        return api.handle(request)
+
+    airthings = make_airthings(api, transport=httpx.MockTransport(handle))
+    before = airthings.update_devices()
+    broken = True
+
+    after = airthings.update_devices()
+
+    assert after == before
+    assert list(airthings.errors) == ["account-1"]
+
+
+def test_parallel_page_failure_stops_other_pages(
+    make_airthings: AirthingsFactory,
+) -> None:
+    """When a page fails, the pages still in flight are cancelled."""
+    api = FakeAirthingsApi(500)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if _is_sensors(request, page_number=3):
+            return httpx.Response(500)
+        if _is_sensors(request) and not _is_sensors(request, page_number=1):
+            await asyncio.sleep(0.05)
+        return await api.async_handle(request)
+
+    async def update(airthings: Airthings) -> set[asyncio.Task]:
+        with pytest.raises(UnexpectedStatusError):
+            await airthings.async_update_devices()
+        return asyncio.all_tasks() - {asyncio.current_task()}  # type: ignore[operator]
+
+    airthings = make_airthings(
+        api, async_transport=httpx.MockTransport(handle), parallel_pages=True
+    )
+
+    assert not asyncio.run(update(airthings))
+
+
+def test_aiter_sensors(make_airthings: AirthingsFactory) -> None:
+    """Streamed sensors of an account are the sensors of all its pages."""
+    api = FakeAirthingsApi(75, page_size=20)
+    airthings = make_airthings(api)
+
+    async def collect() -> list:
+        return [sensor async for sensor in airthings.aiter_sensors("account-0")]
+
+    sensors = asyncio.run(collect())
+
+    assert {sensor.serial_number for sensor in sensors} == _expected_serials(75)
+    assert [sensor.to_dict() for sensor in sensors] == [
+        sensor.to_dict()
+        for page in airthings.iter_sensor_pages("account-0")
+        for sensor in page
+    ]
+
+
+def test_unknown_option() -> None:
+    """An option the data handler does not know is rejected."""
+    with pytest.raises(TypeError, match="max_concurency"):
+        Airthings("client-id", "client-secret", True, max_concurency=2)  # type: ignore[call-arg]
+
+
+def test_web_session_is_not_modified() -> None:
+    """Data handlers sharing a web_session each send their own token."""
+    api = FakeAirthingsApi(10)
+    authorizations = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        authorizations.append((request.url.path, request.headers.get("Authorization")))
+        response = await api.async_handle(request)
+        if request.url.path == "/v1/token":
+            client_id = httpx.QueryParams(request.content.decode())["client_id"]
+            response = httpx.Response(
+                200, json={"access_token": client_id, "expires_in": 3600}
+            )
+        return response
+
+    async def update():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handle)) as session:
+            for client_id in ("first", "second", "first"):
+                await Airthings(
+                    client_id, "secret", True, session
+                ).async_update_devices()
+            return session.headers.get("Authorization")
+
+    assert asyncio.run(update()) is None
+    assert ("/v1/token", None) in authorizations
+    assert {
+        authorization for path, authorization in authorizations if path != "/v1/token"
+    } == {"Bearer first", "Bearer second"}
+
+
+def test_warm_start_from_disk_cache(
+    make_airthings: AirthingsFactory, tmp_path: Path
+) -> None:
+    """A new data handler serves cached devices and skips cached metadata."""
+    api = FakeAirthingsApi(60)
+    airthings = make_airthings(api, cache_path=tmp_path / "airthings.db")
+    devices = airthings.update_devices()
+    airthings.close()
+    requests = api.requests
+
+    airthings = make_airthings(api, cache_path=tmp_path / "airthings.db")
+    assert airthings.devices == devices
+
+    airthings.update_devices()
+    # Only the two sensors pages: the token and metadata come from the cache.
+    assert api.requests - requests == 2
+
+    airthings.update_devices()
+    # Without a metadata_ttl, later updates fetch the metadata again.
+    assert api.requests - requests == 2 + 4
+    airthings.close()
@@ -0,0 +1,14 @@
+"""Tests of the generated models package."""
+
+import pytest
+
+from airthings_api_client import models
+
+
+def test_deprecated_model_alias() -> None:
+    """A renamed model is still available under its old name, with a warning."""
+    with pytest.warns(DeprecationWarning, match="SensorResponseType0"):
+        alias = models.SensorResponseType0
+
+    assert alias is models.SensorResponse
+    assert "SensorResponseType0" not in models.__all__
@@ -0,0 +1,94 @@
+"""Tests of rate limit tracking and pacing."""
+
+import pytest
+
+from airthings_sdk.ratelimit import RateLimiter, RateLimitState, retry_after
+
+NOW = 1_700_000_000.0
+
+
+@pytest.mark.parametrize(
+    "reset",
+    [str(int(NOW + 60)), "60", "2023-11-14T22:14:20Z", "Tue, 14 Nov 2023 22:14:20 GMT"],
+    ids=["epoch", "seconds", "iso", "http date"],
+)
+def test_state_from_headers(reset: str) -> None:
+    """The reset time is understood in any of the formats the API may use."""
+    state = RateLimitState.from_headers(
+        {
+            "X-RateLimit-Limit": "120",
+            "X-RateLimit-Remaining": "7",
+            "X-RateLimit-Reset": reset,
+        },
+        now=NOW,
+    )
+
+    assert state == RateLimitState(limit=120, remaining=7, reset=NOW + 60)
+
+
+def test_state_without_headers() -> None:
+    """Responses without rate limit headers have no state."""
+    assert RateLimitState.from_headers({}, now=NOW) is None
+    assert RateLimitState.from_headers({"X-RateLimit-Remaining": "x"}, now=NOW) is None
+
+
+def test_retry_after() -> None:
+    """Retry-After wins over the reset time, which is used without it."""
+    assert retry_after({"Retry-After": "5", "X-RateLimit-Reset": "60"}, now=NOW) == 5
+    assert retry_after({"X-RateLimit-Retry-After": "3"}, now=NOW) == 3
+    assert (
+        retry_after({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "60"}, now=NOW)
+        == 60
+    )
+    assert retry_after({}, now=NOW) == 0
+
+
+def test_limiter_unthrottled_above_threshold() -> None:
+    """Requests go out at once while plenty of budget is left."""
+    limiter = RateLimiter(clock=lambda: NOW)
+    limiter.update(
+        {
+            "X-RateLimit-Limit": "100",
+            "X-RateLimit-Remaining": "90",
+            "X-RateLimit-Reset": "60",
+        }
+    )
+
+    assert [limiter.acquire() for _ in range(5)] == [0.0] * 5
+
+
+def test_limiter_paces_low_budget() -> None:
+    """Below the threshold, the remaining requests are spread over the window."""
+    limiter = RateLimiter(clock=lambda: NOW)
+    limiter.update(
+        {
+            "X-RateLimit-Limit": "100",
+            "X-RateLimit-Remaining": "10",
+            "X-RateLimit-Reset": "60",
+        }
+    )
+
+    delays = [limiter.acquire() for _ in range(3)]
+
+    assert delays[0] == 0.0
+    assert delays[1] == pytest.approx(6.0)
+    assert delays[2] > delays[1]
+
+
+def test_limiter_waits_for_reset_when_spent() -> None:
+    """With no budget left, nothing goes out before the window resets."""
+    limiter = RateLimiter(clock=lambda: NOW)
+    limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"})
+
+    assert limiter.acquire() == pytest.approx(30.0)
+
+
+def test_limiter_defer() -> None:
+    """A deferral holds back the next request."""
+    now = [NOW]
+    limiter = RateLimiter(clock=lambda: now[0])
+    limiter.defer(10)
+
+    assert limiter.acquire() == pytest.approx(10.0)
+    now[0] += 20
+    assert limiter.acquire() == 0.0
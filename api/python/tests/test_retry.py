@@ -0,0 +1,85 @@
+"""Tests of retry policies and circuit breakers."""
+
+import httpx
+import pytest
+
+from airthings_sdk.ratelimit import RateLimiter
+from airthings_sdk.retry import Attempts, CircuitBreaker, RetryHandler, RetryPolicy
+
+
+def test_policy_backoff() -> None:
+    """Without jitter, the delay doubles up to the cap."""
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0, jitter=0.0)
+
+    assert [policy.delay(retries) for retries in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_policy_jitter_and_retry_after() -> None:
+    """Jitter only shortens the delay, which never undercuts Retry-After."""
+    policy = RetryPolicy(backoff=1.0, jitter=1.0)
+
+    assert all(0 <= policy.delay(2) <= 4 for _ in range(100))
+    assert policy.delay(0, retry_after=10.0) == 10.0
+
+
+@pytest.mark.parametrize("options", [{"max_retries": -1}, {"jitter": 2.0}])
+def test_policy_validation(options: dict) -> None:
+    """Invalid policies are refused."""
+    with pytest.raises(ValueError):
+        RetryPolicy(**options)
+
+
+def test_circuit_breaker() -> None:
+    """The circuit opens at the threshold and lets one trial through later."""
+    now = [0.0]
+    breaker = CircuitBreaker(2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 11
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial at a time.
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 22
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.failures == 0
+
+
+def test_retry_handler() -> None:
+    """Rate limited and failed attempts are counted against their own limits."""
+    handler = RetryHandler(
+        RateLimiter(),
+        max_rate_limit_retries=1,
+        policy=RetryPolicy(max_retries=1, backoff=1.0, jitter=0.0),
+    )
+    attempts = Attempts()
+    rate_limited = httpx.Response(429, headers={"Retry-After": "0"})
+    failed = httpx.Response(503)
+
+    assert handler.retry_delay(attempts, rate_limited) == 0.0
+    assert handler.retry_delay(attempts, failed) == 1.0
+    assert attempts == Attempts(rate_limited=1, failed=1)
+    assert handler.retry_delay(attempts, rate_limited) is None
+    assert handler.retry_delay(attempts, error=httpx.ConnectError("down")) is None
+    assert handler.retry_delay(attempts, httpx.Response(404)) is None
+    assert attempts.total == 2
+
+
+def test_retry_handler_circuits() -> None:
+    """Accounts are only skipped with a failure threshold."""
+    handler = RetryHandler(RateLimiter(), 0, failure_threshold=1)
+    handler.account_failed("account")
+    assert not handler.account_allowed("account")
+    assert handler.account_allowed("other")
+
+    handler = RetryHandler(RateLimiter(), 0)
+    handler.account_failed("account")
+    assert handler.account_allowed("account")
@@ -0,0 +1,188 @@
+"""Tests of the adaptive poll scheduler."""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, cast
+
+import pytest
+
+from airthings_sdk import Airthings
+from airthings_sdk.scheduler import PollScheduler
+from airthings_sdk.types import AirthingsDevice
+
+T0 = 1_700_000_000.0
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, now: float = T0):
+        """Init fake clock."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def advance_to(self, when: float):
+        """Move the clock forward to a given time, never back."""
+        self.now = max(self.now, when)
+
+
+class FakeAirthings:
+    """Data handler whose devices have the recorded times a test sets."""
+
+    def __init__(self):
+        """Init fake data handler."""
+        self.recorded: Dict[str, float] = {}
+        self.devices: Dict[str, AirthingsDevice] = {}
+        self.updates: List[Optional[List[str]]] = []
+
+    def update_devices(
+        self, serial_numbers: Optional[Iterable[str]] = None
+    ) -> Dict[str, AirthingsDevice]:
+        """Fetch the given devices, or all of them, recording the update."""
+        selected = None if serial_numbers is None else list(serial_numbers)
+        self.updates.append(selected)
+
+        fetched = {
+            serial_number: AirthingsDevice(
+                serial_number=serial_number,
+                type="WAVE_PLUS",
+                name=serial_number,
+                home=None,
+                recorded=datetime.fromtimestamp(recorded, timezone.utc).isoformat(),
+            )
+            for serial_number, recorded in self.recorded.items()
+            if selected is None or serial_number in selected
+        }
+        self.devices = fetched if selected is None else {**self.devices, **fetched}
+        return self.devices
+
+    async def async_update_devices(
+        self, serial_numbers: Optional[Iterable[str]] = None
+    ) -> Dict[str, AirthingsDevice]:
+        """Fetch the given devices, or all of them, recording the update."""
+        return self.update_devices(serial_numbers)
+
+
+def make_scheduler(
+    airthings: FakeAirthings, clock: FakeClock, **options
+) -> PollScheduler:
+    """Return a scheduler polling a fake data handler on a fake clock."""
+    options.setdefault("default_interval", 300)
+    options.setdefault("grace", 30)
+    return PollScheduler(cast(Airthings, airthings), clock=clock, **options)
+
+
+def sample(
+    scheduler: PollScheduler, airthings: FakeAirthings, clock: FakeClock, at: float
+):
+    """Let device "a" take a sample at a time, then poll once it is due."""
+    airthings.recorded["a"] = at
+    clock.advance_to(max(at, scheduler.next_due()))
+    scheduler.poll()
+
+
+def test_learns_sample_interval() -> None:
+    """The interval is learned from successive recorded times."""
+    clock = FakeClock()
+    airthings = FakeAirthings()
+    scheduler = make_scheduler(airthings, clock)
+
+    sample(scheduler, airthings, clock, T0)
+    assert airthings.updates == [None]
+    assert scheduler.interval("a") is None
+    # Until an interval is learned, the default one is assumed.
+    assert scheduler.next_due() == T0 + 300 + 30
+
+    clock.now = T0 + 100
+    scheduler.poll()
+    assert airthings.updates == [None]
+
+    sample(scheduler, airthings, clock, T0 + 200)
+    assert airthings.updates[-1] == ["a"]
+    assert scheduler.interval("a") == 200
+    assert scheduler.next_due() == T0 + 200 + 200 + 30
+
+    sample(scheduler, airthings, clock, T0 + 400)
+    assert scheduler.interval("a") == 200
+
+
+def test_missed_samples_are_damped() -> None:
+    """A gap of missed samples moves the interval less than a slower cycle."""
+    clock = FakeClock()
+    airthings = FakeAirthings()
+    scheduler = make_scheduler(airthings, clock)
+    sample(scheduler, airthings, clock, T0)
+    sample(scheduler, airthings, clock, T0 + 200)
+
+    sample(scheduler, airthings, clock, T0 + 450)
+    assert scheduler.interval("a") == pytest.approx(200 + 0.3 * 50)
+
+    sample(scheduler, airthings, clock, T0 + 450 + 860)
+    assert scheduler.interval("a") == pytest.approx(215 + 0.3 / 4 * 645)
+
+
+def test_backoff_capped_at_interval() -> None:
+    """A device without a new sample is retried with backoff up to its interval."""
+    clock = FakeClock()
+    airthings = FakeAirthings()
+    scheduler = make_scheduler(airthings, clock)
+    sample(scheduler, airthings, clock, T0)
+    sample(scheduler, airthings, clock, T0 + 200)
+
+    delays = []
+    for _ in range(4):
+        clock.advance_to(scheduler.next_due())
+        scheduler.poll()
+        delays.append(scheduler.next_due() - clock.now)
+    assert delays == [60, 120, 200, 200]
+
+    # A new sample resets the backoff.
+    recorded = clock.now
+    sample(scheduler, airthings, clock, recorded)
+    interval = scheduler.interval("a")
+    assert interval is not None
+    assert scheduler.next_due() == recorded + interval + 30
+
+
+def test_periodic_full_update() -> None:
+    """Full updates run on their own interval and drop removed devices."""
+    clock = FakeClock()
+    airthings = FakeAirthings()
+    airthings.recorded = {"a": T0, "b": T0}
+    scheduler = make_scheduler(airthings, clock, full_update_interval=1000)
+
+    scheduler.poll()
+    assert airthings.updates == [None]
+
+    clock.now = T0 + 330
+    airthings.recorded["a"] = T0 + 300
+    scheduler.poll()
+    assert airthings.updates[-1] == ["a", "b"]
+
+    del airthings.recorded["b"]
+    clock.now = T0 + 1000
+    scheduler.poll()
+    assert airthings.updates[-1] is None
+    assert list(airthings.devices) == ["a"]
+    assert scheduler.interval("a") == 300
+    assert "b" not in scheduler.pending()
+    assert scheduler.next_due() <= T0 + 2000
+
+
+def test_async_poll() -> None:
+    """The async poll fetches the same devices as the sync one."""
+    clock = FakeClock()
+    airthings = FakeAirthings()
+    airthings.recorded["a"] = T0
+    scheduler = make_scheduler(airthings, clock)
+
+    asyncio.run(scheduler.async_poll())
+    clock.now = T0 + 330
+    airthings.recorded["a"] = T0 + 300
+    devices = asyncio.run(scheduler.async_poll())
+
+    assert airthings.updates == [None, ["a"]]
+    assert devices["a"].recorded_timestamp() == T0 + 300
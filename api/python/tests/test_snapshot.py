@@ -0,0 +1,86 @@
+"""Tests of the columnar fleet snapshot."""
+
+import sys
+from importlib.util import find_spec
+
+import pytest
+from conftest import AirthingsFactory
+from fake_api import FakeAirthingsApi
+
+requires_numpy = pytest.mark.skipif(
+    find_spec("numpy") is None, reason="snapshots require NumPy"
+)
+
+COLUMNS = ("home", "recorded", "battery", "device", "sensor_type", "value")
+
+
+def assert_same_columns(first, second):
+    """Assert two snapshots hold the same devices and readings."""
+    # pylint: disable-next=import-outside-toplevel
+    from numpy.testing import assert_array_equal
+
+    assert first.serial_numbers == second.serial_numbers
+    assert first.homes == second.homes
+    assert first.sensor_types == second.sensor_types
+    for column in COLUMNS:
+        assert_array_equal(getattr(first, column), getattr(second, column))
+
+
+@requires_numpy
+def test_snapshot_built_during_update(make_airthings: AirthingsFactory) -> None:
+    """Building the snapshot while mapping gives the same columns as after."""
+    api = FakeAirthingsApi(120, accounts=2)
+    incremental = make_airthings(api, build_snapshot=True)
+    on_first_use = make_airthings(api)
+
+    incremental.update_devices()
+    on_first_use.update_devices()
+
+    snapshot = incremental.snapshot_arrays()
+    assert len(snapshot) == 120
+    assert_same_columns(snapshot, on_first_use.snapshot_arrays())
+    assert incremental.snapshot_arrays() is snapshot
+
+
+@requires_numpy
+def test_snapshot_after_partial_update(make_airthings: AirthingsFactory) -> None:
+    """A partial update drops the snapshot built during the last full one."""
+    api = FakeAirthingsApi(120, accounts=2)
+    incremental = make_airthings(api, build_snapshot=True)
+    on_first_use = make_airthings(api)
+    for airthings in (incremental, on_first_use):
+        airthings.update_devices()
+
+    full = incremental.snapshot_arrays()
+    for airthings in (incremental, on_first_use):
+        airthings.update_devices(["0000000001", "0000000002"])
+
+    snapshot = incremental.snapshot_arrays()
+    assert snapshot is not full
+    assert_same_columns(snapshot, on_first_use.snapshot_arrays())
+
+
+@requires_numpy
+def test_snapshot_readings(make_airthings: AirthingsFactory) -> None:
+    """Readings of a sensor type have one row per device that has it."""
+    airthings = make_airthings(FakeAirthingsApi(10))
+    airthings.update_devices()
+    snapshot = airthings.snapshot_arrays()
+
+    devices, values = snapshot.readings("temp")
+    assert devices.tolist() == list(range(10))
+    assert values.tolist() == [21.4] * 10
+    assert snapshot.sensor_code("unknown") == -1
+
+
+def test_snapshot_without_numpy(
+    make_airthings: AirthingsFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without NumPy, asking for a snapshot says which extra to install."""
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.delitem(sys.modules, "airthings_sdk.snapshot", raising=False)
+    airthings = make_airthings(FakeAirthingsApi(10))
+    airthings.update_devices()
+
+    with pytest.raises(ImportError, match=r"airthings-sdk\[numpy\]"):
+        airthings.snapshot_arrays()
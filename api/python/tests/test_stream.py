@@ -0,0 +1,92 @@
+"""Tests of the incremental parser of sensors pages."""
+
+import json
+import random
+
+import pytest
+from common import sensors_page
+
+from airthings_sdk.stream import SensorsPageParser
+
+PAGE = json.dumps(
+    {
+        "hasNext": True,
+        "results": [
+            {"serialNumber": "1", "sensors": [{"value": 1.5e3}], "recorded": None},
+            {"serialNumber": "2", "sensors": [], "batteryPercentage": 100},
+            {"serialNumber": "æøå", "sensors": None},
+        ],
+        "totalPages": 12,
+    },
+    ensure_ascii=False,
+    indent=1,
+).encode()
+
+
+def _parse(content: bytes, chunk_size: int) -> SensorsPageParser:
+    """Feed a page to a parser in chunks and check the items it hands out."""
+    parser = SensorsPageParser()
+    items = []
+    for start in range(0, len(content), chunk_size):
+        items.extend(parser.feed(content[start : start + chunk_size]))
+    items.extend(parser.close())
+
+    assert items == json.loads(content)["results"]
+    return parser
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, len(PAGE)])
+def test_chunked_page(chunk_size: int) -> None:
+    """Any chunking of a page gives its items and top level fields."""
+    parser = _parse(PAGE, chunk_size)
+
+    assert parser.done
+    assert parser.fields == {"hasNext": True, "totalPages": 12}
+    assert parser.size == len(PAGE)
+
+
+def test_random_chunks() -> None:
+    """Random chunk boundaries, including inside numbers, give the same items."""
+    content = sensors_page(size=200)
+    rng = random.Random(0)
+    parser = SensorsPageParser()
+    items = []
+    position = 0
+    while position < len(content):
+        size = rng.randint(1, 300)
+        items.extend(parser.feed(content[position : position + size]))
+        position += size
+    items.extend(parser.close())
+
+    assert items == json.loads(content)["results"]
+
+
+def test_number_at_chunk_end() -> None:
+    """A number split over two chunks is not cut short."""
+    parser = SensorsPageParser()
+
+    assert not parser.feed(b'{"results": [], "totalPages": 1')
+    parser.feed(b"2}")
+    assert parser.fields == {"totalPages": 12}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b'{"results": [{"serialNumber": "1"}', b"[]", b'{"results": [1 2]}'],
+    ids=["empty", "truncated", "not an object", "missing comma"],
+)
+def test_invalid_page(content: bytes) -> None:
+    """An incomplete or malformed page raises a ValueError."""
+    parser = SensorsPageParser()
+    with pytest.raises(ValueError):
+        parser.feed(content)
+        parser.close()
+
+
+def test_trailing_data() -> None:
+    """Anything after the page raises a ValueError."""
+    parser = SensorsPageParser()
+    parser.feed(b'{"results": []}')
+
+    with pytest.raises(ValueError):
+        parser.feed(b" {")